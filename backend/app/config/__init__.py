@@ -1,7 +1,42 @@
 """
 Configuration package
 """
-from .database import get_db, get_engine, init_db
-from .settings import *
+from .database import (
+    get_db,
+    get_sync_db,
+    get_engine,
+    get_async_engine,
+    init_db,
+    init_async_db,
+    dispose_engine,
+    dispose_async_engine,
+    ensure_indexes
+)
+from .logging_config import setup_logging, stop_logging
+from .settings import (
+    APP_NAME,
+    APP_VERSION,
+    DEBUG,
+    CURRENT_DATE,
+    CORS_ORIGINS,
+    ADMIN_EMAIL,
+    ADMIN_PASSWORD,
+    TOKEN_EXPIRY_DAYS,
+    GEMINI_API_KEY,
+    GROQ_API_KEY,
+    WEATHER_API_KEY,
+    LATITUDE,
+    LONGITUDE,
+    HOLIDAYS_API_URL,
+    DEFAULT_COUNTRY_CODE,
+    MODELS_DIR,
+    SARIMA_MODEL_PATH,
+    DATABASE_URL,
+    DATABASE_URL_ASYNC
+)
 
-__all__ = ['get_db', 'get_engine', 'init_db']
+__all__ = [
+    'get_db', 'get_sync_db', 'get_engine', 'get_async_engine',
+    'init_db', 'init_async_db', 'dispose_engine', 'dispose_async_engine',
+    'ensure_indexes', 'setup_logging', 'stop_logging'
+]
@@ -2,37 +2,152 @@
 Database configuration module
 Handles database connection setup
 """
-from sqlalchemy import create_engine
+import logging
+
+from sqlalchemy import create_engine, text
 from sqlalchemy.ext.declarative import declarative_base
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
 from sqlalchemy.orm import sessionmaker
-import os
 
-# Database URL - using MySQL
-DATABASE_URL = os.getenv("DATABASE_URL", "mysql+pymysql://root:@localhost:3306/databrew")
+from .settings import DATABASE_URL, DATABASE_URL_ASYNC
+
+logger = logging.getLogger(__name__)
+
+# Connection pool tuning
+# Connections are checked out per request, so keep a warm pool sized for the
+# worker's concurrency, ping before use and recycle before MySQL's wait_timeout.
+# Sync endpoints run on a 40-thread pool, so pool + overflow covers every
+# thread holding a connection at once without waiting on checkout
+POOL_SIZE = 25
+MAX_OVERFLOW = 25
+POOL_RECYCLE_SECONDS = 1800
+
+# The asyncio engine multiplexes its queries on the event loop rather than
+# holding one connection per thread, so it gets a smaller pool. At most 70
+# connections per worker keeps two workers under MySQL's default
+# max_connections of 151
+ASYNC_POOL_SIZE = 10
+ASYNC_MAX_OVERFLOW = 10
+
+# Rows per multi-row INSERT when executing many parameter sets at once
+INSERT_BATCH_SIZE = 1000
+
+# Secondary indexes the analytics queries rely on, created at startup when missing
+# (product_detail leads so per-product date-range scans stay on the index).
+# Date predicates are written as ranges on the bare column, never DATE(...),
+# so they can seek on these; the date/time index also serves date-only ranges.
+# MySQL has no INCLUDE, so the date/product index carries quantity and price as
+# trailing columns: daily totals and per-product revenue over a date range are
+# then answered from the index alone
+INDEXES = {
+    "ix_transactions_product_date": ("transactions", "product_detail, transaction_date"),
+    "ix_transactions_date_time": ("transactions", "transaction_date, transaction_time"),
+    "ix_transactions_date_product_amount": (
+        "transactions", "transaction_date, product_detail, transaction_qty, unit_price"
+    ),
+}
 
 # Create database engine
 engine = None
-SessionLocal = None
 Base = declarative_base()
 
+# Session factory is created once and bound to the engine in init_db()
+SessionLocal = sessionmaker(autocommit=False, autoflush=False)
+
+# Asyncio engine and session factory, bound in init_async_db()
+async_engine = None
+AsyncSessionLocal = async_sessionmaker(autoflush=False, expire_on_commit=False)
+
 def init_db():
     """Initialize database connection"""
-    global engine, SessionLocal
+    global engine
+
+    try:
+        engine = create_engine(
+            DATABASE_URL,
+            pool_size=POOL_SIZE,
+            max_overflow=MAX_OVERFLOW,
+            pool_pre_ping=True,
+            pool_recycle=POOL_RECYCLE_SECONDS,
+            pool_use_lifo=True,
+            insertmanyvalues_page_size=INSERT_BATCH_SIZE,
+            future=True,
+        )
+        SessionLocal.configure(bind=engine)
+        logger.info("Database connection established successfully")
+    except Exception as e:
+        logger.warning("Could not create database engine: %s", e)
+        return None
+
+    return engine
+
+def init_async_db():
+    """Initialize the asyncio database engine"""
+    global async_engine
 
     try:
-        engine = create_engine(DATABASE_URL)
-        SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
-        print("✓ Database connection established successfully")
-        return engine
+        async_engine = create_async_engine(
+            DATABASE_URL_ASYNC,
+            pool_size=ASYNC_POOL_SIZE,
+            max_overflow=ASYNC_MAX_OVERFLOW,
+            pool_pre_ping=True,
+            pool_recycle=POOL_RECYCLE_SECONDS,
+            pool_use_lifo=True,
+            insertmanyvalues_page_size=INSERT_BATCH_SIZE,
+        )
+        AsyncSessionLocal.configure(bind=async_engine)
+        logger.info("Async database engine created successfully")
+        return async_engine
     except Exception as e:
-        print(f"Warning: Could not create database engine: {e}")
+        logger.warning("Could not create async database engine: %s", e)
         return None
 
-def get_db():
+def ensure_indexes(engine):
+    """Create any secondary indexes from INDEXES that do not exist yet"""
+    try:
+        with engine.begin() as conn:
+            existing = set(conn.execute(text(
+                "SELECT DISTINCT index_name FROM information_schema.statistics "
+                "WHERE table_schema = DATABASE()"
+            )).scalars())
+
+            for name, (table, columns) in INDEXES.items():
+                if name not in existing:
+                    conn.execute(text(f"CREATE INDEX {name} ON {table} ({columns})"))
+                    logger.info("Created index %s on %s(%s)", name, table, columns)
+    except Exception as e:
+        logger.warning("Could not ensure database indexes: %s", e)
+
+def dispose_engine(close: bool = True):
     """
-    Dependency function to get database session
-    Yields a database session and closes it after use
+    Release pooled connections
+
+    Call with close=False in a forked worker so the child drops the
+    connections inherited from the parent without closing them underneath it
     """
+    if engine is not None:
+        engine.dispose(close=close)
+
+async def dispose_async_engine(close: bool = True):
+    """Release pooled connections held by the asyncio engine"""
+    if async_engine is not None:
+        await async_engine.dispose(close=close)
+
+async def get_db():
+    """
+    Dependency function to get an async database session
+    Yields a session on the asyncio engine and closes it after use
+    """
+    get_async_engine()
+    async with AsyncSessionLocal() as db:
+        yield db
+
+def get_sync_db():
+    """
+    Dependency function to get a blocking database session
+    Kept for code that still runs on the sync engine
+    """
+    get_engine()
     db = SessionLocal()
     try:
         yield db
@@ -45,3 +160,10 @@ def get_engine():
     if engine is None:
         engine = init_db()
     return engine
+
+def get_async_engine():
+    """Get asyncio database engine instance"""
+    global async_engine
+    if async_engine is None:
+        async_engine = init_async_db()
+    return async_engine
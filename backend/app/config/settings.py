@@ -3,15 +3,36 @@ Application settings and configuration
 """
 import os
 from datetime import datetime
-from dotenv import load_dotenv
+from functools import lru_cache
+from types import MappingProxyType
 
-# Load environment variables
-load_dotenv()
+
+@lru_cache(maxsize=None)
+def _load_env() -> MappingProxyType:
+    """Load .env once per process and snapshot the variables we use"""
+    if not os.environ.get("_DOTENV_LOADED"):
+        # Imported here so reloader/worker processes that inherit the
+        # loaded environment never import dotenv at all
+        from dotenv import load_dotenv
+        load_dotenv()
+        os.environ["_DOTENV_LOADED"] = "1"
+
+    return MappingProxyType({
+        "DEBUG": os.getenv("DEBUG", "False").lower() == "true",
+        "GEMINI_API_KEY": os.getenv("GEMINI_API_KEY"),
+        "GROQ_API_KEY": os.getenv("GROG_API_KEY"),
+        "WEATHER_API_KEY": os.getenv("WEATHER_API_KEY", "9CP63WBQHDQ2A52ESSE85KWY4"),
+        "DATABASE_URL": os.getenv("DATABASE_URL", "mysql+pymysql://root:@localhost:3306/databrew"),
+        "DATABASE_URL_ASYNC": os.getenv("DATABASE_URL_ASYNC"),
+    })
+
+
+_env = _load_env()
 
 # Application Settings
 APP_NAME = "Coffee Sales Analytics API"
 APP_VERSION = "1.0.0"
-DEBUG = os.getenv("DEBUG", "False").lower() == "true"
+DEBUG = _env["DEBUG"]
 
 # Fixed current date for the application (2023-06-24)
 CURRENT_DATE = datetime(2023, 6, 24)
@@ -25,9 +46,9 @@ ADMIN_PASSWORD = "admin123"
 TOKEN_EXPIRY_DAYS = 7
 
 # API Keys
-GEMINI_API_KEY = os.getenv("GEMINI_API_KEY")
-GROQ_API_KEY = os.getenv("GROG_API_KEY")
-WEATHER_API_KEY = os.getenv("WEATHER_API_KEY", "9CP63WBQHDQ2A52ESSE85KWY4")
+GEMINI_API_KEY = _env["GEMINI_API_KEY"]
+GROQ_API_KEY = _env["GROQ_API_KEY"]
+WEATHER_API_KEY = _env["WEATHER_API_KEY"]
 
 # Location Settings (Dhaka, Bangladesh)
 LATITUDE = 23.7918
@@ -42,4 +63,6 @@ MODELS_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(__file
 SARIMA_MODEL_PATH = os.path.join(MODELS_DIR, "sarima_model_forcast.pkl")
 
 # Database Settings
-DATABASE_URL = os.getenv("DATABASE_URL", "mysql+pymysql://root:@localhost:3306/databrew")
+DATABASE_URL = _env["DATABASE_URL"]
+# Same database through the asyncio driver, used by the async engine
+DATABASE_URL_ASYNC = _env["DATABASE_URL_ASYNC"] or DATABASE_URL.replace("+pymysql", "+aiomysql", 1)
@@ -4,17 +4,20 @@ Handles HTTP requests for analytics-related endpoints
 """
 from typing import Dict
 from ..services.analytics_service import AnalyticsService
+from ..utils.response_cache import cached_endpoint
 
 
 class AnalyticsController:
     """Controller for analytics endpoints"""
 
     @staticmethod
+    @cached_endpoint("inventory-predictions")
     def get_inventory_predictions(engine) -> Dict:
         """Handle inventory predictions request"""
         return AnalyticsService.get_inventory_predictions(engine)
 
     @staticmethod
+    @cached_endpoint("barista-schedule")
     def get_barista_schedule(engine) -> Dict:
         """Handle barista schedule request"""
         return AnalyticsService.get_barista_schedule(engine)
@@ -25,11 +28,13 @@ class AnalyticsController:
         return AnalyticsService.get_customer_feedback()
 
     @staticmethod
+    @cached_endpoint("sales-analytics")
     def get_sales_analytics(engine, period: str = "today") -> Dict:
         """Handle sales analytics request"""
         return AnalyticsService.get_sales_analytics(engine, period)
 
     @staticmethod
+    @cached_endpoint("cash-flow")
     def get_cash_flow(engine, period: str = "month") -> Dict:
         """Handle cash flow request"""
         return AnalyticsService.get_cash_flow(engine, period)
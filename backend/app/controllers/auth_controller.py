@@ -2,9 +2,6 @@
 Authentication Controller
 Handles HTTP requests for authentication endpoints
 """
-from fastapi import Header, HTTPException
-from typing import Optional
-
 from ..models.schemas import LoginRequest, SignupRequest, AuthResponse, UserResponse
 from ..services.auth_service import AuthService
 
@@ -23,39 +20,18 @@ class AuthController:
         return await AuthService.signup(signup_data)
 
     @staticmethod
-    async def logout(authorization: Optional[str] = Header(None)) -> dict:
+    async def logout(token: str) -> dict:
         """Handle logout request"""
-        if not authorization or not authorization.startswith("Bearer "):
-            raise HTTPException(
-                status_code=401,
-                detail="Missing or invalid authorization header"
-            )
-
-        token = authorization.replace("Bearer ", "")
         return await AuthService.logout(token)
 
     @staticmethod
-    async def get_profile(authorization: Optional[str] = Header(None)) -> UserResponse:
+    async def get_profile(token: str) -> UserResponse:
         """Handle get profile request"""
-        if not authorization or not authorization.startswith("Bearer "):
-            raise HTTPException(
-                status_code=401,
-                detail="Missing or invalid authorization header"
-            )
-
-        token = authorization.replace("Bearer ", "")
         return await AuthService.get_profile(token)
 
     @staticmethod
-    async def verify(authorization: Optional[str] = Header(None)) -> dict:
+    async def verify(token: str) -> dict:
         """Handle token verification request"""
-        if not authorization or not authorization.startswith("Bearer "):
-            raise HTTPException(
-                status_code=401,
-                detail="Missing or invalid authorization header"
-            )
-
-        token = authorization.replace("Bearer ", "")
         user = await AuthService.verify_token(token)
 
         return {
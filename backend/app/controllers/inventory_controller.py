@@ -2,213 +2,257 @@
 Inventory Controller
 Handles HTTP requests for inventory and product endpoints
 """
-import pandas as pd
+import sys
+from functools import lru_cache
+
 from fastapi import HTTPException
-from sqlalchemy import text
-from typing import Dict
+from sqlalchemy import JSON, Float, TextClause, column, text
+from typing import Dict, List
+
+# Rows fetched per round-trip when streaming large result sets
+STREAM_BATCH_SIZE = 1000
+
+# Statements are built once at import; the engine's compiled cache then
+# reuses their compiled form across requests
+INGREDIENTS_QUERY = text("""
+    SELECT
+        id, name, unit, stock_quantity, reorder_level,
+        unit_cost, supplier, notes, created_at, updated_at
+    FROM ingredients
+    ORDER BY name
+""")
+
+INSERT_INGREDIENT_QUERY = text("""
+    INSERT INTO ingredients (name, unit, stock_quantity, reorder_level, unit_cost, supplier, notes)
+    VALUES (:name, :unit, :stock_quantity, :reorder_level, :unit_cost, :supplier, :notes)
+""")
+
+LAST_INSERT_ID_QUERY = text("SELECT LAST_INSERT_ID() AS id")
+
+DELETE_INGREDIENT_QUERY = text("DELETE FROM ingredients WHERE id = :id")
+
+PRODUCTS_QUERY = text("""
+    SELECT
+        id, product_name, product_type, selling_price,
+        description, is_active, created_at, updated_at
+    FROM products
+    WHERE is_active = TRUE
+    ORDER BY product_name
+""").columns(
+    # DECIMAL prices come back as floats, ready for the JSON encoder
+    column("id"), column("product_name"), column("product_type"), column("selling_price", Float),
+    column("description"), column("is_active"), column("created_at"), column("updated_at")
+)
+
+PRODUCT_COST_QUERY = text("""
+    SELECT
+        p.id, p.product_name, p.selling_price,
+        SUM(pi.quantity_needed * i.unit_cost) as total_cost,
+        JSON_ARRAYAGG(
+            JSON_OBJECT('name', i.name, 'quantity', pi.quantity_needed, 'unit', i.unit)
+        ) as ingredients_used
+    FROM products p
+    LEFT JOIN product_ingredients pi ON p.id = pi.product_id
+    LEFT JOIN ingredients i ON pi.ingredient_id = i.id
+    WHERE p.id = :product_id
+    GROUP BY p.id, p.product_name, p.selling_price
+""").columns(
+    # Decode the aggregated JSON into a list of dicts on fetch
+    column("id"), column("product_name"), column("selling_price"), column("total_cost"),
+    column("ingredients_used", JSON)
+)
+
+REQUIRED_INGREDIENT_FIELDS = ['name', 'unit', 'stock_quantity', 'reorder_level']
+
+# Columns a client may change through update_ingredient, in SET-clause order
+UPDATABLE_INGREDIENT_FIELDS = (
+    'name', 'unit', 'stock_quantity', 'reorder_level', 'unit_cost', 'supplier', 'notes'
+)
+
+
+@lru_cache(maxsize=None)
+def _update_ingredient_query(columns: tuple) -> TextClause:
+    """UPDATE statement that only sets the given columns (one per column subset)"""
+    assignments = ", ".join(f"{column} = :{column}" for column in columns)
+    return text(f"UPDATE ingredients SET {assignments} WHERE id = :id")
+
+
+def _ingredient_params(ingredient: dict) -> dict:
+    """Validate an ingredient payload and build its insert parameters"""
+    for field in REQUIRED_INGREDIENT_FIELDS:
+        if field not in ingredient:
+            raise HTTPException(status_code=400, detail=f"Missing required field: {field}")
+
+    return {
+        'name': ingredient['name'],
+        'unit': ingredient['unit'],
+        'stock_quantity': ingredient['stock_quantity'],
+        'reorder_level': ingredient['reorder_level'],
+        'unit_cost': ingredient.get('unit_cost', 0),
+        'supplier': ingredient.get('supplier', ''),
+        'notes': ingredient.get('notes', '')
+    }
 
 
 class InventoryController:
     """Controller for inventory and product endpoints"""
 
     @staticmethod
-    def get_ingredients(engine) -> Dict:
+    async def get_ingredients(engine) -> Dict:
         """Get all ingredients"""
+        import numpy as np
+
         if engine is None:
             raise HTTPException(status_code=500, detail="Database connection not available")
 
-        try:
-            query = """
-                SELECT
-                    id, name, unit, stock_quantity, reorder_level,
-                    unit_cost, supplier, notes, created_at, updated_at
-                FROM ingredients
-                ORDER BY name
-            """
-
-            df = pd.read_sql(query, engine)
-
-            if df.empty:
-                return {"ingredients": []}
-
-            ingredients = df.to_dict('records')
-
-            for ingredient in ingredients:
-                ingredient['stock_quantity'] = float(ingredient['stock_quantity'])
-                ingredient['reorder_level'] = float(ingredient['reorder_level'])
-                ingredient['unit_cost'] = float(ingredient['unit_cost']) if ingredient['unit_cost'] else 0
-                ingredient['created_at'] = ingredient['created_at'].isoformat() if ingredient['created_at'] else None
-                ingredient['updated_at'] = ingredient['updated_at'].isoformat() if ingredient['updated_at'] else None
-                ingredient['is_low_stock'] = ingredient['stock_quantity'] < ingredient['reorder_level']
-
-            return {"ingredients": ingredients}
-
-        except Exception as e:
-            raise HTTPException(status_code=500, detail=f"Error fetching ingredients: {str(e)}")
+        ingredients = []
+        async with engine.connect() as conn:
+            result = await conn.stream(INGREDIENTS_QUERY, execution_options={"max_row_buffer": STREAM_BATCH_SIZE})
+            async for partition in result.partitions(STREAM_BATCH_SIZE):
+                # Work column-wise: numeric columns are converted and
+                # compared in one numpy pass per batch
+                (ids, names, units, stock, reorder, cost,
+                 suppliers, notes, created, updated) = zip(*partition)
+
+                stock = np.asarray(stock, dtype=np.float64)
+                reorder = np.asarray(reorder, dtype=np.float64)
+                cost = np.asarray([c or 0 for c in cost], dtype=np.float64)
+                low_stock = stock < reorder
+
+                # Units and suppliers repeat across many rows; share one
+                # string object per distinct value
+                units = [sys.intern(unit) for unit in units]
+                suppliers = [sys.intern(supplier) if supplier else supplier for supplier in suppliers]
+
+                ingredients.extend(
+                    {
+                        'id': id_,
+                        'name': name,
+                        'unit': unit,
+                        'stock_quantity': stock_quantity,
+                        'reorder_level': reorder_level,
+                        'unit_cost': unit_cost,
+                        'supplier': supplier,
+                        'notes': note,
+                        'created_at': created_at,
+                        'updated_at': updated_at,
+                        'is_low_stock': is_low_stock
+                    }
+                    for (id_, name, unit, stock_quantity, reorder_level, unit_cost,
+                         supplier, note, created_at, updated_at, is_low_stock)
+                    in zip(ids, names, units, stock.tolist(), reorder.tolist(), cost.tolist(),
+                           suppliers, notes, created, updated, low_stock.tolist())
+                )
+
+        return {"ingredients": ingredients}
 
     @staticmethod
-    def create_ingredient(engine, ingredient: dict) -> Dict:
+    async def create_ingredient(engine, ingredient: dict) -> Dict:
         """Create a new ingredient"""
         if engine is None:
             raise HTTPException(status_code=500, detail="Database connection not available")
 
-        try:
-            required_fields = ['name', 'unit', 'stock_quantity', 'reorder_level']
-            for field in required_fields:
-                if field not in ingredient:
-                    raise HTTPException(status_code=400, detail=f"Missing required field: {field}")
-
-            query = """
-                INSERT INTO ingredients (name, unit, stock_quantity, reorder_level, unit_cost, supplier, notes)
-                VALUES (:name, :unit, :stock_quantity, :reorder_level, :unit_cost, :supplier, :notes)
-            """
-
-            params = {
-                'name': ingredient['name'],
-                'unit': ingredient['unit'],
-                'stock_quantity': ingredient['stock_quantity'],
-                'reorder_level': ingredient['reorder_level'],
-                'unit_cost': ingredient.get('unit_cost', 0),
-                'supplier': ingredient.get('supplier', ''),
-                'notes': ingredient.get('notes', '')
-            }
-
-            with engine.begin() as conn:
-                result = conn.execute(text(query), params)
-                try:
-                    ingredient_id = result.lastrowid
-                except Exception:
-                    ingredient_id = conn.execute(text("SELECT LAST_INSERT_ID() AS id")).scalar()
-
-            return {"message": "Ingredient created successfully", "id": ingredient_id}
-
-        except Exception as e:
-            raise HTTPException(status_code=500, detail=f"Error creating ingredient: {str(e)}")
+        params = _ingredient_params(ingredient)
+
+        async with engine.begin() as conn:
+            result = await conn.execute(INSERT_INGREDIENT_QUERY, params)
+            try:
+                ingredient_id = result.lastrowid
+            except Exception:
+                ingredient_id = (await conn.execute(LAST_INSERT_ID_QUERY)).scalar()
+
+        return {"message": "Ingredient created successfully", "id": ingredient_id}
 
     @staticmethod
-    def update_ingredient(engine, ingredient_id: int, ingredient: dict) -> Dict:
-        """Update an existing ingredient"""
+    async def bulk_create_ingredients(engine, items: List[dict]) -> Dict:
+        """Create many ingredients in a single transaction"""
         if engine is None:
             raise HTTPException(status_code=500, detail="Database connection not available")
 
-        try:
-            query = """
-                UPDATE ingredients
-                SET name = :name, unit = :unit, stock_quantity = :stock_quantity,
-                    reorder_level = :reorder_level, unit_cost = :unit_cost,
-                    supplier = :supplier, notes = :notes
-                WHERE id = :id
-            """
-
-            params = {
-                'id': ingredient_id,
-                'name': ingredient['name'],
-                'unit': ingredient['unit'],
-                'stock_quantity': ingredient['stock_quantity'],
-                'reorder_level': ingredient['reorder_level'],
-                'unit_cost': ingredient.get('unit_cost', 0),
-                'supplier': ingredient.get('supplier', ''),
-                'notes': ingredient.get('notes', '')
-            }
-
-            with engine.begin() as conn:
-                conn.execute(text(query), params)
-
-            return {"message": "Ingredient updated successfully"}
-
-        except Exception as e:
-            raise HTTPException(status_code=500, detail=f"Error updating ingredient: {str(e)}")
+        if not items:
+            raise HTTPException(status_code=400, detail="No ingredients provided")
+
+        params = [_ingredient_params(item) for item in items]
+
+        # A list of parameter sets runs as one executemany, which the
+        # engine batches into multi-row INSERT statements
+        async with engine.begin() as conn:
+            await conn.execute(INSERT_INGREDIENT_QUERY, params)
+
+        return {"message": "Ingredients created successfully", "count": len(params)}
 
     @staticmethod
-    def delete_ingredient(engine, ingredient_id: int) -> Dict:
-        """Delete an ingredient"""
+    async def update_ingredient(engine, ingredient_id: int, ingredient: dict) -> Dict:
+        """Update the supplied fields of an existing ingredient"""
         if engine is None:
             raise HTTPException(status_code=500, detail="Database connection not available")
 
-        try:
-            query = "DELETE FROM ingredients WHERE id = :id"
+        # Only write the columns the client sent; updated_at is
+        # maintained by MySQL when any of them actually changes
+        columns = tuple(field for field in UPDATABLE_INGREDIENT_FIELDS if field in ingredient)
+        if not columns:
+            raise HTTPException(status_code=400, detail="No fields to update")
 
-            with engine.begin() as conn:
-                conn.execute(text(query), {"id": ingredient_id})
+        params = {field: ingredient[field] for field in columns}
+        params['id'] = ingredient_id
 
-            return {"message": "Ingredient deleted successfully"}
+        async with engine.begin() as conn:
+            await conn.execute(_update_ingredient_query(columns), params)
 
-        except Exception as e:
-            raise HTTPException(status_code=500, detail=f"Error deleting ingredient: {str(e)}")
+        return {"message": "Ingredient updated successfully"}
 
     @staticmethod
-    def get_products(engine) -> Dict:
-        """Get all products"""
+    async def delete_ingredient(engine, ingredient_id: int) -> Dict:
+        """Delete an ingredient"""
         if engine is None:
             raise HTTPException(status_code=500, detail="Database connection not available")
 
-        try:
-            query = """
-                SELECT
-                    id, product_name, product_type, selling_price,
-                    description, is_active, created_at, updated_at
-                FROM products
-                WHERE is_active = TRUE
-                ORDER BY product_name
-            """
-
-            df = pd.read_sql(query, engine)
+        async with engine.begin() as conn:
+            await conn.execute(DELETE_INGREDIENT_QUERY, {"id": ingredient_id})
 
-            if df.empty:
-                return {"products": []}
+        return {"message": "Ingredient deleted successfully"}
 
-            products = df.to_dict('records')
-
-            for product in products:
-                product['selling_price'] = float(product['selling_price'])
-                product['created_at'] = product['created_at'].isoformat() if product['created_at'] else None
-                product['updated_at'] = product['updated_at'].isoformat() if product['updated_at'] else None
+    @staticmethod
+    async def get_products(engine) -> Dict:
+        """Get all products"""
+        if engine is None:
+            raise HTTPException(status_code=500, detail="Database connection not available")
 
-            return {"products": products}
+        products = []
+        async with engine.connect() as conn:
+            result = await conn.stream(PRODUCTS_QUERY, execution_options={"max_row_buffer": STREAM_BATCH_SIZE})
+            async for partition in result.mappings().partitions(STREAM_BATCH_SIZE):
+                for row in partition:
+                    product = dict(row)
+                    product['product_type'] = sys.intern(row['product_type'])
+                    products.append(product)
 
-        except Exception as e:
-            raise HTTPException(status_code=500, detail=f"Error fetching products: {str(e)}")
+        return {"products": products}
 
     @staticmethod
-    def get_product_cost_analysis(engine, product_id: int) -> Dict:
+    async def get_product_cost_analysis(engine, product_id: int) -> Dict:
         """Calculate cost breakdown and profit margin for a product"""
         if engine is None:
             raise HTTPException(status_code=500, detail="Database connection not available")
 
-        try:
-            query = """
-                SELECT
-                    p.id, p.product_name, p.selling_price,
-                    SUM(pi.quantity_needed * i.unit_cost) as total_cost,
-                    GROUP_CONCAT(CONCAT(i.name, ': ', pi.quantity_needed, ' ', i.unit) SEPARATOR ', ') as ingredients_used
-                FROM products p
-                LEFT JOIN product_ingredients pi ON p.id = pi.product_id
-                LEFT JOIN ingredients i ON pi.ingredient_id = i.id
-                WHERE p.id = %s
-                GROUP BY p.id, p.product_name, p.selling_price
-            """
-
-            df = pd.read_sql(query, engine, params=(product_id,))
-
-            if df.empty:
-                raise HTTPException(status_code=404, detail="Product not found")
-
-            result = df.iloc[0].to_dict()
-
-            selling_price = float(result['selling_price'])
-            total_cost = float(result['total_cost']) if result['total_cost'] else 0
-            profit = selling_price - total_cost
-            profit_margin = (profit / selling_price * 100) if selling_price > 0 else 0
-
-            return {
-                "product_id": result['id'],
-                "product_name": result['product_name'],
-                "selling_price": selling_price,
-                "total_cost": total_cost,
-                "profit": profit,
-                "profit_margin": round(profit_margin, 2),
-                "ingredients_used": result['ingredients_used']
-            }
-
-        except Exception as e:
-            raise HTTPException(status_code=500, detail=f"Error calculating cost: {str(e)}")
+        async with engine.connect() as conn:
+            result = (await conn.execute(PRODUCT_COST_QUERY, {"product_id": product_id})).mappings().first()
+
+        if result is None:
+            raise HTTPException(status_code=404, detail="Product not found")
+
+        selling_price = float(result['selling_price'])
+        total_cost = float(result['total_cost']) if result['total_cost'] else 0
+        profit = selling_price - total_cost
+        profit_margin = (profit / selling_price * 100) if selling_price > 0 else 0
+
+        return {
+            "product_id": result['id'],
+            "product_name": result['product_name'],
+            "selling_price": selling_price,
+            "total_cost": total_cost,
+            "profit": profit,
+            "profit_margin": round(profit_margin, 2),
+            # A product without a recipe aggregates one all-NULL object from the LEFT JOIN
+            "ingredients_used": [item for item in result['ingredients_used'] or [] if item['name'] is not None]
+        }
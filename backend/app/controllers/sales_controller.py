@@ -4,6 +4,7 @@ Handles HTTP requests for sales-related endpoints
 """
 from typing import Dict
 from ..services.sales_service import SalesService
+from ..utils.response_cache import cached_endpoint
 
 
 class SalesController:
@@ -15,16 +16,19 @@ class SalesController:
         return SalesService.get_forecast(engine, days, sarima_model)
 
     @staticmethod
+    @cached_endpoint("sales-data")
     def get_sales_data(engine, period: str = "month") -> Dict:
         """Handle sales data request"""
         return SalesService.get_sales_data(engine, period)
 
     @staticmethod
+    @cached_endpoint("dashboard-metrics")
     def get_dashboard_metrics(engine) -> Dict:
         """Handle dashboard metrics request"""
         return SalesService.get_dashboard_metrics(engine)
 
     @staticmethod
+    @cached_endpoint("best-selling")
     def get_best_selling(engine) -> Dict:
         """Handle best-selling product request"""
         return SalesService.get_best_selling(engine)
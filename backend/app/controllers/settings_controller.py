@@ -2,39 +2,77 @@
 Settings Controller
 Handles HTTP requests for settings-related endpoints
 """
-from fastapi import Header, HTTPException
-from typing import Optional
+from types import MappingProxyType
+from typing import Mapping
 
+import hmac
+
+from fastapi import HTTPException
+from fastapi.concurrency import run_in_threadpool
+
+from ..models.auth import User
 from ..models.schemas import ProfileUpdate, ShopDetailsUpdate, NotificationPreferences, PasswordChange
-from ..services.auth_service import AuthService
+
+# Static settings responses, built once and shared read-only across requests
+_PROFILE = MappingProxyType({
+    "firstName": "Sarah",
+    "lastName": "Ahmed",
+    "email": "admin@gmail.com",
+    "phone": "+880 1712-345678",
+    "role": "Owner & Manager",
+    "avatar": "https://api.dicebear.com/7.x/avataaars/svg?seed=Sarah"
+})
+
+_SHOP = MappingProxyType({
+    "shopName": "DataBrew Coffee House",
+    "address": "123 Gulshan Avenue, Dhaka 1212",
+    "city": "Dhaka",
+    "postal": "1212",
+    "shopPhone": "+880 2-9876543",
+    "shopEmail": "contact@databrew.com",
+    "hours": "8:00 AM - 11:00 PM (Daily)"
+})
+
+_NOTIFICATION_PREFERENCES = MappingProxyType({
+    "email": True,
+    "sms": False,
+    "push": True,
+    "lowStock": True,
+    "salesReports": True,
+    "staffAlerts": True
+})
+
+_ACTIVE_SESSIONS = MappingProxyType({
+    "sessions": (
+        MappingProxyType({
+            "id": 1,
+            "device": "Chrome on Windows",
+            "location": "Dhaka, Bangladesh",
+            "lastActive": "Active now",
+            "isCurrent": True
+        }),
+        MappingProxyType({
+            "id": 2,
+            "device": "Mobile App",
+            "location": "Dhaka, Bangladesh",
+            "lastActive": "2 hours ago",
+            "isCurrent": False
+        })
+    )
+})
 
 
 class SettingsController:
     """Controller for settings endpoints"""
 
     @staticmethod
-    async def get_profile_settings(authorization: Optional[str] = Header(None)) -> dict:
+    async def get_profile_settings(user: dict) -> Mapping:
         """Get user profile settings"""
-        user = await AuthService.verify_token(authorization)
-        if not user:
-            raise HTTPException(status_code=401, detail="Invalid or expired token")
-
-        return {
-            "firstName": "Sarah",
-            "lastName": "Ahmed",
-            "email": "admin@gmail.com",
-            "phone": "+880 1712-345678",
-            "role": "Owner & Manager",
-            "avatar": "https://api.dicebear.com/7.x/avataaars/svg?seed=Sarah"
-        }
+        return _PROFILE
 
     @staticmethod
-    async def update_profile_settings(profile: ProfileUpdate, authorization: Optional[str] = Header(None)) -> dict:
+    async def update_profile_settings(profile: ProfileUpdate, user: dict) -> dict:
         """Update user profile settings"""
-        user = await AuthService.verify_token(authorization)
-        if not user:
-            raise HTTPException(status_code=401, detail="Invalid or expired token")
-
         return {
             "success": True,
             "message": "Profile updated successfully",
@@ -42,29 +80,13 @@ class SettingsController:
         }
 
     @staticmethod
-    async def get_shop_settings(authorization: Optional[str] = Header(None)) -> dict:
+    async def get_shop_settings(user: dict) -> Mapping:
         """Get shop details settings"""
-        user = await AuthService.verify_token(authorization)
-        if not user:
-            raise HTTPException(status_code=401, detail="Invalid or expired token")
-
-        return {
-            "shopName": "DataBrew Coffee House",
-            "address": "123 Gulshan Avenue, Dhaka 1212",
-            "city": "Dhaka",
-            "postal": "1212",
-            "shopPhone": "+880 2-9876543",
-            "shopEmail": "contact@databrew.com",
-            "hours": "8:00 AM - 11:00 PM (Daily)"
-        }
+        return _SHOP
 
     @staticmethod
-    async def update_shop_settings(shop: ShopDetailsUpdate, authorization: Optional[str] = Header(None)) -> dict:
+    async def update_shop_settings(shop: ShopDetailsUpdate, user: dict) -> dict:
         """Update shop details settings"""
-        user = await AuthService.verify_token(authorization)
-        if not user:
-            raise HTTPException(status_code=401, detail="Invalid or expired token")
-
         return {
             "success": True,
             "message": "Shop details updated successfully",
@@ -72,28 +94,13 @@ class SettingsController:
         }
 
     @staticmethod
-    async def get_notification_preferences(authorization: Optional[str] = Header(None)) -> dict:
+    async def get_notification_preferences(user: dict) -> Mapping:
         """Get notification preferences"""
-        user = await AuthService.verify_token(authorization)
-        if not user:
-            raise HTTPException(status_code=401, detail="Invalid or expired token")
-
-        return {
-            "email": True,
-            "sms": False,
-            "push": True,
-            "lowStock": True,
-            "salesReports": True,
-            "staffAlerts": True
-        }
+        return _NOTIFICATION_PREFERENCES
 
     @staticmethod
-    async def update_notification_preferences(preferences: NotificationPreferences, authorization: Optional[str] = Header(None)) -> dict:
+    async def update_notification_preferences(preferences: NotificationPreferences, user: dict) -> dict:
         """Update notification preferences"""
-        user = await AuthService.verify_token(authorization)
-        if not user:
-            raise HTTPException(status_code=401, detail="Invalid or expired token")
-
         return {
             "success": True,
             "message": "Notification preferences updated successfully",
@@ -101,16 +108,13 @@ class SettingsController:
         }
 
     @staticmethod
-    async def change_password(password_data: PasswordChange, authorization: Optional[str] = Header(None)) -> dict:
+    async def change_password(password_data: PasswordChange, user: dict) -> dict:
         """Change user password"""
-        user = await AuthService.verify_token(authorization)
-        if not user:
-            raise HTTPException(status_code=401, detail="Invalid or expired token")
-
-        if password_data.newPassword != password_data.confirmPassword:
+        if not hmac.compare_digest(password_data.newPassword.encode(), password_data.confirmPassword.encode()):
             raise HTTPException(status_code=400, detail="New passwords do not match")
 
-        if password_data.currentPassword != "admin123":
+        account = User.get_by_email(user["email"])
+        if not account or not await run_in_threadpool(User.verify_password, account, password_data.currentPassword):
             raise HTTPException(status_code=400, detail="Current password is incorrect")
 
         return {
@@ -119,50 +123,21 @@ class SettingsController:
         }
 
     @staticmethod
-    async def get_active_sessions(authorization: Optional[str] = Header(None)) -> dict:
+    async def get_active_sessions(user: dict) -> Mapping:
         """Get active sessions"""
-        user = await AuthService.verify_token(authorization)
-        if not user:
-            raise HTTPException(status_code=401, detail="Invalid or expired token")
-
-        return {
-            "sessions": [
-                {
-                    "id": 1,
-                    "device": "Chrome on Windows",
-                    "location": "Dhaka, Bangladesh",
-                    "lastActive": "Active now",
-                    "isCurrent": True
-                },
-                {
-                    "id": 2,
-                    "device": "Mobile App",
-                    "location": "Dhaka, Bangladesh",
-                    "lastActive": "2 hours ago",
-                    "isCurrent": False
-                }
-            ]
-        }
+        return _ACTIVE_SESSIONS
 
     @staticmethod
-    async def logout_session(session_id: int, authorization: Optional[str] = Header(None)) -> dict:
+    async def logout_session(session_id: int, user: dict) -> dict:
         """Logout a specific session"""
-        user = await AuthService.verify_token(authorization)
-        if not user:
-            raise HTTPException(status_code=401, detail="Invalid or expired token")
-
         return {
             "success": True,
             "message": f"Session {session_id} logged out successfully"
         }
 
     @staticmethod
-    async def logout_all_sessions(authorization: Optional[str] = Header(None)) -> dict:
+    async def logout_all_sessions(user: dict) -> dict:
         """Logout all other sessions"""
-        user = await AuthService.verify_token(authorization)
-        if not user:
-            raise HTTPException(status_code=401, detail="Invalid or expired token")
-
         return {
             "success": True,
             "message": "All other sessions logged out successfully"
@@ -1,82 +1,245 @@
 import google.generativeai as genai
+import logging
 import os
 from dotenv import load_dotenv
-import json
+import math
 import re
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass, fields
+from functools import lru_cache
+from itertools import islice
+from google.api_core import exceptions as google_exceptions
 from groq import Groq
+from json import JSONDecoder
+from typing import Iterable, Iterator, Sequence
+from tenacity import retry, retry_if_exception_type, stop_after_attempt, wait_exponential_jitter
+
+# orjson parses much faster; fall back to the stdlib parser without it
+try:
+    from orjson import loads as json_loads
+except ImportError:
+    from json import loads as json_loads
+
+# Markdown code fence the models sometimes wrap a JSON array in
+JSON_ARRAY_FENCE = re.compile(r'```(?:json)?\s*(\[.*?\])\s*```', re.DOTALL)
+
+# Rate limits and transient server errors worth retrying a Gemini call on
+GEMINI_RETRYABLE_ERRORS = (
+    google_exceptions.ResourceExhausted,
+    google_exceptions.ServiceUnavailable,
+    google_exceptions.DeadlineExceeded,
+    google_exceptions.InternalServerError,
+)
+
+# Numba is optional; without it the sales statistics fall back to numpy
+try:
+    from numba import njit
+except ImportError:
+    njit = None
+
+# Polars is optional; large sales summaries aggregate on it when installed
+try:
+    import polars as pl
+except ImportError:
+    pl = None
+
+# Below this many rows converting to Polars costs more than the pandas groupby saves
+POLARS_MIN_ROWS = 100_000
+
+logger = logging.getLogger(__name__)
 
 # Load environment variables
 load_dotenv()
 
 # Configure Groq API (Primary)
+GROQ_MODEL_NAME = "llama-3.3-70b-versatile"
 GROQ_API_KEY = os.getenv("GROG_API_KEY")
 if GROQ_API_KEY:
-    groq_client = Groq(api_key=GROQ_API_KEY)
-    print("✓ Groq API configured for insights generation")
+    logger.info("Groq API configured for insights generation")
 else:
-    groq_client = None
-    print("Warning: GROG_API_KEY not found in environment variables")
+    logger.warning("GROG_API_KEY not found in environment variables")
 
 # Configure Gemini API (Fallback)
+GEMINI_MODEL_NAME = 'gemini-2.5-flash'
 GEMINI_API_KEY = os.getenv("GEMINI_API_KEY")
-if GEMINI_API_KEY:
+if not GEMINI_API_KEY:
+    logger.warning("GEMINI_API_KEY not found in environment variables")
+
+# Gemini request quota (the free tier allows 5 per minute) and how many
+# calls may be in flight at once; requests over either limit wait their turn
+GEMINI_REQUESTS_PER_MINUTE = int(os.getenv("GEMINI_REQUESTS_PER_MINUTE", "5"))
+GEMINI_MAX_CONCURRENCY = 2
+
+
+class RateLimiter:
+    """Blocking sliding-window limiter shared by all threads: at most max_calls per period seconds"""
+
+    def __init__(self, max_calls: int, period: float):
+        self.max_calls = max_calls
+        self.period = period
+        self._calls = deque()
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        """Wait until a call is allowed, then record it"""
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                while self._calls and now - self._calls[0] >= self.period:
+                    self._calls.popleft()
+                if len(self._calls) < self.max_calls:
+                    self._calls.append(now)
+                    return
+                wait = self.period - (now - self._calls[0])
+            time.sleep(wait)
+
+
+_gemini_rate_limiter = RateLimiter(GEMINI_REQUESTS_PER_MINUTE, 60)
+_gemini_slots = threading.BoundedSemaphore(GEMINI_MAX_CONCURRENCY)
+
+
+@lru_cache(maxsize=1)
+def get_groq_client():
+    """Process-wide Groq client (None without an API key), so its HTTP connection pool is reused"""
+    if not GROQ_API_KEY:
+        return None
+    return Groq(api_key=GROQ_API_KEY)
+
+
+@lru_cache(maxsize=1)
+def get_gemini_model():
+    """Process-wide Gemini model (None without an API key)"""
+    if not GEMINI_API_KEY:
+        return None
     genai.configure(api_key=GEMINI_API_KEY)
-    model = genai.GenerativeModel('gemini-2.5-flash')
-else:
-    model = None
-    print("Warning: GEMINI_API_KEY not found in environment variables")
+    return genai.GenerativeModel(GEMINI_MODEL_NAME)
 
 
-def generate_ai_insights(sales_data: dict) -> dict:
+def warmup():
     """
-    Generate AI insights using Groq API (primary) or Gemini API (fallback) based on sales data
-
-    Args:
-        sales_data: Dictionary containing sales information, trends, and patterns
+    Create the LLM clients and open their connections before the first request
 
-    Returns:
-        Dictionary containing insights list and source_data for transparency
+    Uses endpoints that consume no generation quota (model listing, token counting)
     """
-    # Try Groq first
+    groq_client = get_groq_client()
     if groq_client:
         try:
-            return generate_insights_with_groq(sales_data)
+            groq_client.models.list()
         except Exception as e:
-            print(f"Groq API failed: {e}, falling back to Gemini...")
-    
-    # Fallback to Gemini
-    if not model:
-        return {"insights": get_fallback_insights(), "source_data": sales_data}
+            logger.warning("Groq warmup failed: %s", e)
+
+    model = get_gemini_model()
+    if model:
+        try:
+            model.count_tokens("ping")
+        except Exception as e:
+            logger.warning("Gemini warmup failed: %s", e)
 
-    try:
-        # Prepare the prompt with sales data context
-        low_stock_text = ", ".join(sales_data.get('low_stock_items', [])[:3]) if sales_data.get('low_stock_items') else "None"
-        peak_hours_text = ", ".join(sales_data.get('peak_hours', ['Unknown'])[:3])
 
-        prompt = f"""
+def _sales_stats_loop(sales):
+    """
+    Mean of all sales and of the last and first 7 entries, in one pass
+
+    NaN entries are skipped, matching pandas' mean()
+    """
+    n = sales.shape[0]
+    total = 0.0
+    count = 0
+    recent = 0.0
+    recent_count = 0
+    older = 0.0
+    older_count = 0
+
+    for i in range(n):
+        value = sales[i]
+        if value != value:
+            continue
+        total += value
+        count += 1
+        if i >= n - 7:
+            recent += value
+            recent_count += 1
+        if i < 7:
+            older += value
+            older_count += 1
+
+    return (
+        total / count if count else math.nan,
+        recent / recent_count if recent_count else math.nan,
+        older / older_count if older_count else math.nan
+    )
+
+
+if njit is not None:
+    # Signature is pinned so compilation happens once at import (and is
+    # cached on disk); fastmath is left off because it breaks the NaN check
+    _sales_stats = njit("UniTuple(float64, 3)(Array(float64, 1, 'A', readonly=True))", cache=True)(_sales_stats_loop)
+else:
+    def _sales_stats(sales):
+        """Mean of all sales and of the last and first 7 entries"""
+        import numpy as np
+        return np.nanmean(sales), np.nanmean(sales[-7:]), np.nanmean(sales[:7])
+
+
+def strip_json_fence(text: str) -> str:
+    """Return the JSON array from a markdown code fence, or the text unchanged"""
+    # Bare JSON needs no regex pass
+    if text.lstrip()[:1] == '[':
+        return text
+    json_match = JSON_ARRAY_FENCE.search(text)
+    return json_match.group(1) if json_match else text
+
+
+@dataclass(slots=True)
+class SalesSummary:
+    """Sales figures the insights prompt is rendered from, in prompt order"""
+    trend: str = 'steady'
+    wow_change: float = 0
+    top_products: Sequence[str] = ('Unknown',)
+    top_product_revenue: float = 0
+    peak_hours: Sequence[str] = ('Unknown',)
+    peak_hour_customers: int = 0
+    avg_daily_sales: float = 0
+    recent_daily_sales: float = 0
+    avg_order_value: float = 0
+    low_stock_items: Sequence[str] = ()
+    total_customers_today: int = 0
+
+    @classmethod
+    def from_dict(cls, sales_data: dict) -> "SalesSummary":
+        """Pick the prompt fields out of a sales summary dict; missing ones keep their defaults"""
+        return cls(**{name: sales_data[name] for name in SALES_SUMMARY_FIELDS if name in sales_data})
+
+
+SALES_SUMMARY_FIELDS = tuple(field.name for field in fields(SalesSummary))
+
+# Insights prompt; the sales figures are filled in positionally by build_gemini_prompt
+GEMINI_PROMPT_TEMPLATE = """
 You are an AI analytics assistant for a coffee shop called DataBrew. Analyze the following sales data and provide 3-4 actionable business insights.
 
 Sales Data Summary:
-- Recent sales trend: {sales_data.get('trend', 'steady')}
-- Week-over-week change: {sales_data.get('wow_change', 0):.1f}%
-- Top selling products: {', '.join(sales_data.get('top_products', ['Unknown'])[:3])}
-- Top product revenue: ${sales_data.get('top_product_revenue', 0):.2f}
-- Peak hours: {peak_hours_text}
-- Peak hour customers: {sales_data.get('peak_hour_customers', 0)}
-- Average daily sales: ${sales_data.get('avg_daily_sales', 0):.2f}
-- Recent daily sales: ${sales_data.get('recent_daily_sales', 0):.2f}
-- Average order value: ${sales_data.get('avg_order_value', 0):.2f}
-- Low stock items: {low_stock_text}
-- Customer count: {sales_data.get('total_customers_today', 0)}
+- Recent sales trend: %s
+- Week-over-week change: %.1f%%
+- Top selling products: %s
+- Top product revenue: $%.2f
+- Peak hours: %s
+- Peak hour customers: %s
+- Average daily sales: $%.2f
+- Recent daily sales: $%.2f
+- Average order value: $%.2f
+- Low stock items: %s
+- Customer count: %s
 
 Generate EXACTLY 3-4 insights in the following JSON format. Each insight should be actionable and specific:
 
 [
-  {{
+  {
     "type": "trending_up" | "users" | "clock" | "alert",
     "text": "Brief, actionable insight (max 100 characters)",
     "color": "#22c55e" (green for positive) | "#f59e0b" (orange for warning) | "#ef4444" (red for urgent) | "#8b5e3c" (brown for neutral)
-  }}
+  }
 ]
 
 Rules:
@@ -90,66 +253,260 @@ Rules:
 
 Example:
 [
-  {{"type": "trending_up", "text": "Iced Latte sales up 12% WoW - stock up on milk and ice for peak hours", "color": "#22c55e"}},
-  {{"type": "users", "text": "Need 2 extra baristas during 6-8 PM rush based on traffic pattern", "color": "#f59e0b"}},
-  {{"type": "clock", "text": "Peak customer traffic at 3:00 PM - prepare popular items in advance", "color": "#8b5e3c"}},
-  {{"type": "alert", "text": "Cappuccino beans running low - reorder immediately to avoid stockout", "color": "#ef4444"}}
+  {"type": "trending_up", "text": "Iced Latte sales up 12%% WoW - stock up on milk and ice for peak hours", "color": "#22c55e"},
+  {"type": "users", "text": "Need 2 extra baristas during 6-8 PM rush based on traffic pattern", "color": "#f59e0b"},
+  {"type": "clock", "text": "Peak customer traffic at 3:00 PM - prepare popular items in advance", "color": "#8b5e3c"},
+  {"type": "alert", "text": "Cappuccino beans running low - reorder immediately to avoid stockout", "color": "#ef4444"}
 ]
 """
 
-        # Generate insights using Gemini
-        response = model.generate_content(prompt)
-        insights_text = response.text.strip()
 
-        # Extract JSON from the response
-        # Sometimes Gemini wraps JSON in markdown code blocks
-        json_match = re.search(r'```(?:json)?\s*(\[.*?\])\s*```', insights_text, re.DOTALL)
-        if json_match:
-            insights_text = json_match.group(1)
+def build_gemini_prompt(sales_data) -> str:
+    """
+    Build the Gemini insights prompt for a sales summary
 
-        # Parse JSON
-        insights = json.loads(insights_text)
+    Args:
+        sales_data: SalesSummary, or a dictionary containing sales information, trends, and patterns
 
-        # Validate and filter insights
-        valid_insights = []
-        for insight in insights:
-            if isinstance(insight, dict) and 'type' in insight and 'text' in insight and 'color' in insight:
-                valid_insights.append(insight)
+    Returns:
+        Prompt text
+    """
+    summary = sales_data if isinstance(sales_data, SalesSummary) else SalesSummary.from_dict(sales_data)
+
+    return GEMINI_PROMPT_TEMPLATE % (
+        summary.trend,
+        summary.wow_change,
+        ", ".join(islice(summary.top_products, 3)),
+        summary.top_product_revenue,
+        ", ".join(islice(summary.peak_hours, 3)),
+        summary.peak_hour_customers,
+        summary.avg_daily_sales,
+        summary.recent_daily_sales,
+        summary.avg_order_value,
+        ", ".join(islice(summary.low_stock_items, 3)) if summary.low_stock_items else "None",
+        summary.total_customers_today,
+    )
+
+
+def parse_gemini_insights(insights_text: str) -> list:
+    """
+    Extract and validate the insights list from a Gemini response
 
-        if len(valid_insights) >= 2:
-            return {
-                "insights": valid_insights[:4],  # Return max 4 insights
-                "source_data": sales_data
-            }
-        else:
-            raise ValueError("Generated insights did not meet minimum requirements")
+    Args:
+        insights_text: Raw response text
 
-    except Exception as e:
-        print(f"Error generating Gemini insights: {str(e)}")
-        print(f"Response: {insights_text if 'insights_text' in locals() else 'No response'}")
-        return {
-            "insights": get_fallback_insights(),
-            "source_data": sales_data
-        }
+    Returns:
+        Up to 4 valid insights
+
+    Raises:
+        ValueError: If fewer than 2 valid insights were generated
+    """
+    # Extract JSON from the response
+    # Sometimes Gemini wraps JSON in markdown code blocks
+    insights_text = strip_json_fence(insights_text)
+
+    # Parse JSON
+    insights = json_loads(insights_text)
+
+    # Validate and filter insights
+    valid_insights = []
+    for insight in insights:
+        if isinstance(insight, dict) and 'type' in insight and 'text' in insight and 'color' in insight:
+            valid_insights.append(insight)
 
+    if len(valid_insights) < 2:
+        raise ValueError("Generated insights did not meet minimum requirements")
 
-def generate_insights_with_groq(sales_data: dict) -> dict:
+    return valid_insights[:4]  # Return max 4 insights
+
+
+@retry(
+    stop=stop_after_attempt(3),
+    wait=wait_exponential_jitter(initial=0.25, max=4),
+    retry=retry_if_exception_type(GEMINI_RETRYABLE_ERRORS),
+    reraise=True,
+)
+def _call_gemini(model, prompt: str) -> str:
     """
-    Generate AI insights using Groq API (Llama 3.3 70B)
-    
+    Generate a Gemini response, backing off and retrying on rate limits and 5xx errors
+
+    The response is streamed, and reading stops as soon as the received
+    text holds a complete JSON array instead of waiting for the final chunk.
+    Each attempt waits for a free slot under the request quota first, so
+    concurrent requests queue instead of failing with 429s
+    """
+    _gemini_rate_limiter.acquire()
+    with _gemini_slots:
+        parts = []
+        for chunk in model.generate_content(prompt, stream=True):
+            parts.append(chunk.text)
+            if ']' in chunk.text and _is_complete_json(''.join(parts)):
+                break
+    return ''.join(parts).strip()
+
+
+def _is_complete_json(text: str) -> bool:
+    """Whether text (optionally fenced) already parses as JSON"""
+    try:
+        json_loads(strip_json_fence(text.strip()))
+        return True
+    except ValueError:
+        return False
+
+
+# Decodes one array element at a time out of a partially received response
+_element_decoder = JSONDecoder()
+
+
+def iter_streamed_insights(chunks: Iterable[str]) -> Iterator[dict]:
+    """
+    Yield each valid insight from a streamed JSON array as soon as its object is complete
+
+    Text before the opening bracket (such as a markdown fence) is skipped;
+    reading stops at the closing bracket
+    """
+    buffer = ''
+    pos = None  # just past the last decoded element, once '[' has been seen
+
+    for chunk in chunks:
+        buffer += chunk
+        if pos is None:
+            start = buffer.find('[')
+            if start < 0:
+                continue
+            pos = start + 1
+
+        while True:
+            while pos < len(buffer) and buffer[pos] in ' \t\r\n,':
+                pos += 1
+            if pos >= len(buffer):
+                break
+            if buffer[pos] == ']':
+                return
+            try:
+                insight, pos = _element_decoder.raw_decode(buffer, pos)
+            except ValueError:
+                break  # element still incomplete; wait for more text
+            if isinstance(insight, dict) and all(k in insight for k in ('type', 'text', 'color')):
+                yield insight
+
+
+def _stream_groq_text(groq_client, sales_data: dict) -> Iterator[str]:
+    """Text deltas of a streamed Groq insights completion"""
+    stream = groq_client.chat.completions.create(
+        messages=build_groq_messages(sales_data),
+        model=GROQ_MODEL_NAME,
+        temperature=0.5,
+        max_tokens=1000,
+        stream=True,
+    )
+    for chunk in stream:
+        if chunk.choices and chunk.choices[0].delta.content:
+            yield chunk.choices[0].delta.content
+
+
+def _stream_gemini_text(model, sales_data: dict) -> Iterator[str]:
+    """Text chunks of a streamed Gemini insights response, taken under the request quota"""
+    _gemini_rate_limiter.acquire()
+    with _gemini_slots:
+        for chunk in model.generate_content(build_gemini_prompt(sales_data), stream=True):
+            yield chunk.text
+
+
+def stream_ai_insights(sales_data: dict) -> Iterator[dict]:
+    """
+    Yield up to 4 insights one by one while the model is still generating
+
+    Tries Groq, then Gemini, like generate_ai_insights. A provider that
+    fails before producing an insight hands over to the next one; if none
+    produces any, the fallback insights are yielded instead. A streamed
+    response can't be retried once insights have gone out, so there is no
+    backoff here
+    """
+    sources = []
+    groq_client = get_groq_client()
+    if groq_client:
+        sources.append(("Groq", lambda: _stream_groq_text(groq_client, sales_data)))
+    model = get_gemini_model()
+    if model:
+        sources.append(("Gemini", lambda: _stream_gemini_text(model, sales_data)))
+
+    for name, open_stream in sources:
+        produced = 0
+        try:
+            for insight in islice(iter_streamed_insights(open_stream()), 4):
+                produced += 1
+                yield insight
+        except Exception as e:
+            if produced:
+                logger.warning("%s insight stream broke off after %d insights: %s", name, produced, e)
+                return
+            logger.warning("%s insight stream failed: %s", name, e)
+            continue
+        if produced:
+            return
+
+    yield from get_fallback_insights()
+
+
+def select_source_data(sales_data: dict, include_source: bool = False) -> dict:
+    """Sales figures echoed back with the insights: the prompt fields, or all of them with include_source"""
+    if include_source:
+        return sales_data
+    return {name: sales_data[name] for name in SALES_SUMMARY_FIELDS if name in sales_data}
+
+
+def generate_ai_insights(sales_data: dict, include_source: bool = False) -> dict:
+    """
+    Generate AI insights using Groq API (primary) or Gemini API (fallback) based on sales data
+
     Args:
         sales_data: Dictionary containing sales information, trends, and patterns
-    
+        include_source: Return all of sales_data as source_data instead of only the prompt fields
+
     Returns:
-        Dictionary containing insights list and source_data
+        Dictionary containing insights list and source_data for transparency
     """
+    groq_client = get_groq_client()
+    model = get_gemini_model()
+
+    # Try Groq first
+    if groq_client:
+        try:
+            return generate_insights_with_groq(sales_data, include_source)
+        except Exception as e:
+            logger.warning("Groq API failed: %s, falling back to Gemini", e)
+    
+    # Fallback to Gemini
+    if not model:
+        return {"insights": get_fallback_insights(), "source_data": select_source_data(sales_data, include_source)}
+
     try:
-        # Prepare the prompt with sales data context
-        low_stock_text = ", ".join(sales_data.get('low_stock_items', [])[:3]) if sales_data.get('low_stock_items') else "None"
-        peak_hours_text = ", ".join(sales_data.get('peak_hours', ['Unknown'])[:3])
-        top_products_text = ", ".join(sales_data.get('top_products', ['Unknown'])[:3])
+        prompt = build_gemini_prompt(sales_data)
+
+        # Generate insights using Gemini
+        insights_text = _call_gemini(model, prompt)
+
+        return {
+            "insights": parse_gemini_insights(insights_text),
+            "source_data": select_source_data(sales_data, include_source)
+        }
+
+    except Exception:
+        logger.exception("Error generating Gemini insights")
+        return {
+            "insights": get_fallback_insights(),
+            "source_data": select_source_data(sales_data, include_source)
+        }
+
+
+def build_groq_messages(sales_data: dict) -> list:
+    """Chat messages asking Groq for 3-4 insights on sales_data"""
+    low_stock_text = ", ".join(sales_data.get('low_stock_items', [])[:3]) if sales_data.get('low_stock_items') else "None"
+    peak_hours_text = ", ".join(sales_data.get('peak_hours', ['Unknown'])[:3])
+    top_products_text = ", ".join(sales_data.get('top_products', ['Unknown'])[:3])
 
-        prompt = f"""You are an AI analytics assistant for DataBrew coffee shop. Analyze the sales data and provide 3-4 actionable insights.
+    prompt = f"""You are an AI analytics assistant for DataBrew coffee shop. Analyze the sales data and provide 3-4 actionable insights.
 
 Sales Data:
 - Trend: {sales_data.get('trend', 'steady')}
@@ -167,19 +524,36 @@ Return ONLY a JSON array with 3-4 insights. Each insight must have:
 
 Use specific numbers from the data. Focus on actionable recommendations. No markdown, just JSON array."""
 
+    return [
+        {
+            "role": "system",
+            "content": "You are a business analytics AI that returns only valid JSON arrays. No explanations, no markdown, just JSON."
+        },
+        {
+            "role": "user",
+            "content": prompt
+        }
+    ]
+
+
+def generate_insights_with_groq(sales_data: dict, include_source: bool = False) -> dict:
+    """
+    Generate AI insights using Groq API (Llama 3.3 70B)
+    
+    Args:
+        sales_data: Dictionary containing sales information, trends, and patterns
+        include_source: Return all of sales_data as source_data instead of only the prompt fields
+    
+    Returns:
+        Dictionary containing insights list and source_data
+    """
+    groq_client = get_groq_client()
+
+    try:
         # Call Groq API
         chat_completion = groq_client.chat.completions.create(
-            messages=[
-                {
-                    "role": "system",
-                    "content": "You are a business analytics AI that returns only valid JSON arrays. No explanations, no markdown, just JSON."
-                },
-                {
-                    "role": "user",
-                    "content": prompt
-                }
-            ],
-            model="llama-3.3-70b-versatile",
+            messages=build_groq_messages(sales_data),
+            model=GROQ_MODEL_NAME,
             temperature=0.5,
             max_tokens=1000,
         )
@@ -187,12 +561,10 @@ Use specific numbers from the data. Focus on actionable recommendations. No mark
         response_text = chat_completion.choices[0].message.content.strip()
         
         # Extract JSON from response
-        json_match = re.search(r'```(?:json)?\s*(\[.*?\])\s*```', response_text, re.DOTALL)
-        if json_match:
-            response_text = json_match.group(1)
+        response_text = strip_json_fence(response_text)
         
         # Parse JSON
-        insights = json.loads(response_text)
+        insights = json_loads(response_text)
         
         # Validate insights
         valid_insights = []
@@ -203,13 +575,13 @@ Use specific numbers from the data. Focus on actionable recommendations. No mark
         if len(valid_insights) >= 2:
             return {
                 "insights": valid_insights[:4],
-                "source_data": sales_data
+                "source_data": select_source_data(sales_data, include_source)
             }
         else:
             raise ValueError("Generated insights did not meet minimum requirements")
             
-    except Exception as e:
-        print(f"Error generating Groq insights: {str(e)}")
+    except Exception:
+        logger.exception("Error generating Groq insights")
         raise  # Re-raise to trigger fallback to Gemini
 
 
@@ -236,6 +608,116 @@ def get_fallback_insights() -> list:
     ]
 
 
+def _is_arrow_string(dtype) -> bool:
+    """Whether a pandas dtype stores strings in a PyArrow array"""
+    import pandas as pd
+
+    if isinstance(dtype, pd.ArrowDtype):
+        import pyarrow as pa
+        return pa.types.is_string(dtype.pyarrow_dtype) or pa.types.is_large_string(dtype.pyarrow_dtype)
+    return isinstance(dtype, pd.StringDtype) and dtype.storage == 'pyarrow'
+
+
+def parse_hours(times):
+    """
+    Extract the hour of day from a column of transaction times
+
+    Args:
+        times: Pandas Series of 'HH:MM:SS' strings or TIME (timedelta) values
+
+    Returns:
+        Float Series of hours, NaN where the value is not a valid time
+    """
+    import numpy as np
+    import pandas as pd
+
+    if pd.api.types.is_timedelta64_dtype(times):
+        return times.dt.total_seconds() // 3600
+
+    # Arrow-backed strings are parsed by Arrow's compute kernels in place,
+    # without converting the column to numpy objects first
+    if _is_arrow_string(times.dtype):
+        import pyarrow as pa
+        import pyarrow.compute as pc
+
+        parsed = pc.strptime(pa.array(times), format='%H:%M:%S', unit='s', error_is_null=True)
+        hours = pc.cast(pc.hour(parsed), pa.float64()).to_numpy(zero_copy_only=False)
+        return pd.Series(hours, index=times.index)
+
+    # Read the hour digits straight from the fixed-width byte layout
+    # instead of running every value through a datetime parser; the colon
+    # is third for 'HH:MM:SS' and second for unpadded 'H:MM:SS'
+    raw = times.to_numpy(dtype='S8').view(np.uint8).reshape(-1, 8)
+    digits = raw[:, :2].astype(np.int16) - ord('0')
+    is_digit = (digits >= 0) & (digits <= 9)
+    padded = is_digit.all(axis=1) & (raw[:, 2] == ord(':'))
+    unpadded = is_digit[:, 0] & (raw[:, 1] == ord(':'))
+    hours = np.where(padded, digits[:, 0] * 10 + digits[:, 1], digits[:, 0])
+    valid = (padded | unpadded) & (hours < 24)
+
+    return pd.Series(np.where(valid, hours, np.nan), index=times.index)
+
+
+def _quantity_rankings(df, keys: list) -> tuple:
+    """
+    Top 3 products and the peak hour by quantity sold
+
+    Quantities are totalled per (product, hour) in a single grouping pass
+    and both rankings are rolled up from it
+
+    Returns:
+        (top_products, peak_hour), each None when its key column is missing
+    """
+    import numpy as np
+
+    totals = df.groupby(keys, sort=False, dropna=False)['transaction_qty'].sum()
+    top_products = peak_hour = None
+
+    if 'product_detail' in keys:
+        product_totals = totals.groupby(level='product_detail', sort=False).sum()
+        # Partial selection of the top 3 (O(n)), then order just those
+        values = product_totals.to_numpy()
+        k = min(3, len(values))
+        top = np.argpartition(values, -k)[-k:] if k else np.array([], dtype=np.intp)
+        top = top[np.argsort(-values[top], kind='stable')]
+        top_products = product_totals.index.to_numpy()[top].tolist()
+
+    if 'hour' in keys:
+        hour_totals = totals.groupby(level='hour').sum()
+        if not hour_totals.empty:
+            peak_hour = hour_totals.index[hour_totals.to_numpy().argmax()]
+
+    return top_products, peak_hour
+
+
+def _quantity_rankings_polars(df, keys: list) -> tuple:
+    """
+    Polars version of _quantity_rankings
+
+    Both rankings are collected together from one lazy query, so the
+    shared (product, hour) aggregation runs once, in parallel and
+    outside the GIL
+    """
+    totals = (
+        pl.from_pandas(df[keys + ['transaction_qty']])
+        .lazy()
+        .group_by(keys)
+        .agg(pl.col('transaction_qty').sum())
+    )
+
+    queries = {
+        key: totals.group_by(key).agg(pl.col('transaction_qty').sum()).top_k(limit, by='transaction_qty')
+        .sort('transaction_qty', descending=True)
+        for key, limit in (('product_detail', 3), ('hour', 1))
+        if key in keys
+    }
+    results = dict(zip(queries, pl.collect_all(queries.values())))
+
+    top_products = results['product_detail']['product_detail'].to_list() if 'product_detail' in results else None
+    hours = results['hour']['hour'].to_list() if 'hour' in results else []
+    return top_products, hours[0] if hours else None
+
+
 def prepare_sales_summary(df) -> dict:
     """
     Prepare a sales data summary for Gemini analysis
@@ -246,20 +728,21 @@ def prepare_sales_summary(df) -> dict:
     Returns:
         Dictionary with summarized sales information
     """
-    import pandas as pd
-    from datetime import datetime, timedelta
+    import numpy as np
 
     summary = {}
 
     try:
+        # Parse the hour of day once; it feeds the grouped totals below
+        if 'transaction_time' in df.columns:
+            df = df.assign(hour=parse_hours(df['transaction_time']))
+
         # Calculate basic metrics
         if not df.empty and 'sales_amount' in df.columns:
-            # Average daily sales
-            summary['avg_daily_sales'] = df['sales_amount'].mean()
+            # Average daily sales and the recent/older 7-entry means for the trend
+            avg_sales, recent_sales, older_sales = _sales_stats(df['sales_amount'].to_numpy(dtype=np.float64))
+            summary['avg_daily_sales'] = avg_sales
 
-            # Calculate trend
-            recent_sales = df.tail(7)['sales_amount'].mean()
-            older_sales = df.head(7)['sales_amount'].mean()
             if older_sales > 0:
                 trend_pct = ((recent_sales - older_sales) / older_sales) * 100
                 summary['trend'] = 'increasing' if trend_pct > 5 else 'decreasing' if trend_pct < -5 else 'steady'
@@ -272,29 +755,24 @@ def prepare_sales_summary(df) -> dict:
             summary['trend'] = 'steady'
             summary['wow_change'] = 0
 
+        # Product and hour rankings by quantity sold
+        keys = [key for key in ('product_detail', 'hour') if key in df.columns]
+        top_products = peak_hour = None
+        if keys and 'transaction_qty' in df.columns:
+            rankings = _quantity_rankings_polars if pl is not None and len(df) >= POLARS_MIN_ROWS else _quantity_rankings
+            top_products, peak_hour = rankings(df, keys)
+
         # Top products
-        if 'product_detail' in df.columns and 'transaction_qty' in df.columns:
-            top_products = df.groupby('product_detail')['transaction_qty'].sum().nlargest(3).index.tolist()
-            summary['top_products'] = top_products
-        else:
-            summary['top_products'] = ['Coffee', 'Latte', 'Espresso']
+        summary['top_products'] = top_products if top_products is not None else ['Coffee', 'Latte', 'Espresso']
 
         # Peak hours
-        if 'transaction_time' in df.columns:
-            df['hour'] = pd.to_datetime(df['transaction_time'], format='%H:%M:%S', errors='coerce').dt.hour
-            if 'hour' in df.columns and df['hour'].notna().sum() > 0:
-                peak_hour = df.groupby('hour')['transaction_qty'].sum().idxmax()
-                summary['peak_hours'] = f"{peak_hour}:00"
-            else:
-                summary['peak_hours'] = "2:00 PM - 4:00 PM"
-        else:
-            summary['peak_hours'] = "2:00 PM - 4:00 PM"
+        summary['peak_hours'] = f"{int(peak_hour)}:00" if peak_hour is not None else "2:00 PM - 4:00 PM"
 
         # Customer trend
         summary['customer_trend'] = 'growing'
 
-    except Exception as e:
-        print(f"Error preparing sales summary: {str(e)}")
+    except Exception:
+        logger.exception("Error preparing sales summary")
         # Return default values
         summary = {
             'avg_daily_sales': 8500,
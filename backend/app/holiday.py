@@ -3,9 +3,29 @@ Holiday Detection Service
 Fetches holidays for the next 30 days using a public holiday API
 """
 
-import requests
+import asyncio
+import logging
+import os
+import time
+import httpx
+import numpy as np
+from cachetools import TTLCache
+from tenacity import retry, retry_if_exception_type, retry_if_result, stop_after_attempt, wait_exponential_jitter
 from datetime import datetime, timedelta
-from typing import List, Dict
+from pathlib import Path
+from typing import List, Dict, Optional
+
+# orjson parses much faster; fall back to the stdlib parser without it
+try:
+    from orjson import dumps as json_dumps, loads as json_loads
+except ImportError:
+    from json import loads as json_loads
+
+    def json_dumps(obj) -> bytes:
+        from json import dumps
+        return dumps(obj).encode()
+
+logger = logging.getLogger(__name__)
 
 # Using Calendarific API (free tier available) or Abstract API
 # For demonstration, using a free holidays API
@@ -14,13 +34,95 @@ HOLIDAYS_API_URL = "https://date.nager.at/api/v3/PublicHolidays"
 # Default country code (US for API, but use BD fallback holidays)
 DEFAULT_COUNTRY_CODE = "US"  # Changed from BD since BD is not available in the API
 
+HTTP_TIMEOUT_SECONDS = 10
 
-def get_next_30_days_holidays(country_code: str = DEFAULT_COUNTRY_CODE) -> List[Dict]:
+# Shared client for async callers; keeps TLS connections to the API alive between requests
+_HTTP = httpx.AsyncClient(timeout=HTTP_TIMEOUT_SECONDS, http2=True)
+
+# Rate-limit and server error statuses that are retried before falling back
+RETRY_STATUS_CODES = {429, 500, 502, 503, 504}
+
+# A year's public holidays rarely change, so API responses are cached per
+# (country, year) in memory and on disk for a day
+HOLIDAY_CACHE_TTL_SECONDS = 24 * 60 * 60
+HOLIDAY_CACHE_DIR = Path(os.getenv("HOLIDAY_CACHE_DIR", Path.home() / ".cache" / "databrew" / "holidays"))
+_year_cache = TTLCache(maxsize=32, ttl=HOLIDAY_CACHE_TTL_SECONDS)
+
+
+def _read_cached_year(path: Path) -> Optional[List[Dict]]:
+    """Load a year's holidays from the disk cache if the file is still fresh"""
+    try:
+        if time.time() - path.stat().st_mtime < HOLIDAY_CACHE_TTL_SECONDS:
+            return json_loads(path.read_bytes())
+    except (OSError, ValueError):
+        pass
+    return None
+
+
+def _write_cached_year(path: Path, holidays: List[Dict]):
+    """Store a year's holidays in the disk cache"""
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_bytes(json_dumps(holidays))
+    except OSError as e:
+        logger.warning("Could not write holiday cache %s: %s", path, e)
+
+
+@retry(
+    stop=stop_after_attempt(3),
+    wait=wait_exponential_jitter(initial=0.25, max=4),
+    retry=retry_if_exception_type(httpx.TransportError)
+    | retry_if_result(lambda response: response.status_code in RETRY_STATUS_CODES),
+    # Hand the last response (or raise the last error) to the caller once retries run out
+    retry_error_callback=lambda state: state.outcome.result(),
+)
+async def _get(client: httpx.AsyncClient, url: str) -> httpx.Response:
+    """GET from the holiday API, retrying connection errors, rate limits and 5xx responses"""
+    return await client.get(url)
+
+
+def _holiday_dates(holidays: List[Dict]) -> np.ndarray:
+    """Parse the 'YYYY-MM-DD' dates of a holiday list in one pass"""
+    return np.array([holiday['date'] for holiday in holidays], dtype='datetime64[D]')
+
+
+def _within_window(holidays: List[Dict], start: datetime, end: datetime) -> List[Dict]:
+    """Holidays whose date falls between start and end (inclusive)"""
+    dates = _holiday_dates(holidays)
+    mask = (dates >= np.datetime64(start.date(), 'D')) & (dates <= np.datetime64(end.date(), 'D'))
+    return [holidays[i] for i in np.flatnonzero(mask)]
+
+
+async def _fetch_year(client: httpx.AsyncClient, country_code: str, year: int) -> Optional[List[Dict]]:
+    """
+    Raw API holidays for one country and year, or None if the API request failed
+    """
+    key = (country_code, year)
+    holidays = _year_cache.get(key)
+    if holidays is not None:
+        return holidays
+    
+    path = HOLIDAY_CACHE_DIR / f"{country_code}_{year}.json"
+    holidays = _read_cached_year(path)
+    if holidays is None:
+        response = await _get(client, f"{HOLIDAYS_API_URL}/{year}/{country_code}")
+        if response.status_code != 200:
+            return None
+        holidays = json_loads(response.content)
+        _write_cached_year(path, holidays)
+    
+    _year_cache[key] = holidays
+    return holidays
+
+
+async def fetch_next_30_days_holidays(country_code: str = DEFAULT_COUNTRY_CODE,
+                                      client: Optional[httpx.AsyncClient] = None) -> List[Dict]:
     """
     Fetch holidays for the next 7 days
     
     Args:
         country_code: ISO 3166-1 alpha-2 country code (US, IN, etc.)
+        client: HTTP client to use, defaults to the shared module client
     
     Returns:
         List of holiday dictionaries with date, name, and type
@@ -30,58 +132,79 @@ def get_next_30_days_holidays(country_code: str = DEFAULT_COUNTRY_CODE) -> List[
     if country_code == "BD" or country_code == DEFAULT_COUNTRY_CODE:
         return get_fallback_holidays()
     
+    client = client or _HTTP
+    
     try:
         # Get current year and next year
         current_date = datetime.now()
         current_year = current_date.year
-        next_year = current_year + 1
         end_date = current_date + timedelta(days=7)
         
-        holidays = []
+        # If date range spans into next year, fetch next year's holidays too
+        years = [current_year]
+        if end_date.year > current_year:
+            years.append(current_year + 1)
         
-        # Fetch holidays for current year
-        url_current = f"{HOLIDAYS_API_URL}/{current_year}/{country_code}"
-        response_current = requests.get(url_current, timeout=10)
+        # Both years are requested concurrently over the pooled connection
+        results = await asyncio.gather(
+            *(_fetch_year(client, country_code, year) for year in years)
+        )
         
-        if response_current.status_code == 200:
-            holidays.extend(response_current.json())
-        else:
+        if results[0] is None:
             # API failed, use fallback
             return get_fallback_holidays()
         
-        # If date range spans into next year, fetch next year's holidays too
-        if end_date.year > current_year:
-            url_next = f"{HOLIDAYS_API_URL}/{next_year}/{country_code}"
-            response_next = requests.get(url_next, timeout=10)
-            
-            if response_next.status_code == 200:
-                holidays.extend(response_next.json())
+        holidays = []
+        for year_holidays in results:
+            if year_holidays is not None:
+                holidays.extend(year_holidays)
         
         # Filter holidays within next 7 days
-        filtered_holidays = []
-        for holiday in holidays:
-            holiday_date = datetime.strptime(holiday['date'], '%Y-%m-%d')
-            
-            if current_date.date() <= holiday_date.date() <= end_date.date():
-                filtered_holidays.append({
-                    'date': holiday['date'],
-                    'name': holiday['name'],
-                    'localName': holiday.get('localName', holiday['name']),
-                    'type': holiday.get('types', ['Public'])[0] if holiday.get('types') else 'Public',
-                    'global': holiday.get('global', True),
-                    'counties': holiday.get('counties', None)
-                })
+        filtered_holidays = [
+            {
+                'date': holiday['date'],
+                'name': holiday['name'],
+                'localName': holiday.get('localName', holiday['name']),
+                'type': holiday.get('types', ['Public'])[0] if holiday.get('types') else 'Public',
+                'global': holiday.get('global', True),
+                'counties': holiday.get('counties', None)
+            }
+            for holiday in _within_window(holidays, current_date, end_date)
+        ]
         
         # If no holidays found in next 7 days, return empty list (not fallback)
         return filtered_holidays
         
-    except requests.RequestException as e:
-        print(f"Error fetching holidays: {e}")
+    except httpx.HTTPError as e:
+        logger.warning("Error fetching holidays: %s", e)
+        return get_fallback_holidays()
+    except Exception:
+        logger.exception("Unexpected error in holiday service")
         return get_fallback_holidays()
-    except Exception as e:
-        print(f"Unexpected error in holiday service: {e}")
+
+
+def get_next_30_days_holidays(country_code: str = DEFAULT_COUNTRY_CODE) -> List[Dict]:
+    """
+    Blocking version of fetch_next_30_days_holidays for code not running on an event loop
+    
+    The shared client's connections belong to the loop that opened them, so
+    each call here runs on its own loop with a short-lived client; countries
+    served from the fallback list return before either is created
+    """
+    if country_code == "BD" or country_code == DEFAULT_COUNTRY_CODE:
         return get_fallback_holidays()
 
+    async def fetch() -> List[Dict]:
+        async with httpx.AsyncClient(timeout=HTTP_TIMEOUT_SECONDS, http2=True) as client:
+            return await fetch_next_30_days_holidays(country_code, client)
+    
+    return asyncio.run(fetch())
+
+
+async def close_http_client():
+    """Close the shared holiday API client and its pooled connections"""
+    await _HTTP.aclose()
+
 
 def get_fallback_holidays() -> List[Dict]:
     """
@@ -117,21 +240,18 @@ def get_fallback_holidays() -> List[Dict]:
     
     # Filter for next 30 days
     end_date = current_date + timedelta(days=7)
-    filtered = []
     
-    for holiday in common_holidays:
-        holiday_date = datetime.strptime(holiday['date'], '%Y-%m-%d')
-        if current_date.date() <= holiday_date.date() <= end_date.date():
-            filtered.append({
-                'date': holiday['date'],
-                'name': holiday['name'],
-                'localName': holiday['name'],
-                'type': holiday['type'],
-                'global': True,
-                'counties': None
-            })
-    
-    return filtered
+    return [
+        {
+            'date': holiday['date'],
+            'name': holiday['name'],
+            'localName': holiday['name'],
+            'type': holiday['type'],
+            'global': True,
+            'counties': None
+        }
+        for holiday in _within_window(common_holidays, current_date, end_date)
+    ]
 
 
 def format_holidays_for_analysis(holidays: List[Dict]) -> str:
@@ -147,16 +267,16 @@ def format_holidays_for_analysis(holidays: List[Dict]) -> str:
     if not holidays:
         return "No holidays in next 7 days."
     
-    holiday_text = f"Holidays (7 days): {len(holidays)} total\\n"
+    today = np.datetime64(datetime.now().date(), 'D')
+    days_until_all = (_holiday_dates(holidays) - today).astype(int).tolist()
     
-    for holiday in holidays:
-        holiday_date = datetime.strptime(holiday['date'], '%Y-%m-%d')
-        days_until = (holiday_date.date() - datetime.now().date()).days
-        
-        holiday_text += f"- {holiday['name']} on {holiday['date']} "
-        holiday_text += f"({days_until} days from now, {holiday['type']})\n"
+    lines = [f"Holidays (7 days): {len(holidays)} total\\n"]
+    lines.extend(
+        f"- {holiday['name']} on {holiday['date']} ({days_until} days from now, {holiday['type']})\n"
+        for holiday, days_until in zip(holidays, days_until_all)
+    )
     
-    return holiday_text
+    return "".join(lines)
 
 
 if __name__ == "__main__":
@@ -1,19 +1,34 @@
 # backend.py
 from fastapi import FastAPI, HTTPException, Header
-from fastapi.responses import JSONResponse
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import ORJSONResponse, StreamingResponse
+import asyncio
+import logging
+import orjson
 import pandas as pd
-import pickle
+import numpy as np
+import joblib
 import os
-from sqlalchemy import create_engine
 from fastapi.middleware.cors import CORSMiddleware
 from datetime import datetime, timedelta
-from .gemini_service import generate_ai_insights, prepare_sales_summary
+from .config.database import get_engine, get_async_engine, dispose_engine, dispose_async_engine, ensure_indexes
+from .config.logging_config import setup_logging, stop_logging
+from .gemini_service import (
+    generate_ai_insights,
+    prepare_sales_summary,
+    select_source_data,
+    stream_ai_insights,
+    warmup as warmup_llm_clients,
+)
 from .predictive_analytics import (
-    get_next_30_days_holidays,
     get_weather_forecast_data,
     get_sales_data_last_60_days,
-    generate_predictive_insights
+    generate_predictive_insights,
+    close_http_client as close_weather_client
 )
+from .holiday import fetch_next_30_days_holidays, close_http_client as close_holiday_client
+from .sales_rollups import ensure_rollup_tables, refresh_sales_rollups, ROLLUP_REFRESH_SECONDS
+from .stock_levels import ALERT_LEVELS, DEMAND_LEVELS, classify_stock
 from .auth import (
     LoginRequest,
     SignupRequest,
@@ -26,12 +41,25 @@ from .auth import (
     get_user_profile
 )
 from typing import Optional
+from sqlalchemy import Boolean, Float, Integer, column, text
+from functools import lru_cache, partial, wraps
+from concurrent.futures import ThreadPoolExecutor
+from threading import RLock
+from cachetools import TTLCache, cached
+from cachetools.keys import hashkey
+
+logger = logging.getLogger(__name__)
 
-app = FastAPI(title="Coffee Sales Analytics API")
+app = FastAPI(title="Coffee Sales Analytics API", default_response_class=ORJSONResponse)
 
 # Fixed current date for the application (2023-06-24)
 CURRENT_DATE = datetime(2023, 6, 24)
 
+# "Today" for the dashboard and analytics queries, bound into them as :anchor
+ANCHOR_DATE = '2025-11-30'
+ANCHOR_PARAMS = {"anchor": ANCHOR_DATE}
+ANCHOR_DAY = datetime.strptime(ANCHOR_DATE, "%Y-%m-%d").date()
+
 # Allow CORS for your frontend (adjust origin as needed)
 app.add_middleware(
     CORSMiddleware,
@@ -40,26 +68,205 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-# Load pre-trained SARIMA model (if exists)
-sarima_model = None
+# Pre-trained SARIMA model (if exists)
 model_path = os.path.join(os.path.dirname(os.path.dirname(__file__)), "models", "sarima_model_forcast.pkl")
-if os.path.exists(model_path):
+
+
+@lru_cache(maxsize=1)
+def get_sarima_model():
+    """
+    Load the pre-trained SARIMA model on first use
+
+    Deferred from import so workers that never forecast don't pay the
+    unpickling time or hold the model in memory; None if unavailable
+    """
+    if not os.path.exists(model_path):
+        logger.warning("SARIMA model not found at %s", model_path)
+        return None
     try:
-        with open(model_path, "rb") as f:
-            sarima_model = pickle.load(f)
-        print("SARIMA model loaded successfully")
+        # Arrays in a joblib.dump'ed model are memory-mapped copy-on-write, so
+        # forked workers share the pages; plain pickles load as before
+        sarima_model = joblib.load(model_path, mmap_mode="c")
+        logger.info("SARIMA model loaded successfully")
+        return sarima_model
     except Exception as e:
-        print(f"Warning: Could not load SARIMA model: {e}")
-else:
-    print(f"Warning: SARIMA model not found at {model_path}")
+        logger.warning("Could not load SARIMA model: %s", e)
+        return None
 
 # SQL connection setup
-try:
-    engine = create_engine("mysql+pymysql://root:@localhost:3306/databrew")
-    print("Database connection established successfully")
-except Exception as e:
-    print(f"Warning: Could not create database engine: {e}")
-    engine = None
+# Shares the engine (and its connection pool) configured in config/database.py
+engine = get_engine()
+async_engine = get_async_engine()
+
+
+# Dashboard and analytics responses only change as new transactions land, so
+# identical requests within the TTL are answered from memory. Keys are the
+# endpoint name plus its query parameters
+ENDPOINT_CACHE_TTL_SECONDS = 60
+_endpoint_cache = TTLCache(maxsize=256, ttl=ENDPOINT_CACHE_TTL_SECONDS)
+_cache_lock = RLock()
+
+
+# Ingredient and product listings change only through the write endpoints
+# below, which clear this cache after committing; the short TTL covers edits
+# made straight in the database
+CATALOG_CACHE_TTL_SECONDS = 15
+_catalog_cache = TTLCache(maxsize=256, ttl=CATALOG_CACHE_TTL_SECONDS)
+
+
+def cached_endpoint(name: str, cache: TTLCache = _endpoint_cache):
+    """Memoize a function's result per (name, arguments) in a TTL cache"""
+    return cached(cache, key=partial(hashkey, name), lock=_cache_lock)
+
+
+def async_cached_endpoint(name: str, cache: TTLCache = _endpoint_cache):
+    """cached_endpoint for async def endpoints: memoizes the awaited result, not the coroutine"""
+    def decorator(func):
+        @wraps(func)
+        async def wrapper(*args, **kwargs):
+            key = hashkey(name, *args, **kwargs)
+            with _cache_lock:
+                if key in cache:
+                    return cache[key]
+            result = await func(*args, **kwargs)
+            with _cache_lock:
+                cache[key] = result
+            return result
+        return wrapper
+    return decorator
+
+
+def clear_catalog_cache():
+    """Drop every cached ingredient and product response after a write"""
+    with _cache_lock:
+        _catalog_cache.clear()
+
+
+def read_sql(query, params=None, **kwargs) -> pd.DataFrame:
+    """
+    Run a query on a connection checked out from the shared pool
+
+    The connection goes back to the pool as soon as the rows are read.
+    Extra keyword arguments (parse_dates, dtype, ...) go to pd.read_sql so
+    columns are typed as they are read
+    """
+    with engine.connect() as conn:
+        return pd.read_sql(query, conn, params=params, **kwargs)
+
+
+async def read_sql_async(query, params=None, parse_dates=None, dtype=None) -> pd.DataFrame:
+    """
+    read_sql for async endpoints: runs the query on the asyncio engine
+
+    The event loop keeps serving other requests while MySQL works instead
+    of a pool thread blocking on the round-trip. DECIMAL columns become
+    floats as with pd.read_sql; parse_dates and dtype are applied afterwards
+    """
+    async with async_engine.connect() as conn:
+        result = await conn.execute(query, params or {})
+        df = pd.DataFrame.from_records(result.fetchall(), columns=list(result.keys()), coerce_float=True)
+
+    for name in parse_dates or ():
+        df[name] = pd.to_datetime(df[name])
+    return df.astype(dtype) if dtype else df
+
+
+async def fetch_all_async(query, params=None) -> list:
+    """
+    All rows of a query as tuples, read on the asyncio engine
+
+    For endpoints that only return a handful of rows: no pool thread is tied
+    up on the round-trip and no DataFrame is built around the result
+    """
+    async with async_engine.connect() as conn:
+        return (await conn.execute(query, params or {})).all()
+
+
+def frame_records(df: pd.DataFrame, columns) -> list:
+    """Rows of the given columns as dicts of plain Python values (to_dict('records') without its per-row overhead)"""
+    return [dict(zip(columns, values)) for values in zip(*(df[column].tolist() for column in columns))]
+
+
+def fetch_one(query, params=None):
+    """
+    First row of a query (None when it returns no rows)
+
+    For single-row aggregates: the values are read straight off the Row
+    without building a DataFrame around them
+    """
+    with engine.connect() as conn:
+        return conn.execute(query, params or {}).first()
+
+
+def fetch_all(query, params=None) -> list:
+    """
+    All rows of a query as plain dicts
+
+    For listings returned as JSON as they are: rows go straight from the
+    driver to dicts, with no DataFrame built in between
+    """
+    with engine.connect() as conn:
+        return [dict(row) for row in conn.execute(query, params or {}).mappings()]
+
+
+# Threads for running independent queries of one request side by side.
+# Sized so concurrent dashboard and analytics requests do not queue behind
+# each other while staying well inside the engine's connection pool
+_sql_executor = ThreadPoolExecutor(max_workers=12, thread_name_prefix="sql")
+
+
+def read_sql_many(*queries, params=None) -> list:
+    """
+    Run independent queries at once, each on its own pooled connection
+
+    params is shared by all queries; returns the DataFrames in the order
+    the queries were given
+    """
+    return list(_sql_executor.map(partial(read_sql, params=params), queries))
+
+
+# Periodic refresh tasks started on startup and cancelled on shutdown
+_background_tasks = []
+
+
+async def refresh_rollups_periodically():
+    """Background task: fold new transactions into the sales rollups every ROLLUP_REFRESH_SECONDS"""
+    while True:
+        await asyncio.sleep(ROLLUP_REFRESH_SECONDS)
+        try:
+            await run_in_threadpool(refresh_sales_rollups, engine)
+        except Exception:
+            logger.exception("Background sales rollup refresh failed")
+
+
+@app.on_event("startup")
+async def startup_event():
+    """Start queued logging, open the LLM client connections, bring the sales rollups up to date and start the refresh cycles"""
+    setup_logging()
+    await run_in_threadpool(warmup_llm_clients)
+    if engine is not None:
+        await run_in_threadpool(ensure_indexes, engine)
+        # Dashboard queries read the rollups, so they must be current before serving
+        await run_in_threadpool(ensure_rollup_tables, engine)
+        try:
+            await run_in_threadpool(refresh_sales_rollups, engine)
+        except Exception as e:
+            logger.warning("Could not refresh sales rollups: %s", e)
+        _background_tasks.append(asyncio.create_task(refresh_rollups_periodically()))
+    _background_tasks.append(asyncio.create_task(refresh_insights_periodically()))
+
+
+@app.on_event("shutdown")
+async def shutdown_event():
+    """Stop the refresh cycles and release pooled database and HTTP connections on shutdown"""
+    for task in _background_tasks:
+        task.cancel()
+    dispose_engine()
+    await dispose_async_engine()
+    await close_holiday_client()
+    close_weather_client()
+    _sql_executor.shutdown(wait=False)
+    stop_logging()
 
 @app.get("/")
 def root():
@@ -78,6 +285,7 @@ def root():
             "/verify": "GET - Verify authentication token",
             "/forecast": "GET - Returns sales forecast for next N days",
             "/ai-insights": "GET - Returns AI-generated insights",
+            "/generate-insights/stream": "POST - Streams fresh AI insights as NDJSON",
             "/predictive-insights": "GET - Returns comprehensive predictive insights",
             "/holidays": "GET - Returns upcoming holidays",
             "/weather-forecast": "GET - Returns weather forecast",
@@ -180,70 +388,169 @@ async def verify(authorization: Optional[str] = Header(None)):
         "user": user
     }
 
+# Read daily totals straight into datetime64/float64 columns
+DAILY_SALES_TYPES = {"parse_dates": ["sales_date"], "dtype": {"daily_sales": "float64"}}
+
+
+# Days of daily totals fetched for the simple-average forecast
+FORECAST_HISTORY_DAYS = 180
+
+FORECAST_DAILY_SALES_QUERY = text("""
+    SELECT DATE(transaction_date) AS sales_date, SUM(transaction_qty * unit_price) AS daily_sales
+    FROM transactions
+    GROUP BY DATE(transaction_date)
+    ORDER BY sales_date DESC
+    LIMIT :history_days
+""")
+
+FORECAST_DAILY_SALES_FALLBACK_QUERY = text("""
+    SELECT
+        DATE(transaction_date) AS sales_date,
+        SUM(CAST(transaction_qty AS UNSIGNED) * CAST(unit_price AS DECIMAL(10,2))) AS daily_sales
+    FROM coffee_sales
+    GROUP BY DATE(transaction_date)
+    ORDER BY sales_date DESC
+    LIMIT :history_days
+""")
+
+
+# Longest horizon served from the precomputed SARIMA forecast; longer
+# requests still run the model directly
+MAX_FORECAST_DAYS = 90
+
+
+@lru_cache(maxsize=1)
+def get_sarima_forecast():
+    """
+    Predicted means for the next MAX_FORECAST_DAYS days, computed once
+
+    The model is fixed after loading and its first N predicted means don't
+    depend on the horizon, so every shorter request is a slice of this run
+    """
+    sarima_model = get_sarima_model()
+    if sarima_model is None:
+        return None
+    return tuple(sarima_model.get_forecast(steps=MAX_FORECAST_DAYS).predicted_mean.values.tolist())
+
+
+def sarima_forecast(days: int):
+    """Next `days` values from the pre-trained SARIMA model, or None without one"""
+    if not 0 < days <= MAX_FORECAST_DAYS:
+        sarima_model = get_sarima_model()
+        if sarima_model is None:
+            return None
+        logger.info("Using pre-trained SARIMA model")
+        return sarima_model.get_forecast(steps=days).predicted_mean.values.tolist()
+
+    forecast_values = get_sarima_forecast()
+    if forecast_values is None:
+        return None
+    logger.info("Using pre-trained SARIMA model")
+    return list(forecast_values[:days])
+
+
 @app.get("/forecast")
-def forecast(days: int = 7):
+async def forecast(days: int = 7):
     """
     Returns next N days sales forecast
     """
-    print(f"Forecast endpoint called with days={days}")
+    logger.info("Forecast endpoint called with days=%d", days)
 
-    if engine is None:
+    if async_engine is None:
         raise HTTPException(status_code=500, detail="Database connection not available")
 
     try:
-        print("Fetching data from database...")
-        # Fetch from transactions table (more structured)
-        query = """
-            SELECT transaction_date, transaction_qty, unit_price
-            FROM transactions
-            ORDER BY transaction_date DESC
-            LIMIT 5000
-        """
-        df = pd.read_sql(query, engine)
+        logger.info("Fetching data from database")
+        # Daily totals are aggregated by MySQL, so only one row per day comes back
+        df = await read_sql_async(FORECAST_DAILY_SALES_QUERY, {"history_days": FORECAST_HISTORY_DAYS}, **DAILY_SALES_TYPES)
 
         if df.empty:
             # Fallback to coffee_sales table if transactions is empty
-            query = """
-                SELECT transaction_date, transaction_qty, unit_price
-                FROM coffee_sales
-                ORDER BY transaction_date DESC
-                LIMIT 5000
-            """
-            df = pd.read_sql(query, engine)
-
-        print(f"Fetched {len(df)} rows from database")
-
-        df['transaction_date'] = pd.to_datetime(df['transaction_date'])
-        df['transaction_qty'] = pd.to_numeric(df['transaction_qty'], errors='coerce')
-        df['unit_price'] = pd.to_numeric(df['unit_price'], errors='coerce')
-        df['sales_amount'] = df['transaction_qty'] * df['unit_price']
-
-        # Aggregate daily sales
-        daily_sales = df.groupby('transaction_date')['sales_amount'].sum().sort_index()
-        print(f"Aggregated to {len(daily_sales)} days of sales data")
-
-        # Use pre-trained model or simple forecast
-        if sarima_model is not None:
-            print("Using pre-trained SARIMA model...")
-            forecast_obj = sarima_model.get_forecast(steps=days)
-            forecast_values = forecast_obj.predicted_mean.values.tolist()
-        else:
-            print("Using simple average forecast...")
-            recent_avg = daily_sales.tail(7).mean()
+            df = await read_sql_async(FORECAST_DAILY_SALES_FALLBACK_QUERY, {"history_days": FORECAST_HISTORY_DAYS}, **DAILY_SALES_TYPES)
+
+        # Newest day first
+        daily_sales = df['daily_sales'].to_numpy()
+        logger.info("Fetched %d days of sales data", len(daily_sales))
+
+        # Use pre-trained model or simple forecast; loading and running the
+        # model is CPU work, so it happens on the thread pool
+        forecast_values = await run_in_threadpool(sarima_forecast, days)
+        if forecast_values is None:
+            logger.info("Using simple average forecast")
+            recent_avg = daily_sales[:7].mean()
             forecast_values = [float(recent_avg)] * days
 
-        print(f"Forecast generated: {forecast_values[:5]}...")
+        logger.info("Forecast generated: %s...", forecast_values[:5])
 
         return {
             "forecast_next_days": forecast_values,
-            "last_date_in_data": daily_sales.index[-1].strftime("%Y-%m-%d") if len(daily_sales) > 0 else None,
+            "last_date_in_data": df['sales_date'].iloc[0].strftime("%Y-%m-%d") if len(daily_sales) > 0 else None,
             "days_forecasted": days
         }
     except Exception as e:
-        print(f"Error in forecast endpoint: {str(e)}")
+        logger.exception("Error in forecast endpoint")
         raise HTTPException(status_code=500, detail=f"Error generating forecast: {str(e)}")
 
 
+# Queries behind the AI insights summary, built once at import
+# 1. Recent sales trends
+INSIGHTS_TRENDS_QUERY = text("""
+    SELECT
+        DATE(transaction_date) as date,
+        SUM(transaction_qty * unit_price) as daily_sales,
+        COUNT(DISTINCT transaction_id) as order_count,
+        SUM(transaction_qty) as items_sold,
+        SUM(SUM(transaction_qty * unit_price)) OVER week_window as rolling_week_sales,
+        SUM(COUNT(DISTINCT transaction_id)) OVER week_window as rolling_week_orders,
+        SUM(SUM(transaction_qty)) OVER week_window as rolling_week_items
+    FROM transactions
+    WHERE transaction_date >= DATE_SUB(:anchor, INTERVAL 14 DAY)
+    GROUP BY DATE(transaction_date)
+    WINDOW week_window AS (ORDER BY DATE(transaction_date) DESC ROWS BETWEEN CURRENT ROW AND 6 FOLLOWING)
+    ORDER BY date DESC
+""")
+
+# 2. Top products
+INSIGHTS_PRODUCTS_QUERY = text("""
+    SELECT
+        product_detail,
+        product_type,
+        SUM(transaction_qty) as total_qty,
+        SUM(transaction_qty * unit_price) as total_revenue,
+        COUNT(DISTINCT transaction_id) as order_count
+    FROM transactions
+    WHERE transaction_date >= DATE_SUB(:anchor, INTERVAL 7 DAY)
+    GROUP BY product_detail, product_type
+    ORDER BY total_revenue DESC
+    LIMIT 5
+""")
+
+# 3. Hourly patterns
+INSIGHTS_HOURLY_QUERY = text("""
+    SELECT
+        HOUR(transaction_time) as hour,
+        COUNT(DISTINCT transaction_id) as customer_count,
+        SUM(transaction_qty * unit_price) as hourly_sales
+    FROM transactions
+    WHERE transaction_date >= DATE_SUB(:anchor, INTERVAL 3 DAY)
+    GROUP BY HOUR(transaction_time)
+    ORDER BY hourly_sales DESC
+    LIMIT 3
+""")
+
+# 4. Inventory levels
+INSIGHTS_INVENTORY_QUERY = text("""
+    SELECT
+        item_name,
+        stock,
+        reorder_level
+    FROM inventory
+    WHERE stock < reorder_level * 1.5
+    ORDER BY (stock / NULLIF(reorder_level, 0)) ASC
+    LIMIT 3
+""")
+
+
 def fetch_sales_data_for_insights():
     """
     Helper function to fetch and process sales data for AI insights
@@ -252,117 +559,140 @@ def fetch_sales_data_for_insights():
     if engine is None:
         raise HTTPException(status_code=500, detail="Database connection not available")
 
-    # 1. Get recent sales trends with SQL
-    query_trends = """
-        SELECT
-            DATE(transaction_date) as date,
-            SUM(transaction_qty * unit_price) as daily_sales,
-            COUNT(DISTINCT transaction_id) as order_count,
-            SUM(transaction_qty) as items_sold
-        FROM transactions
-        WHERE transaction_date >= DATE_SUB('2023-06-24', INTERVAL 14 DAY)
-        GROUP BY DATE(transaction_date)
-        ORDER BY date DESC
-    """
-    trends_df = pd.read_sql(query_trends, engine)
-
-    # 2. Get top products with SQL
-    query_products = """
-        SELECT
-            product_detail,
-            product_type,
-            SUM(transaction_qty) as total_qty,
-            SUM(transaction_qty * unit_price) as total_revenue,
-            COUNT(DISTINCT transaction_id) as order_count
-        FROM transactions
-        WHERE transaction_date >= DATE_SUB('2023-06-24', INTERVAL 7 DAY)
-        GROUP BY product_detail, product_type
-        ORDER BY total_revenue DESC
-        LIMIT 5
-    """
-    products_df = pd.read_sql(query_products, engine)
-
-    # 3. Get hourly patterns with SQL
-    query_hourly = """
-        SELECT
-            HOUR(transaction_time) as hour,
-            COUNT(DISTINCT transaction_id) as customer_count,
-            SUM(transaction_qty * unit_price) as hourly_sales
-        FROM transactions
-        WHERE DATE(transaction_date) >= DATE_SUB('2023-06-24', INTERVAL 3 DAY)
-        GROUP BY HOUR(transaction_time)
-        ORDER BY hourly_sales DESC
-        LIMIT 3
-    """
-    hourly_df = pd.read_sql(query_hourly, engine)
-
-    # 4. Get inventory levels with SQL
-    query_inventory = """
-        SELECT
-            item_name,
-            stock,
-            reorder_level
-        FROM inventory
-        WHERE stock < reorder_level * 1.5
-        ORDER BY (stock / NULLIF(reorder_level, 0)) ASC
-        LIMIT 3
-    """
-    inventory_df = pd.read_sql(query_inventory, engine)
-
-    # 5. Calculate week-over-week changes
-    if not trends_df.empty and len(trends_df) >= 7:
-        current_week_sales = trends_df.head(7)['daily_sales'].sum()
-        previous_week_sales = trends_df.tail(7)['daily_sales'].sum() if len(trends_df) >= 14 else current_week_sales
+    # 1-4. Recent trends, top products, hourly patterns and inventory levels.
+    # The four queries are independent, so their round-trips overlap
+    trends_df, products_df, hourly_df, inventory_df = read_sql_many(
+        INSIGHTS_TRENDS_QUERY, INSIGHTS_PRODUCTS_QUERY, INSIGHTS_HOURLY_QUERY, INSIGHTS_INVENTORY_QUERY,
+        params={"anchor": CURRENT_DATE.date()}
+    )
+
+    # 5. Calculate week-over-week changes from the rolling 7-day totals
+    # (trend rows are newest first: row 0 holds the latest week, row 7 the week before it)
+    daily_sales = trends_df['daily_sales'].to_numpy(dtype=float)
+    order_counts = trends_df['order_count'].to_numpy(dtype=np.int64)
+    rolling_week_sales = trends_df['rolling_week_sales'].to_numpy(dtype=float)
+    current_week_sales = rolling_week_sales[0] if len(rolling_week_sales) else 0.0
+    current_week_orders = int(trends_df['rolling_week_orders'].iat[0]) if len(order_counts) else 0
+    current_week_items = int(trends_df['rolling_week_items'].iat[0]) if len(order_counts) else 0
+    if len(daily_sales) >= 7:
+        previous_week_sales = rolling_week_sales[7] if len(daily_sales) >= 14 else current_week_sales
         wow_change = ((current_week_sales - previous_week_sales) / previous_week_sales * 100) if previous_week_sales > 0 else 0
     else:
         wow_change = 0
 
     # 6. Prepare comprehensive sales summary for Gemini
     sales_summary = {
-        'avg_daily_sales': float(trends_df['daily_sales'].mean()) if not trends_df.empty else 0,
-        'recent_daily_sales': float(trends_df.head(1)['daily_sales'].iloc[0]) if not trends_df.empty else 0,
+        'avg_daily_sales': float(daily_sales.mean()) if len(daily_sales) else 0,
+        'recent_daily_sales': float(daily_sales[0]) if len(daily_sales) else 0,
         'wow_change': round(wow_change, 1),
         'trend': 'increasing' if wow_change > 5 else 'decreasing' if wow_change < -5 else 'steady',
         'top_products': products_df['product_detail'].tolist() if not products_df.empty else [],
         'top_product_revenue': float(products_df['total_revenue'].iloc[0]) if not products_df.empty else 0,
-        'peak_hours': [f"{int(row['hour'])}:00" for _, row in hourly_df.iterrows()] if not hourly_df.empty else [],
+        'peak_hours': (hourly_df['hour'].astype(int).astype(str) + ':00').tolist() if not hourly_df.empty else [],
         'peak_hour_customers': int(hourly_df['customer_count'].max()) if not hourly_df.empty else 0,
-        'total_customers_today': int(trends_df.head(1)['order_count'].iloc[0]) if not trends_df.empty else 0,
-        'avg_order_value': float(current_week_sales / trends_df.head(7)['order_count'].sum()) if not trends_df.empty and trends_df.head(7)['order_count'].sum() > 0 else 0,
+        'total_customers_today': int(order_counts[0]) if len(order_counts) else 0,
+        'avg_order_value': float(current_week_sales / current_week_orders) if current_week_orders > 0 else 0,
         'low_stock_items': inventory_df['item_name'].tolist() if not inventory_df.empty else [],
         # Additional business metrics
-        'total_weekly_sales': float(current_week_sales) if not trends_df.empty else 0,
-        'total_weekly_orders': int(trends_df.head(7)['order_count'].sum()) if not trends_df.empty else 0,
-        'total_items_sold': int(trends_df.head(7)['items_sold'].sum()) if not trends_df.empty else 0,
+        'total_weekly_sales': float(current_week_sales),
+        'total_weekly_orders': current_week_orders,
+        'total_items_sold': current_week_items,
         'best_selling_product': products_df['product_detail'].iloc[0] if not products_df.empty else None,
         'best_selling_qty': int(products_df['total_qty'].iloc[0]) if not products_df.empty else 0,
-        'top_5_products': products_df[['product_detail', 'total_revenue', 'total_qty']].to_dict('records') if not products_df.empty else [],
-        'daily_sales_last_7_days': trends_df.head(7)[['date', 'daily_sales', 'order_count']].to_dict('records') if not trends_df.empty else [],
-        'peak_hours_details': hourly_df[['hour', 'customer_count', 'hourly_sales']].to_dict('records') if not hourly_df.empty else [],
-        'inventory_alerts': inventory_df[['item_name', 'stock', 'reorder_level']].to_dict('records') if not inventory_df.empty else []
+        'top_5_products': frame_records(products_df, ('product_detail', 'total_revenue', 'total_qty')),
+        'daily_sales_last_7_days': frame_records(trends_df.head(7), ('date', 'daily_sales', 'order_count')),
+        'peak_hours_details': frame_records(hourly_df, ('hour', 'customer_count', 'hourly_sales')),
+        'inventory_alerts': frame_records(inventory_df, ('item_name', 'stock', 'reorder_level'))
     }
 
     return sales_summary
 
 
+# The summary only changes when transactions land, so it is memoized per
+# newest transaction date (an index-only MAX probe) and rebuilt at most every
+# INSIGHTS_SUMMARY_TTL_SECONDS to pick up inventory changes
+INSIGHTS_SUMMARY_TTL_SECONDS = 120
+_insights_summary_cache = TTLCache(maxsize=4, ttl=INSIGHTS_SUMMARY_TTL_SECONDS)
+
+INSIGHTS_WATERMARK_QUERY = text("SELECT MAX(transaction_date) FROM transactions")
+
+
+@cached_endpoint("insights-summary", cache=_insights_summary_cache)
+def _sales_summary_as_of(watermark) -> dict:
+    """Sales summary for the given newest transaction date (the argument is only the cache key)"""
+    return fetch_sales_data_for_insights()
+
+
+def get_insights_sales_summary() -> dict:
+    """Sales summary for AI insights, reused until new transactions land"""
+    if engine is None:
+        raise HTTPException(status_code=500, detail="Database connection not available")
+
+    with engine.connect() as conn:
+        watermark = conn.execute(INSIGHTS_WATERMARK_QUERY).scalar()
+    return _sales_summary_as_of(watermark)
+
+
+# /ai-insights answers from the latest background refresh instead of calling
+# the LLM per request; each refresh is one LLM call, so the interval keeps
+# well inside the Gemini request quota
+INSIGHTS_REFRESH_SECONDS = 300
+_latest_insights = None
+_insights_refresh_lock = asyncio.Lock()
+
+
+async def _recompute_insights() -> dict:
+    """Fetch the sales summary and generate insights on worker threads; caller holds the refresh lock"""
+    global _latest_insights
+    sales_summary = await run_in_threadpool(get_insights_sales_summary)
+    result = await run_in_threadpool(generate_ai_insights, sales_summary, True)
+    _latest_insights = {**result, "sales_summary": sales_summary, "generated_at": datetime.now()}
+    return _latest_insights
+
+
+async def refresh_insights() -> dict:
+    """Regenerate insights now, replacing the stored result"""
+    async with _insights_refresh_lock:
+        return await _recompute_insights()
+
+
+async def get_latest_insights() -> dict:
+    """Latest stored insights, generating them first if no refresh has finished yet"""
+    if _latest_insights is not None:
+        return _latest_insights
+    async with _insights_refresh_lock:
+        # A refresh that held the lock may have just stored a result
+        if _latest_insights is not None:
+            return _latest_insights
+        return await _recompute_insights()
+
+
+async def refresh_insights_periodically():
+    """Background task: regenerate insights every INSIGHTS_REFRESH_SECONDS"""
+    while True:
+        try:
+            await refresh_insights()
+        except Exception:
+            logger.exception("Background insights refresh failed")
+        await asyncio.sleep(INSIGHTS_REFRESH_SECONDS)
+
+
 @app.get("/ai-insights")
-def get_ai_insights():
+async def get_ai_insights(include_source: bool = False):
     """
     Returns AI-generated insights using Gemini AI based on recent sales data from SQL queries
     Also returns the source data used to generate insights for transparency
+    (only the prompt fields unless include_source is set)
     """
     try:
-        sales_summary = fetch_sales_data_for_insights()
-        result = generate_ai_insights(sales_summary)
+        result = await get_latest_insights()
         return {
             "insights": result["insights"],
-            "source_data": result["source_data"]
+            "source_data": select_source_data(result["source_data"], include_source)
         }
 
-    except Exception as e:
-        print(f"Error in ai-insights endpoint: {str(e)}")
-        import traceback
-        traceback.print_exc()
+    except Exception:
+        logger.exception("Error in ai-insights endpoint")
         # Return fallback insights on error
         return {
             "insights": [
@@ -381,26 +711,25 @@ def get_ai_insights():
 
 
 @app.post("/generate-insights")
-def generate_new_insights():
+async def generate_new_insights():
     """
     Generates fresh AI insights on demand using SQL queries and Gemini AI
     """
     try:
-        print("Generate insights endpoint called - fetching fresh data from database...")
-
-        sales_summary = fetch_sales_data_for_insights()
+        logger.info("Generate insights endpoint called - fetching fresh data from database")
 
-        print(f"Sales summary prepared: {sales_summary}")
+        # Fresh insights also replace what /ai-insights serves
+        result = await refresh_insights()
+        sales_summary = result["sales_summary"]
 
-        # Generate fresh AI insights using Gemini with SQL-derived data
-        result = generate_ai_insights(sales_summary)
+        logger.info("Sales summary prepared: %s", sales_summary)
 
-        print(f"Generated {len(result['insights'])} insights")
+        logger.info("Generated %d insights", len(result['insights']))
 
         return {
             "insights": result["insights"],
             "source_data": result["source_data"],
-            "generated_at": datetime.now().isoformat(),
+            "generated_at": result["generated_at"],
             "data_summary": {
                 "avg_daily_sales": sales_summary['avg_daily_sales'],
                 "trend": sales_summary['trend'],
@@ -409,19 +738,63 @@ def generate_new_insights():
         }
 
     except Exception as e:
-        print(f"Error in generate-insights endpoint: {str(e)}")
-        import traceback
-        traceback.print_exc()
+        logger.exception("Error in generate-insights endpoint")
+        raise HTTPException(status_code=500, detail=f"Error generating insights: {str(e)}")
+
+
+# One JSON document per line; numpy values from the summary serialise as is
+NDJSON_OPTIONS = orjson.OPT_APPEND_NEWLINE | orjson.OPT_SERIALIZE_NUMPY
+
+
+@app.post("/generate-insights/stream")
+async def stream_new_insights():
+    """
+    Streams fresh AI insights as newline-delimited JSON, one insight per line
+    as soon as the model has produced it, so the first one shows up long
+    before the full response would
+    """
+    try:
+        sales_summary = await run_in_threadpool(get_insights_sales_summary)
+    except Exception as e:
+        logger.exception("Error in generate-insights/stream endpoint")
         raise HTTPException(status_code=500, detail=f"Error generating insights: {str(e)}")
 
+    # A sync generator: StreamingResponse iterates it on the thread pool
+    lines = (orjson.dumps(insight, option=NDJSON_OPTIONS) for insight in stream_ai_insights(sales_summary))
+    return StreamingResponse(lines, media_type="application/x-ndjson")
+
+
+# Daily totals come pre-summed from the rollup, one row per day, with the
+# chart labels formatted by MySQL
+SALES_DATA_DAILY_QUERY = text("""
+    SELECT DATE_FORMAT(sales_date, '%b %d') AS date, revenue AS sales
+    FROM daily_sales_rollup
+    WHERE sales_date >= DATE_SUB(:anchor, INTERVAL :days DAY)
+    ORDER BY sales_date ASC
+""").columns(column("date"), column("sales", Float))
+
+SALES_DATA_DAILY_FALLBACK_QUERY = text("""
+    SELECT
+        DATE_FORMAT(DATE(transaction_date), '%b %d') AS date,
+        SUM(CAST(transaction_qty AS UNSIGNED) * CAST(unit_price AS DECIMAL(10,2))) AS sales
+    FROM (
+        SELECT transaction_date, transaction_qty, unit_price
+        FROM coffee_sales
+        LIMIT 1000
+    ) AS sample
+    GROUP BY DATE(transaction_date)
+    ORDER BY DATE(transaction_date) ASC
+""").columns(column("date"), column("sales", Float))
+
 
 @app.get("/sales-data")
-def get_sales_data(period: str = "month"):
+@async_cached_endpoint("sales-data")
+async def get_sales_data(period: str = "month"):
     """
     Returns sales trend data for charts
     Periods: today, week, month, custom
     """
-    if engine is None:
+    if async_engine is None:
         raise HTTPException(status_code=500, detail="Database connection not available")
 
     try:
@@ -435,49 +808,39 @@ def get_sales_data(period: str = "month"):
         else:
             days = 30  # default
 
-        query = """
-            SELECT transaction_date, transaction_qty, unit_price
-            FROM transactions
-            WHERE transaction_date >= DATE_SUB('2025-11-30', INTERVAL %s DAY)
-            ORDER BY transaction_date ASC
-        """ % days
+        daily_sales = await fetch_all_async(SALES_DATA_DAILY_QUERY, {**ANCHOR_PARAMS, "days": days})
 
-        df = pd.read_sql(query, engine)
-
-        if df.empty:
+        if not daily_sales:
             # Fallback to coffee_sales
-            query = """
-                SELECT transaction_date, transaction_qty, unit_price
-                FROM coffee_sales
-                LIMIT 1000
-            """
-            df = pd.read_sql(query, engine)
-
-        df['transaction_date'] = pd.to_datetime(df['transaction_date'], errors='coerce')
-        df['transaction_qty'] = pd.to_numeric(df['transaction_qty'], errors='coerce')
-        df['unit_price'] = pd.to_numeric(df['unit_price'], errors='coerce')
-        df['sales_amount'] = df['transaction_qty'] * df['unit_price']
-
-        # Group by date
-        daily_sales = df.groupby('transaction_date')['sales_amount'].sum().reset_index()
-        daily_sales = daily_sales.sort_values('transaction_date')
+            daily_sales = await fetch_all_async(SALES_DATA_DAILY_FALLBACK_QUERY)
 
         # Format data for frontend
-        sales_data = []
-        for _, row in daily_sales.iterrows():
-            sales_data.append({
-                "date": row['transaction_date'].strftime("%b %d"),
-                "sales": float(row['sales_amount'])
-            })
+        sales_data = [{"date": date, "sales": amount} for date, amount in daily_sales]
 
         return {"sales_data": sales_data, "period": period}
 
     except Exception as e:
-        print(f"Error in sales-data endpoint: {str(e)}")
+        logger.exception("Error in sales-data endpoint")
         raise HTTPException(status_code=500, detail=f"Error fetching sales data: {str(e)}")
 
 
+# Sparkline shown while there is no sales history for the last week
+FALLBACK_SALES_SPARKLINE = (8200, 8500, 9100, 8800, 9300, 10200, 12540)
+
+# Everything the dashboard cards need in one round-trip: the last 7 days of
+# rollup rows (today's and yesterday's totals included), each carrying the
+# barista count. The staff count is the left side so it still comes back,
+# on a row with no sales_date, when there are no rollup rows
+DASHBOARD_QUERY = text("""
+    SELECT s.active_baristas, d.sales_date, d.revenue, d.orders
+    FROM (SELECT COUNT(*) as active_baristas FROM staff WHERE role = 'barista') s
+    LEFT JOIN daily_sales_rollup d ON d.sales_date >= DATE_SUB(:anchor, INTERVAL 7 DAY)
+    ORDER BY d.sales_date ASC
+""")
+
+
 @app.get("/dashboard-metrics")
+@cached_endpoint("dashboard-metrics")
 def get_dashboard_metrics():
     """
     Returns key metrics for dashboard cards
@@ -486,28 +849,15 @@ def get_dashboard_metrics():
         raise HTTPException(status_code=500, detail="Database connection not available")
 
     try:
-        # Get today's sales
-        query_today = """
-            SELECT SUM(transaction_qty * unit_price) as total_sales,
-                   COUNT(DISTINCT transaction_id) as total_customers
-            FROM transactions
-            WHERE DATE(transaction_date) = '2025-11-30'
-        """
-
-        today_data = pd.read_sql(query_today, engine)
-
-        # Get yesterday's sales for comparison
-        query_yesterday = """
-            SELECT SUM(transaction_qty * unit_price) as total_sales
-            FROM transactions
-            WHERE DATE(transaction_date) = DATE_SUB('2025-11-30', INTERVAL 1 DAY)
-        """
-
-        yesterday_data = pd.read_sql(query_yesterday, engine)
+        rows = fetch_all(DASHBOARD_QUERY, ANCHOR_PARAMS)
+        week_rows = [row for row in rows if row['sales_date'] is not None]
+        day_totals = {row['sales_date']: row for row in week_rows}
+        today = day_totals.get(ANCHOR_DAY)
+        yesterday = day_totals.get(ANCHOR_DAY - timedelta(days=1))
 
         # Calculate trend
-        today_sales = float(today_data['total_sales'].iloc[0] or 0)
-        yesterday_sales = float(yesterday_data['total_sales'].iloc[0] or 0)
+        today_sales = float(today['revenue'] or 0) if today else 0.0
+        yesterday_sales = float(yesterday['revenue'] or 0) if yesterday else 0.0
 
         if yesterday_sales > 0:
             sales_trend = ((today_sales - yesterday_sales) / yesterday_sales) * 100
@@ -515,31 +865,15 @@ def get_dashboard_metrics():
             sales_trend = 0
 
         # Get total customers
-        total_customers = int(today_data['total_customers'].iloc[0] or 0)
+        total_customers = int(today['orders'] or 0) if today else 0
 
         # Get profit margin (simplified calculation)
         profit_margin = 22  # Default
 
-        # Get active baristas needed (from staff table)
-        query_staff = """
-            SELECT COUNT(*) as active_baristas
-            FROM staff
-            WHERE role = 'barista'
-        """
-        staff_data = pd.read_sql(query_staff, engine)
-        active_baristas = int(staff_data['active_baristas'].iloc[0] or 3)
-
-        # Get last 7 days for sparkline data
-        query_week = """
-            SELECT DATE(transaction_date) as date, SUM(transaction_qty * unit_price) as sales
-            FROM transactions
-            WHERE transaction_date >= DATE_SUB('2025-11-30', INTERVAL 7 DAY)
-            GROUP BY DATE(transaction_date)
-            ORDER BY date ASC
-        """
-        week_data = pd.read_sql(query_week, engine)
-
-        sales_sparkline = [float(x) for x in week_data['sales'].tolist()] if not week_data.empty else [8200, 8500, 9100, 8800, 9300, 10200, 12540]
+        # Active baristas
+        active_baristas = int(rows[0]['active_baristas'] or 3)
+
+        sales_sparkline = [float(row['revenue']) for row in week_rows] if week_rows else FALLBACK_SALES_SPARKLINE
 
         return {
             "total_sales": today_sales,
@@ -551,11 +885,44 @@ def get_dashboard_metrics():
         }
 
     except Exception as e:
-        print(f"Error in dashboard-metrics endpoint: {str(e)}")
+        logger.exception("Error in dashboard-metrics endpoint")
         raise HTTPException(status_code=500, detail=f"Error fetching metrics: {str(e)}")
 
 
+# Today's top product with its units from yesterday, in one pass over both days
+BEST_SELLING_QUERY = text("""
+    SELECT
+        product_detail,
+        product_type,
+        SUM(CASE WHEN transaction_date >= :anchor THEN transaction_qty END) as units_sold,
+        SUM(CASE WHEN transaction_date >= :anchor THEN transaction_qty * unit_price END) as revenue,
+        SUM(CASE WHEN transaction_date < :anchor THEN transaction_qty END) as yesterday_units
+    FROM transactions
+    WHERE transaction_date >= DATE_SUB(:anchor, INTERVAL 1 DAY)
+      AND transaction_date < DATE_ADD(:anchor, INTERVAL 1 DAY)
+    GROUP BY product_detail, product_type
+    HAVING units_sold > 0
+    ORDER BY units_sold DESC
+    LIMIT 1
+""")
+
+# Fallback to coffee_sales
+BEST_SELLING_FALLBACK_QUERY = text("""
+    SELECT
+        product_detail,
+        product_type,
+        SUM(CAST(transaction_qty AS UNSIGNED)) as units_sold,
+        SUM(CAST(transaction_qty AS UNSIGNED) * CAST(unit_price AS DECIMAL(10,2))) as revenue,
+        NULL as yesterday_units
+    FROM coffee_sales
+    GROUP BY product_detail, product_type
+    ORDER BY units_sold DESC
+    LIMIT 1
+""")
+
+
 @app.get("/best-selling")
+@cached_endpoint("best-selling")
 def get_best_selling():
     """
     Returns the best-selling product today
@@ -564,60 +931,25 @@ def get_best_selling():
         raise HTTPException(status_code=500, detail="Database connection not available")
 
     try:
-        query = """
-            SELECT
-                product_detail,
-                product_type,
-                SUM(transaction_qty) as units_sold,
-                SUM(transaction_qty * unit_price) as revenue
-            FROM transactions
-            WHERE DATE(transaction_date) = '2025-11-30'
-            GROUP BY product_detail, product_type
-            ORDER BY units_sold DESC
-            LIMIT 1
-        """
-
-        df = pd.read_sql(query, engine)
+        product = fetch_one(BEST_SELLING_QUERY, ANCHOR_PARAMS)
 
-        if df.empty:
+        if product is None:
             # Fallback to coffee_sales
-            query = """
-                SELECT
-                    product_detail,
-                    product_type,
-                    SUM(CAST(transaction_qty AS UNSIGNED)) as units_sold,
-                    SUM(CAST(transaction_qty AS UNSIGNED) * CAST(unit_price AS DECIMAL(10,2))) as revenue
-                FROM coffee_sales
-                GROUP BY product_detail, product_type
-                ORDER BY units_sold DESC
-                LIMIT 1
-            """
-            df = pd.read_sql(query, engine)
-
-        if not df.empty:
-            product = df.iloc[0]
-
-            # Get yesterday's data for comparison
-            query_yesterday = """
-                SELECT SUM(transaction_qty) as units_sold
-                FROM transactions
-                WHERE DATE(transaction_date) = DATE_SUB('2025-11-30', INTERVAL 1 DAY)
-                AND product_detail = :product_detail
-            """
-
-            from sqlalchemy import text
-            yesterday_df = pd.read_sql(text(query_yesterday), engine, params={'product_detail': product['product_detail']})
-            yesterday_units = float(yesterday_df['units_sold'].iloc[0] or 0) if not yesterday_df.empty else 0
+            product = fetch_one(BEST_SELLING_FALLBACK_QUERY)
+
+        if product is not None:
+            # Yesterday's units for comparison
+            yesterday_units = float(product.yesterday_units or 0)
 
             change_pct = 0
             if yesterday_units > 0:
-                change_pct = ((float(product['units_sold']) - yesterday_units) / yesterday_units) * 100
+                change_pct = ((float(product.units_sold) - yesterday_units) / yesterday_units) * 100
 
             return {
-                "product_name": product['product_detail'],
-                "product_type": product['product_type'],
-                "units_sold": int(product['units_sold']),
-                "revenue": float(product['revenue']),
+                "product_name": product.product_detail,
+                "product_type": product.product_type,
+                "units_sold": int(product.units_sold),
+                "revenue": float(product.revenue),
                 "change_percent": change_pct
             }
         else:
@@ -630,11 +962,23 @@ def get_best_selling():
             }
 
     except Exception as e:
-        print(f"Error in best-selling endpoint: {str(e)}")
+        logger.exception("Error in best-selling endpoint")
         raise HTTPException(status_code=500, detail=f"Error fetching best-selling: {str(e)}")
 
 
+INVENTORY_QUERY = text("""
+    SELECT
+        item_name,
+        stock,
+        unit,
+        reorder_level
+    FROM inventory
+    ORDER BY item_name
+""")
+
+
 @app.get("/inventory-predictions")
+@cached_endpoint("inventory-predictions")
 def get_inventory_predictions():
     """
     Returns inventory with AI-predicted demand
@@ -643,57 +987,55 @@ def get_inventory_predictions():
         raise HTTPException(status_code=500, detail="Database connection not available")
 
     try:
-        query = """
-            SELECT
-                item_name,
-                stock,
-                unit,
-                reorder_level
-            FROM inventory
-            ORDER BY item_name
-        """
-
-        df = pd.read_sql(query, engine)
+        df = read_sql(INVENTORY_QUERY)
 
         if df.empty:
             return {"inventory": []}
 
         # Calculate predicted demand based on current stock and reorder level
-        inventory_list = []
-        for _, row in df.iterrows():
-            current_stock = int(row['stock'])
-            reorder_level = int(row['reorder_level'] or 0)
-
-            # Simple prediction: 1.5x current consumption rate
-            predicted_demand = int(reorder_level * 1.5) if reorder_level > 0 else current_stock + 10
-
-            # Determine alert level
-            if current_stock < reorder_level:
-                alert_level = "critical"
-                demand_level = "High Demand"
-            elif current_stock < reorder_level * 1.5:
-                alert_level = "warning"
-                demand_level = "Medium"
-            else:
-                alert_level = "safe"
-                demand_level = "Low"
-
-            inventory_list.append({
-                "product": row['item_name'],
-                "current_stock": f"{current_stock} {row['unit']}",
-                "predicted_demand": f"{predicted_demand} {row['unit']}",
+        current_stock = df['stock'].to_numpy(dtype=np.int64)
+        reorder_level = df['reorder_level'].fillna(0).to_numpy(dtype=np.int64)
+
+        # Simple prediction: 1.5x current consumption rate; alert level from stock vs reorder level
+        alert_codes, predicted_demand = classify_stock(current_stock, reorder_level)
+
+        inventory_list = [
+            {
+                "product": product,
+                "current_stock": f"{stock} {unit}",
+                "predicted_demand": f"{demand} {unit}",
                 "demand_level": demand_level,
                 "alert_level": alert_level
-            })
+            }
+            for product, unit, stock, demand, demand_level, alert_level in zip(
+                df['item_name'].tolist(), df['unit'].tolist(),
+                current_stock.tolist(), predicted_demand.tolist(),
+                DEMAND_LEVELS[alert_codes].tolist(), ALERT_LEVELS[alert_codes].tolist()
+            )
+        ]
 
         return {"inventory": inventory_list}
 
     except Exception as e:
-        print(f"Error in inventory-predictions endpoint: {str(e)}")
+        logger.exception("Error in inventory-predictions endpoint")
         raise HTTPException(status_code=500, detail=f"Error fetching inventory: {str(e)}")
 
 
+BARISTA_SCHEDULE_QUERY = text("""
+    SELECT
+        name,
+        role,
+        shift_start,
+        shift_end,
+        performance_score
+    FROM staff
+    WHERE role IN ('barista', 'Barista')
+    ORDER BY shift_start
+""")
+
+
 @app.get("/barista-schedule")
+@cached_endpoint("barista-schedule")
 def get_barista_schedule():
     """
     Returns barista schedule for today
@@ -702,43 +1044,26 @@ def get_barista_schedule():
         raise HTTPException(status_code=500, detail="Database connection not available")
 
     try:
-        query = """
-            SELECT
-                name,
-                role,
-                shift_start,
-                shift_end,
-                performance_score
-            FROM staff
-            WHERE role IN ('barista', 'Barista')
-            ORDER BY shift_start
-        """
-
-        df = pd.read_sql(query, engine)
-
-        schedule = []
-        for _, row in df.iterrows():
-            schedule.append({
-                "name": row['name'],
-                "role": row['role'],
-                "shift": f"{row['shift_start']} - {row['shift_end']}",
-                "performance": float(row['performance_score'] or 0)
-            })
+        df = read_sql(BARISTA_SCHEDULE_QUERY, dtype={"performance_score": "float64"})
+
+        schedule = pd.DataFrame({
+            "name": df['name'],
+            "role": df['role'],
+            "shift": df['shift_start'].astype(str) + ' - ' + df['shift_end'].astype(str),
+            "performance": df['performance_score'].fillna(0)
+        }).to_dict('records')
 
         return {"schedule": schedule}
 
     except Exception as e:
-        print(f"Error in barista-schedule endpoint: {str(e)}")
+        logger.exception("Error in barista-schedule endpoint")
         raise HTTPException(status_code=500, detail=f"Error fetching schedule: {str(e)}")
 
 
-@app.get("/customer-feedback")
-def get_customer_feedback():
-    """
-    Returns recent customer feedback (mock data for now)
-    """
-    # This would ideally come from a feedback/reviews table
-    feedback = [
+# Mock feedback until it comes from a feedback/reviews table; built once and
+# served as is
+CUSTOMER_FEEDBACK = {
+    "feedback": [
         {
             "customer": "John D.",
             "rating": 5,
@@ -758,12 +1083,19 @@ def get_customer_feedback():
             "date": "2 days ago"
         }
     ]
+}
+
 
-    return {"feedback": feedback}
+@app.get("/customer-feedback")
+def get_customer_feedback():
+    """
+    Returns recent customer feedback (mock data for now)
+    """
+    return CUSTOMER_FEEDBACK
 
 
 @app.get("/predictive-insights")
-def get_predictive_insights():
+async def get_predictive_insights():
     """
     Returns comprehensive AI-powered predictive insights combining:
     - Next 30 days holidays
@@ -776,28 +1108,25 @@ def get_predictive_insights():
         raise HTTPException(status_code=500, detail="Database connection not available")
     
     try:
-        print("Fetching predictive insights...")
+        logger.info("Fetching predictive insights")
         
         # 1. Get holidays for next 30 days
-        print("  - Fetching holidays...")
-        holidays = get_next_30_days_holidays()
-        print(f"    Found {len(holidays)} holidays")
+        holidays = await fetch_next_30_days_holidays()
+        logger.info("Found %d holidays", len(holidays))
         
         # 2. Get weather forecast for next 30 days
-        print("  - Fetching weather forecast...")
-        weather_data = get_weather_forecast_data()
-        print(f"    Got {len(weather_data)} days of weather forecast")
+        weather_data = await run_in_threadpool(get_weather_forecast_data)
+        logger.info("Got %d days of weather forecast", len(weather_data))
         
         # 3. Get sales data for last 60 days
-        print("  - Fetching sales data...")
-        sales_data = get_sales_data_last_60_days(engine)
-        print(f"    Analyzed {sales_data['data_points']} days of sales")
+        sales_data = await run_in_threadpool(get_sales_data_last_60_days, engine)
+        logger.info("Analyzed %d days of sales", sales_data['data_points'])
         
         # 4. Generate AI insights using Gemini
-        print("  - Generating AI insights with Gemini...")
-        insights = generate_predictive_insights(sales_data, weather_data, holidays)
+        logger.info("Generating AI insights")
+        insights = await run_in_threadpool(generate_predictive_insights, sales_data, weather_data, holidays)
         
-        print("  ✓ Predictive insights generated successfully")
+        logger.info("Predictive insights generated successfully")
         
         return {
             "status": "success",
@@ -813,19 +1142,17 @@ def get_predictive_insights():
         }
         
     except Exception as e:
-        print(f"Error in predictive-insights endpoint: {str(e)}")
-        import traceback
-        traceback.print_exc()
+        logger.exception("Error in predictive-insights endpoint")
         raise HTTPException(status_code=500, detail=f"Error generating predictive insights: {str(e)}")
 
 
 @app.get("/holidays")
-def get_holidays(days: int = 30):
+async def get_holidays(days: int = 30):
     """
     Returns upcoming holidays for the next N days
     """
     try:
-        holidays = get_next_30_days_holidays()
+        holidays = await fetch_next_30_days_holidays()
         
         # Filter by requested days if different from 30
         if days != 30:
@@ -843,7 +1170,7 @@ def get_holidays(days: int = 30):
         }
         
     except Exception as e:
-        print(f"Error in holidays endpoint: {str(e)}")
+        logger.exception("Error in holidays endpoint")
         raise HTTPException(status_code=500, detail=f"Error fetching holidays: {str(e)}")
 
 
@@ -865,11 +1192,67 @@ def get_weather_forecast(days: int = 30):
         }
         
     except Exception as e:
-        print(f"Error in weather-forecast endpoint: {str(e)}")
+        logger.exception("Error in weather-forecast endpoint")
         raise HTTPException(status_code=500, detail=f"Error fetching weather forecast: {str(e)}")
 
 
+# Period filters on the rollups' sales_date; unknown periods use "today"
+ANALYTICS_DATE_FILTERS = {
+    "today": "sales_date = :anchor",
+    "yesterday": "sales_date = DATE_SUB(:anchor, INTERVAL 1 DAY)",
+    "week": "sales_date >= DATE_SUB(:anchor, INTERVAL 7 DAY)",
+    "month": "sales_date >= DATE_SUB(:anchor, INTERVAL 30 DAY)",
+}
+
+ANALYTICS_SUMMARY_QUERIES = {
+    period: text(f"""
+        SELECT 
+            SUM(revenue) as total_revenue,
+            SUM(orders) as total_orders,
+            SUM(items) as total_items
+        FROM daily_sales_rollup
+        WHERE {date_filter}
+    """)
+    for period, date_filter in ANALYTICS_DATE_FILTERS.items()
+}
+
+# Hourly breakdown is only offered for single days; MySQL formats the
+# 12-hour clock labels ('12AM', '1PM', ...)
+ANALYTICS_HOURLY_QUERIES = {
+    period: text(f"""
+        SELECT 
+            DATE_FORMAT(MAKETIME(sales_hour, 0, 0), '%l%p') as time,
+            revenue as sales
+        FROM hourly_sales_rollup
+        WHERE {ANALYTICS_DATE_FILTERS[period]}
+        ORDER BY sales_hour
+    """)
+    for period in ("today", "yesterday")
+}
+
+ANALYTICS_PRODUCTS_QUERY = text("""
+    SELECT 
+        product_detail as name,
+        SUM(transaction_qty * unit_price) as sales
+    FROM transactions
+    WHERE transaction_date >= DATE_SUB(:anchor, INTERVAL 30 DAY)
+    GROUP BY product_detail
+    ORDER BY sales DESC
+    LIMIT 5
+""")
+
+ANALYTICS_MONTHLY_QUERY = text("""
+    SELECT 
+        DATE_FORMAT(sales_date, '%b %d') as date,
+        revenue as sales
+    FROM daily_sales_rollup
+    WHERE sales_date >= DATE_SUB(:anchor, INTERVAL 30 DAY)
+    ORDER BY sales_date ASC
+""")
+
+
 @app.get("/sales-analytics")
+@cached_endpoint("sales-analytics")
 def get_sales_analytics(period: str = "today"):
     """
     Returns aggregated sales analytics data for the analytics page
@@ -880,107 +1263,64 @@ def get_sales_analytics(period: str = "today"):
 
     try:
         # Determine date for analysis
-        if period == "yesterday":
-            target_date = "DATE_SUB('2025-11-30', INTERVAL 1 DAY)"
-            date_filter = f"DATE(transaction_date) = {target_date}"
-        elif period == "week":
-            target_date = "'2025-11-30'"
-            date_filter = f"transaction_date >= DATE_SUB({target_date}, INTERVAL 7 DAY)"
-        elif period == "month":
-            target_date = "'2025-11-30'"
-            date_filter = f"transaction_date >= DATE_SUB({target_date}, INTERVAL 30 DAY)"
-        else:  # today
-            target_date = "'2025-11-30'"
-            date_filter = f"DATE(transaction_date) = {target_date}"
+        period_key = period if period in ANALYTICS_DATE_FILTERS else "today"
+
+        # The four reads are independent, so the summary, hourly and monthly
+        # queries run on the SQL pool while the product breakdown runs here
+        summary_future = _sql_executor.submit(fetch_one, ANALYTICS_SUMMARY_QUERIES[period_key], ANCHOR_PARAMS)
+        hourly_future = (
+            _sql_executor.submit(read_sql, ANALYTICS_HOURLY_QUERIES[period], ANCHOR_PARAMS)
+            if period in ANALYTICS_HOURLY_QUERIES else None
+        )
+        monthly_future = _sql_executor.submit(
+            read_sql, ANALYTICS_MONTHLY_QUERY, ANCHOR_PARAMS, dtype={'sales': 'float64'}
+        )
+
+        # Get product breakdown - always use last 30 days for consistency
+        products_df = read_sql(ANALYTICS_PRODUCTS_QUERY, ANCHOR_PARAMS)
 
         # Get summary
-        query_summary = f"""
-            SELECT 
-                SUM(transaction_qty * unit_price) as total_revenue,
-                COUNT(DISTINCT transaction_id) as total_orders,
-                SUM(transaction_qty) as total_items
-            FROM transactions
-            WHERE {date_filter}
-        """
-        summary_df = pd.read_sql(query_summary, engine)
+        summary = summary_future.result()
         
-        total_revenue = float(summary_df['total_revenue'].iloc[0] or 0)
-        total_orders = int(summary_df['total_orders'].iloc[0] or 0)
+        total_revenue = float(summary.total_revenue or 0)
+        total_orders = int(summary.total_orders or 0)
         avg_order_value = total_revenue / total_orders if total_orders > 0 else 0
 
-        # Get product breakdown - always use last 30 days for consistency
-        query_products = """
-            SELECT 
-                product_detail as name,
-                SUM(transaction_qty * unit_price) as sales
-            FROM transactions
-            WHERE transaction_date >= DATE_SUB('2025-11-30', INTERVAL 30 DAY)
-            GROUP BY product_detail
-            ORDER BY sales DESC
-            LIMIT 5
-        """
-        products_df = pd.read_sql(query_products, engine)
-        
         # Calculate percentages
         if not products_df.empty:
-            total_product_sales = products_df['sales'].sum()
-            products_df['percentage'] = (products_df['sales'] / total_product_sales * 100).round(0).astype(int)
-            product_sales = products_df.to_dict('records')
+            sales = products_df['sales'].to_numpy(dtype='float64')
+            percentages = np.rint(sales / sales.sum() * 100).astype(np.int32)
+            product_sales = [
+                {"name": name, "sales": amount, "percentage": percentage}
+                for name, amount, percentage in zip(
+                    products_df['name'].tolist(), sales.tolist(), percentages.tolist()
+                )
+            ]
         else:
             product_sales = []
 
         # Get hourly breakdown
-        if period in ["today", "yesterday"]:
-            query_hourly = f"""
-                SELECT 
-                    HOUR(transaction_time) as hour,
-                    SUM(transaction_qty * unit_price) as sales
-                FROM transactions
-                WHERE {date_filter}
-                GROUP BY HOUR(transaction_time)
-                ORDER BY hour
-            """
-            hourly_df = pd.read_sql(query_hourly, engine)
-            
-            if not hourly_df.empty:
-                hourly_sales = []
-                for _, row in hourly_df.iterrows():
-                    hour = int(row['hour'])
-                    time_label = f"{hour % 12 if hour % 12 != 0 else 12}{'PM' if hour >= 12 else 'AM'}"
-                    hourly_sales.append({
-                        "time": time_label,
-                        "sales": float(row['sales'])
-                    })
-            else:
-                hourly_sales = []
+        if hourly_future is not None:
+            hourly_df = hourly_future.result()
+            hourly_df['sales'] = hourly_df['sales'].astype('float64')
+            hourly_sales = frame_records(hourly_df, ('time', 'sales'))
         else:
             hourly_sales = []
 
         # Get monthly performance data - always fetch last 30 days for monthly view
-        query_monthly = """
-            SELECT 
-                DATE(transaction_date) as date,
-                SUM(transaction_qty * unit_price) as sales
-            FROM transactions
-            WHERE transaction_date >= DATE_SUB('2025-11-30', INTERVAL 30 DAY)
-            GROUP BY DATE(transaction_date)
-            ORDER BY date ASC
-        """
-        monthly_df = pd.read_sql(query_monthly, engine)
+        monthly_df = monthly_future.result()
         
         monthly_sales = []
         if not monthly_df.empty:
-            monthly_df['date'] = pd.to_datetime(monthly_df['date'])
+            daily_sales = monthly_df['sales'].to_numpy()
+
             # Calculate average for target line
-            avg_daily_sales = monthly_df['sales'].mean()
-            target_sales = avg_daily_sales * 1.1  # 10% above average as target
+            target_sales = float(daily_sales.mean() * 1.1)  # 10% above average as target
             
-            for _, row in monthly_df.iterrows():
-                monthly_sales.append({
-                    "date": row['date'].strftime("%b %d"),
-                    "sales": float(row['sales']),
-                    "target": float(target_sales)
-                })
+            monthly_sales = [
+                {"date": day, "sales": amount, "target": target_sales}
+                for day, amount in zip(monthly_df['date'].tolist(), daily_sales.tolist())
+            ]
 
         return {
             "period": period,
@@ -994,80 +1334,75 @@ def get_sales_analytics(period: str = "today"):
         }
 
     except Exception as e:
-        print(f"Error in sales-analytics endpoint: {str(e)}")
+        logger.exception("Error in sales-analytics endpoint")
         raise HTTPException(status_code=500, detail=f"Error fetching analytics: {str(e)}")
 
 
+# Cash flow by hour today, by weekday over the last week, and by day over the
+# last month; MySQL formats the labels
+CASH_FLOW_TODAY_QUERY = text("""
+    SELECT 
+        DATE_FORMAT(MAKETIME(sales_hour, 0, 0), '%l%p') as period_label,
+        revenue as income,
+        revenue * 0.7 as expenses
+    FROM hourly_sales_rollup
+    WHERE sales_date = :anchor
+    ORDER BY sales_hour
+""").columns(column("period_label"), column("income", Float), column("expenses", Float))
+
+CASH_FLOW_WEEK_QUERY = text("""
+    SELECT 
+        LEFT(DAYNAME(sales_date), 3) as period_label,
+        revenue as income,
+        revenue * 0.7 as expenses
+    FROM daily_sales_rollup
+    WHERE sales_date >= DATE_SUB(:anchor, INTERVAL 7 DAY)
+    ORDER BY sales_date
+""").columns(column("period_label"), column("income", Float), column("expenses", Float))
+
+CASH_FLOW_MONTH_QUERY = text("""
+    SELECT 
+        DATE_FORMAT(sales_date, '%b %d') as period_label,
+        revenue as income,
+        revenue * 0.7 as expenses
+    FROM daily_sales_rollup
+    WHERE sales_date >= DATE_SUB(:anchor, INTERVAL 30 DAY)
+    ORDER BY sales_date
+""").columns(column("period_label"), column("income", Float), column("expenses", Float))
+
+
 @app.get("/cash-flow")
-def get_cash_flow(period: str = "month"):
+@async_cached_endpoint("cash-flow")
+async def get_cash_flow(period: str = "month"):
     """
     Returns cash flow data (income vs expenses)
     """
-    if engine is None:
+    if async_engine is None:
         raise HTTPException(status_code=500, detail="Database connection not available")
 
     try:
         # Determine date range and grouping based on period
         if period == "today":
-            query = """
-                SELECT 
-                    HOUR(transaction_time) as period_label,
-                    SUM(transaction_qty * unit_price) as income,
-                    SUM(transaction_qty * unit_price * 0.7) as expenses
-                FROM transactions
-                WHERE DATE(transaction_date) = '2025-11-30'
-                GROUP BY HOUR(transaction_time)
-                ORDER BY period_label
-            """
-            label_format = lambda x: f"{int(x) % 12 if int(x) % 12 != 0 else 12}{'PM' if int(x) >= 12 else 'AM'}"
+            query = CASH_FLOW_TODAY_QUERY
         elif period == "week":
-            query = """
-                SELECT 
-                    DAYNAME(transaction_date) as period_label,
-                    SUM(transaction_qty * unit_price) as income,
-                    SUM(transaction_qty * unit_price * 0.7) as expenses
-                FROM transactions
-                WHERE transaction_date >= DATE_SUB('2025-11-30', INTERVAL 7 DAY)
-                GROUP BY DATE(transaction_date), DAYNAME(transaction_date)
-                ORDER BY DATE(transaction_date)
-            """
-            label_format = lambda x: x[:3]  # Mon, Tue, etc.
+            query = CASH_FLOW_WEEK_QUERY
         else:  # month or custom
-            query = """
-                SELECT 
-                    DATE_FORMAT(transaction_date, '%%b %%d') as period_label,
-                    SUM(transaction_qty * unit_price) as income,
-                    SUM(transaction_qty * unit_price * 0.7) as expenses
-                FROM transactions
-                WHERE transaction_date >= DATE_SUB('2025-11-30', INTERVAL 30 DAY)
-                GROUP BY DATE(transaction_date)
-                ORDER BY DATE(transaction_date)
-            """
-            label_format = lambda x: x
-
-        df = pd.read_sql(query, engine)
+            query = CASH_FLOW_MONTH_QUERY
 
-        if df.empty:
+        rows = await fetch_all_async(query, ANCHOR_PARAMS)
+
+        if not rows:
             return {"cash_flow": []}
 
-        cash_flow = []
-        for _, row in df.iterrows():
-            label = row['period_label']
-            if period == "today":
-                label = label_format(label)
-            elif period == "week":
-                label = label_format(label)
-            
-            cash_flow.append({
-                "month": label,
-                "income": float(row['income']),
-                "expenses": float(row['expenses'])
-            })
+        cash_flow = [
+            {"month": label, "income": income, "expenses": expenses}
+            for label, income, expenses in rows
+        ]
 
         return {"cash_flow": cash_flow, "period": period}
 
     except Exception as e:
-        print(f"Error in cash-flow endpoint: {str(e)}")
+        logger.exception("Error in cash-flow endpoint")
         raise HTTPException(status_code=500, detail=f"Error fetching cash flow: {str(e)}")
 
 
@@ -1075,7 +1410,138 @@ def get_cash_flow(period: str = "month"):
 # INGREDIENT MANAGEMENT ENDPOINTS
 # ============================================================================
 
+# Listings below are returned as fetched: MySQL derives the computed fields
+# and the typed columns turn DECIMAL and 0/1 values into floats and bools as
+# rows are read, so no per-row formatting pass is needed. Timestamps are
+# written as ISO 8601 by the JSON encoder
+INGREDIENTS_QUERY = text("""
+    SELECT 
+        id,
+        name,
+        unit,
+        stock_quantity,
+        reorder_level,
+        COALESCE(unit_cost, 0) as unit_cost,
+        supplier,
+        notes,
+        created_at,
+        updated_at,
+        stock_quantity < reorder_level as is_low_stock
+    FROM ingredients
+    ORDER BY name
+""").columns(
+    column("id"), column("name"), column("unit"),
+    column("stock_quantity", Float), column("reorder_level", Float), column("unit_cost", Float),
+    column("supplier"), column("notes"), column("created_at"), column("updated_at"),
+    column("is_low_stock", Boolean)
+)
+
+PRODUCTS_QUERY = text("""
+    SELECT 
+        id,
+        product_name,
+        product_type,
+        selling_price,
+        description,
+        is_active,
+        created_at,
+        updated_at
+    FROM products
+    WHERE is_active = TRUE
+    ORDER BY product_name
+""").columns(
+    column("id"), column("product_name"), column("product_type"), column("selling_price", Float),
+    column("description"), column("is_active"), column("created_at"), column("updated_at")
+)
+
+# units_available: how many products the current stock can make
+PRODUCT_INGREDIENTS_QUERY = text("""
+    SELECT 
+        pi.id,
+        pi.product_id,
+        pi.ingredient_id,
+        pi.quantity_needed,
+        pi.notes,
+        i.name as ingredient_name,
+        i.unit,
+        i.stock_quantity,
+        p.product_name,
+        CASE
+            WHEN pi.quantity_needed > 0
+            THEN CAST(TRUNCATE(i.stock_quantity / pi.quantity_needed, 0) AS SIGNED)
+            ELSE 0
+        END as units_available
+    FROM product_ingredients pi
+    JOIN ingredients i ON pi.ingredient_id = i.id
+    JOIN products p ON pi.product_id = p.id
+    WHERE pi.product_id = :product_id
+    ORDER BY i.name
+""").columns(
+    column("id"), column("product_id"), column("ingredient_id"), column("quantity_needed", Float),
+    column("notes"), column("ingredient_name"), column("unit"), column("stock_quantity", Float),
+    column("product_name"), column("units_available", Integer)
+)
+
+PRODUCT_COST_QUERY = text("""
+    SELECT 
+        p.id,
+        p.product_name,
+        p.selling_price,
+        SUM(pi.quantity_needed * i.unit_cost) as total_cost,
+        GROUP_CONCAT(CONCAT(i.name, ': ', pi.quantity_needed, ' ', i.unit) SEPARATOR ', ') as ingredients_used
+    FROM products p
+    LEFT JOIN product_ingredients pi ON p.id = pi.product_id
+    LEFT JOIN ingredients i ON pi.ingredient_id = i.id
+    WHERE p.id = :product_id
+    GROUP BY p.id, p.product_name, p.selling_price
+""").columns(
+    column("id"), column("product_name"), column("selling_price", Float),
+    column("total_cost", Float), column("ingredients_used")
+)
+
+# Write statements, built once at import so each request reuses the same
+# clause objects (and their entries in the engine's compiled cache)
+INSERT_INGREDIENT_QUERY = text("""
+    INSERT INTO ingredients (name, unit, stock_quantity, reorder_level, unit_cost, supplier, notes)
+    VALUES (:name, :unit, :stock_quantity, :reorder_level, :unit_cost, :supplier, :notes)
+""")
+
+UPDATE_INGREDIENT_QUERY = text("""
+    UPDATE ingredients 
+    SET name = :name,
+        unit = :unit,
+        stock_quantity = :stock_quantity,
+        reorder_level = :reorder_level,
+        unit_cost = :unit_cost,
+        supplier = :supplier,
+        notes = :notes
+    WHERE id = :id
+""")
+
+DELETE_INGREDIENT_QUERY = text("DELETE FROM ingredients WHERE id = :id")
+
+INSERT_PRODUCT_QUERY = text("""
+    INSERT INTO products (product_name, product_type, selling_price, description)
+    VALUES (:product_name, :product_type, :selling_price, :description)
+""")
+
+UPSERT_PRODUCT_INGREDIENT_QUERY = text("""
+    INSERT INTO product_ingredients (product_id, ingredient_id, quantity_needed, notes)
+    VALUES (:product_id, :ingredient_id, :quantity_needed, :notes)
+    ON DUPLICATE KEY UPDATE 
+        quantity_needed = :quantity_needed,
+        notes = :notes
+""")
+
+DELETE_PRODUCT_INGREDIENT_QUERY = text(
+    "DELETE FROM product_ingredients WHERE product_id = :product_id AND ingredient_id = :ingredient_id"
+)
+
+LAST_INSERT_ID_QUERY = text("SELECT LAST_INSERT_ID() AS id")
+
+
 @app.get("/ingredients")
+@cached_endpoint("ingredients", cache=_catalog_cache)
 def get_ingredients():
     """
     Get all ingredients with their stock levels
@@ -1084,45 +1550,12 @@ def get_ingredients():
         raise HTTPException(status_code=500, detail="Database connection not available")
     
     try:
-        query = """
-            SELECT 
-                id,
-                name,
-                unit,
-                stock_quantity,
-                reorder_level,
-                unit_cost,
-                supplier,
-                notes,
-                created_at,
-                updated_at
-            FROM ingredients
-            ORDER BY name
-        """
-        
-        df = pd.read_sql(query, engine)
-        
-        if df.empty:
-            return {"ingredients": []}
-        
-        # Convert to list of dictionaries
-        ingredients = df.to_dict('records')
-        
-        # Format dates and numbers
-        for ingredient in ingredients:
-            ingredient['stock_quantity'] = float(ingredient['stock_quantity'])
-            ingredient['reorder_level'] = float(ingredient['reorder_level'])
-            ingredient['unit_cost'] = float(ingredient['unit_cost']) if ingredient['unit_cost'] else 0
-            ingredient['created_at'] = ingredient['created_at'].isoformat() if ingredient['created_at'] else None
-            ingredient['updated_at'] = ingredient['updated_at'].isoformat() if ingredient['updated_at'] else None
-            
-            # Check if low stock
-            ingredient['is_low_stock'] = ingredient['stock_quantity'] < ingredient['reorder_level']
+        ingredients = fetch_all(INGREDIENTS_QUERY)
         
         return {"ingredients": ingredients}
         
     except Exception as e:
-        print(f"Error in ingredients endpoint: {str(e)}")
+        logger.exception("Error in ingredients endpoint")
         raise HTTPException(status_code=500, detail=f"Error fetching ingredients: {str(e)}")
 
 
@@ -1140,11 +1573,6 @@ def create_ingredient(ingredient: dict):
             if field not in ingredient:
                 raise HTTPException(status_code=400, detail=f"Missing required field: {field}")
         
-        query = """
-            INSERT INTO ingredients (name, unit, stock_quantity, reorder_level, unit_cost, supplier, notes)
-            VALUES (:name, :unit, :stock_quantity, :reorder_level, :unit_cost, :supplier, :notes)
-        """
-        
         params = {
             'name': ingredient['name'],
             'unit': ingredient['unit'],
@@ -1155,19 +1583,19 @@ def create_ingredient(ingredient: dict):
             'notes': ingredient.get('notes', '')
         }
         
-        from sqlalchemy import text
         with engine.begin() as conn:
-            result = conn.execute(text(query), params)
+            result = conn.execute(INSERT_INGREDIENT_QUERY, params)
             try:
                 ingredient_id = result.lastrowid
             except Exception:
                 # Fallback for some SQLAlchemy versions
-                ingredient_id = conn.execute(text("SELECT LAST_INSERT_ID() AS id")).scalar()
+                ingredient_id = conn.execute(LAST_INSERT_ID_QUERY).scalar()
+        clear_catalog_cache()
         
         return {"message": "Ingredient created successfully", "id": ingredient_id}
         
     except Exception as e:
-        print(f"Error creating ingredient: {str(e)}")
+        logger.exception("Error creating ingredient")
         raise HTTPException(status_code=500, detail=f"Error creating ingredient: {str(e)}")
 
 
@@ -1180,18 +1608,6 @@ def update_ingredient(ingredient_id: int, ingredient: dict):
         raise HTTPException(status_code=500, detail="Database connection not available")
     
     try:
-        query = """
-            UPDATE ingredients 
-            SET name = :name,
-                unit = :unit,
-                stock_quantity = :stock_quantity,
-                reorder_level = :reorder_level,
-                unit_cost = :unit_cost,
-                supplier = :supplier,
-                notes = :notes
-            WHERE id = :id
-        """
-        
         params = {
             'id': ingredient_id,
             'name': ingredient['name'],
@@ -1203,14 +1619,14 @@ def update_ingredient(ingredient_id: int, ingredient: dict):
             'notes': ingredient.get('notes', '')
         }
         
-        from sqlalchemy import text
         with engine.begin() as conn:
-            conn.execute(text(query), params)
+            conn.execute(UPDATE_INGREDIENT_QUERY, params)
+        clear_catalog_cache()
         
         return {"message": "Ingredient updated successfully"}
         
     except Exception as e:
-        print(f"Error updating ingredient: {str(e)}")
+        logger.exception("Error updating ingredient")
         raise HTTPException(status_code=500, detail=f"Error updating ingredient: {str(e)}")
 
 
@@ -1223,20 +1639,19 @@ def delete_ingredient(ingredient_id: int):
         raise HTTPException(status_code=500, detail="Database connection not available")
     
     try:
-        from sqlalchemy import text
-        query = "DELETE FROM ingredients WHERE id = :id"
-        
         with engine.begin() as conn:
-            conn.execute(text(query), {"id": ingredient_id})
+            conn.execute(DELETE_INGREDIENT_QUERY, {"id": ingredient_id})
+        clear_catalog_cache()
         
         return {"message": "Ingredient deleted successfully"}
         
     except Exception as e:
-        print(f"Error deleting ingredient: {str(e)}")
+        logger.exception("Error deleting ingredient")
         raise HTTPException(status_code=500, detail=f"Error deleting ingredient: {str(e)}")
 
 
 @app.get("/products")
+@cached_endpoint("products", cache=_catalog_cache)
 def get_products():
     """
     Get all products (coffee items)
@@ -1245,37 +1660,12 @@ def get_products():
         raise HTTPException(status_code=500, detail="Database connection not available")
     
     try:
-        query = """
-            SELECT 
-                id,
-                product_name,
-                product_type,
-                selling_price,
-                description,
-                is_active,
-                created_at,
-                updated_at
-            FROM products
-            WHERE is_active = TRUE
-            ORDER BY product_name
-        """
-        
-        df = pd.read_sql(query, engine)
-        
-        if df.empty:
-            return {"products": []}
-        
-        products = df.to_dict('records')
-        
-        for product in products:
-            product['selling_price'] = float(product['selling_price'])
-            product['created_at'] = product['created_at'].isoformat() if product['created_at'] else None
-            product['updated_at'] = product['updated_at'].isoformat() if product['updated_at'] else None
+        products = fetch_all(PRODUCTS_QUERY)
         
         return {"products": products}
         
     except Exception as e:
-        print(f"Error fetching products: {str(e)}")
+        logger.exception("Error fetching products")
         raise HTTPException(status_code=500, detail=f"Error fetching products: {str(e)}")
 
 
@@ -1293,11 +1683,6 @@ def create_product(product: dict):
             if field not in product:
                 raise HTTPException(status_code=400, detail=f"Missing required field: {field}")
         
-        query = """
-            INSERT INTO products (product_name, product_type, selling_price, description)
-            VALUES (:product_name, :product_type, :selling_price, :description)
-        """
-        
         params = {
             'product_name': product['product_name'],
             'product_type': product['product_type'],
@@ -1305,22 +1690,23 @@ def create_product(product: dict):
             'description': product.get('description', '')
         }
         
-        from sqlalchemy import text
         with engine.begin() as conn:
-            result = conn.execute(text(query), params)
+            result = conn.execute(INSERT_PRODUCT_QUERY, params)
             try:
                 product_id = result.lastrowid
             except Exception:
-                product_id = conn.execute(text("SELECT LAST_INSERT_ID() AS id")).scalar()
+                product_id = conn.execute(LAST_INSERT_ID_QUERY).scalar()
+        clear_catalog_cache()
         
         return {"message": "Product created successfully", "id": product_id}
         
     except Exception as e:
-        print(f"Error creating product: {str(e)}")
+        logger.exception("Error creating product")
         raise HTTPException(status_code=500, detail=f"Error creating product: {str(e)}")
 
 
 @app.get("/products/{product_id}/ingredients")
+@cached_endpoint("product-ingredients", cache=_catalog_cache)
 def get_product_ingredients(product_id: int):
     """
     Get all ingredients for a specific product (recipe)
@@ -1329,45 +1715,12 @@ def get_product_ingredients(product_id: int):
         raise HTTPException(status_code=500, detail="Database connection not available")
     
     try:
-        query = """
-            SELECT 
-                pi.id,
-                pi.product_id,
-                pi.ingredient_id,
-                pi.quantity_needed,
-                pi.notes,
-                i.name as ingredient_name,
-                i.unit,
-                i.stock_quantity,
-                p.product_name
-            FROM product_ingredients pi
-            JOIN ingredients i ON pi.ingredient_id = i.id
-            JOIN products p ON pi.product_id = p.id
-            WHERE pi.product_id = %s
-            ORDER BY i.name
-        """
-        
-        df = pd.read_sql(query, engine, params=(product_id,))
-        
-        if df.empty:
-            return {"product_ingredients": []}
-        
-        ingredients = df.to_dict('records')
-        
-        for ing in ingredients:
-            ing['quantity_needed'] = float(ing['quantity_needed'])
-            ing['stock_quantity'] = float(ing['stock_quantity'])
-            
-            # Calculate how many products can be made with current stock
-            if ing['quantity_needed'] > 0:
-                ing['units_available'] = int(ing['stock_quantity'] / ing['quantity_needed'])
-            else:
-                ing['units_available'] = 0
+        ingredients = fetch_all(PRODUCT_INGREDIENTS_QUERY, {"product_id": product_id})
         
         return {"product_ingredients": ingredients}
         
     except Exception as e:
-        print(f"Error fetching product ingredients: {str(e)}")
+        logger.exception("Error fetching product ingredients")
         raise HTTPException(status_code=500, detail=f"Error fetching product ingredients: {str(e)}")
 
 
@@ -1385,14 +1738,6 @@ def add_product_ingredient(product_id: int, ingredient_data: dict):
             if field not in ingredient_data:
                 raise HTTPException(status_code=400, detail=f"Missing required field: {field}")
         
-        query = """
-            INSERT INTO product_ingredients (product_id, ingredient_id, quantity_needed, notes)
-            VALUES (:product_id, :ingredient_id, :quantity_needed, :notes)
-            ON DUPLICATE KEY UPDATE 
-                quantity_needed = :quantity_needed,
-                notes = :notes
-        """
-        
         params = {
             'product_id': product_id,
             'ingredient_id': ingredient_data['ingredient_id'],
@@ -1400,14 +1745,14 @@ def add_product_ingredient(product_id: int, ingredient_data: dict):
             'notes': ingredient_data.get('notes', '')
         }
         
-        from sqlalchemy import text
         with engine.begin() as conn:
-            conn.execute(text(query), params)
+            conn.execute(UPSERT_PRODUCT_INGREDIENT_QUERY, params)
+        clear_catalog_cache()
         
         return {"message": "Product ingredient added successfully"}
         
     except Exception as e:
-        print(f"Error adding product ingredient: {str(e)}")
+        logger.exception("Error adding product ingredient")
         raise HTTPException(status_code=500, detail=f"Error adding product ingredient: {str(e)}")
 
 
@@ -1420,20 +1765,19 @@ def remove_product_ingredient(product_id: int, ingredient_id: int):
         raise HTTPException(status_code=500, detail="Database connection not available")
     
     try:
-        from sqlalchemy import text
-        query = "DELETE FROM product_ingredients WHERE product_id = :product_id AND ingredient_id = :ingredient_id"
-        
         with engine.begin() as conn:
-            conn.execute(text(query), {"product_id": product_id, "ingredient_id": ingredient_id})
+            conn.execute(DELETE_PRODUCT_INGREDIENT_QUERY, {"product_id": product_id, "ingredient_id": ingredient_id})
+        clear_catalog_cache()
         
         return {"message": "Product ingredient removed successfully"}
         
     except Exception as e:
-        print(f"Error removing product ingredient: {str(e)}")
+        logger.exception("Error removing product ingredient")
         raise HTTPException(status_code=500, detail=f"Error removing product ingredient: {str(e)}")
 
 
 @app.get("/products/{product_id}/cost-analysis")
+@cached_endpoint("product-cost-analysis", cache=_catalog_cache)
 def get_product_cost_analysis(product_id: int):
     """
     Calculate the cost breakdown and profit margin for a product
@@ -1442,44 +1786,28 @@ def get_product_cost_analysis(product_id: int):
         raise HTTPException(status_code=500, detail="Database connection not available")
     
     try:
-        query = """
-            SELECT 
-                p.id,
-                p.product_name,
-                p.selling_price,
-                SUM(pi.quantity_needed * i.unit_cost) as total_cost,
-                GROUP_CONCAT(CONCAT(i.name, ': ', pi.quantity_needed, ' ', i.unit) SEPARATOR ', ') as ingredients_used
-            FROM products p
-            LEFT JOIN product_ingredients pi ON p.id = pi.product_id
-            LEFT JOIN ingredients i ON pi.ingredient_id = i.id
-            WHERE p.id = %s
-            GROUP BY p.id, p.product_name, p.selling_price
-        """
+        result = fetch_one(PRODUCT_COST_QUERY, {"product_id": product_id})
         
-        df = pd.read_sql(query, engine, params=(product_id,))
-        
-        if df.empty:
+        if result is None:
             raise HTTPException(status_code=404, detail="Product not found")
         
-        result = df.iloc[0].to_dict()
-        
-        selling_price = float(result['selling_price'])
-        total_cost = float(result['total_cost']) if result['total_cost'] else 0
+        selling_price = result.selling_price
+        total_cost = result.total_cost or 0
         profit = selling_price - total_cost
         profit_margin = (profit / selling_price * 100) if selling_price > 0 else 0
         
         return {
-            "product_id": result['id'],
-            "product_name": result['product_name'],
+            "product_id": result.id,
+            "product_name": result.product_name,
             "selling_price": selling_price,
             "total_cost": total_cost,
             "profit": profit,
             "profit_margin": round(profit_margin, 2),
-            "ingredients_used": result['ingredients_used']
+            "ingredients_used": result.ingredients_used
         }
         
     except Exception as e:
-        print(f"Error in cost analysis: {str(e)}")
+        logger.exception("Error in cost analysis")
         raise HTTPException(status_code=500, detail=f"Error calculating cost: {str(e)}")
 
 
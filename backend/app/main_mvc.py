@@ -2,11 +2,23 @@
 DataBrew Coffee Sales Analytics API - MVC Architecture
 Main application entry point
 """
-from fastapi import FastAPI
+import asyncio
+import logging
+
+import numpy as np
+import pandas as pd
+from fastapi import FastAPI, Request
+from fastapi.concurrency import run_in_threadpool
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse
+from sqlalchemy import text
+from sqlalchemy.exc import SQLAlchemyError
 
-from .config.database import init_db
+from .config.database import init_db, init_async_db, dispose_engine, dispose_async_engine, ensure_indexes
+from .config.logging_config import setup_logging, stop_logging
 from .config.settings import APP_NAME, CORS_ORIGINS
+from .services.holiday_service import close_http_client as close_holiday_client
+from .sales_rollups import ensure_rollup_tables, refresh_sales_rollups, ROLLUP_REFRESH_SECONDS
 from .utils.model_loader import load_sarima_model
 
 # Import routers
@@ -19,8 +31,10 @@ from .routes import (
     ai_router
 )
 
+logger = logging.getLogger(__name__)
+
 # Initialize FastAPI app
-app = FastAPI(title=APP_NAME)
+app = FastAPI(title=APP_NAME, default_response_class=ORJSONResponse)
 
 # Configure CORS
 app.add_middleware(
@@ -31,22 +45,64 @@ app.add_middleware(
 )
 
 
+@app.exception_handler(SQLAlchemyError)
+async def database_exception_handler(request: Request, exc: SQLAlchemyError):
+    """Report database failures as a 500 without leaking driver details"""
+    logger.error("Database error on %s %s: %s", request.method, request.url.path, exc)
+    return ORJSONResponse(status_code=500, content={"detail": "Database error"})
+
+
+# Periodic refresh tasks started on startup and cancelled on shutdown
+_background_tasks = []
+
+
+async def refresh_rollups_periodically(engine):
+    """Background task: fold new transactions into the sales rollups every ROLLUP_REFRESH_SECONDS"""
+    while True:
+        await asyncio.sleep(ROLLUP_REFRESH_SECONDS)
+        try:
+            await run_in_threadpool(refresh_sales_rollups, engine)
+        except Exception:
+            logger.exception("Background sales rollup refresh failed")
+
+
 @app.on_event("startup")
 async def startup_event():
     """Initialize application resources on startup"""
-    print("="*60)
-    print(f"Starting {APP_NAME}")
-    print("="*60)
+    setup_logging()
+
+    logger.info("Starting %s", APP_NAME)
 
-    # Initialize database connection
-    init_db()
+    # Initialize database connections
+    engine = init_db()
+    init_async_db()
+
+    # Sales and analytics reports read the rollups, so they must be current
+    # before serving
+    if engine is not None:
+        await run_in_threadpool(ensure_indexes, engine)
+        await run_in_threadpool(ensure_rollup_tables, engine)
+        try:
+            await run_in_threadpool(refresh_sales_rollups, engine)
+        except Exception as e:
+            logger.warning("Could not refresh sales rollups: %s", e)
+        _background_tasks.append(asyncio.create_task(refresh_rollups_periodically(engine)))
 
     # Load ML models
     load_sarima_model()
 
-    print("="*60)
-    print("Application startup complete")
-    print("="*60)
+    logger.info("Application startup complete")
+
+
+@app.on_event("shutdown")
+async def shutdown_event():
+    """Release application resources on shutdown"""
+    for task in _background_tasks:
+        task.cancel()
+    dispose_engine()
+    await dispose_async_engine()
+    await close_holiday_client()
+    stop_logging()
 
 
 @app.get("/")
@@ -103,16 +159,28 @@ app.include_router(inventory_router)
 app.include_router(ai_router)
 
 
+async def _read_frame(engine, query: str):
+    """Run a query on its own pooled async connection and return the rows as a DataFrame"""
+    async with engine.connect() as conn:
+        result = await conn.execute(text(query))
+        # coerce_float matches pd.read_sql: DECIMAL columns come back as floats
+        return pd.DataFrame.from_records(result.fetchall(), columns=list(result.keys()), coerce_float=True)
+
+
+def frame_records(df, columns) -> list:
+    """Rows of the given columns as dicts of plain Python values (to_dict('records') without its per-row overhead)"""
+    return [dict(zip(columns, values)) for values in zip(*(df[column].tolist() for column in columns))]
+
+
 # Helper function for AI insights (kept for compatibility with ai_routes)
-def fetch_sales_data_for_insights():
+async def fetch_sales_data_for_insights():
     """
     Helper function to fetch and process sales data for AI insights
     Returns a sales_summary dictionary
     """
-    from .config.database import get_engine
-    import pandas as pd
+    from .config.database import get_async_engine
 
-    engine = get_engine()
+    engine = get_async_engine()
     if engine is None:
         from fastapi import HTTPException
         raise HTTPException(status_code=500, detail="Database connection not available")
@@ -123,13 +191,16 @@ def fetch_sales_data_for_insights():
             DATE(transaction_date) as date,
             SUM(transaction_qty * unit_price) as daily_sales,
             COUNT(DISTINCT transaction_id) as order_count,
-            SUM(transaction_qty) as items_sold
+            SUM(transaction_qty) as items_sold,
+            SUM(SUM(transaction_qty * unit_price)) OVER (
+                ORDER BY DATE(transaction_date) DESC
+                ROWS BETWEEN CURRENT ROW AND 6 FOLLOWING
+            ) as rolling_week_sales
         FROM transactions
         WHERE transaction_date >= DATE_SUB('2023-06-24', INTERVAL 14 DAY)
         GROUP BY DATE(transaction_date)
         ORDER BY date DESC
     """
-    trends_df = pd.read_sql(query_trends, engine)
 
     # 2. Get top products with SQL
     query_products = """
@@ -145,7 +216,6 @@ def fetch_sales_data_for_insights():
         ORDER BY total_revenue DESC
         LIMIT 5
     """
-    products_df = pd.read_sql(query_products, engine)
 
     # 3. Get hourly patterns with SQL
     query_hourly = """
@@ -154,12 +224,11 @@ def fetch_sales_data_for_insights():
             COUNT(DISTINCT transaction_id) as customer_count,
             SUM(transaction_qty * unit_price) as hourly_sales
         FROM transactions
-        WHERE DATE(transaction_date) >= DATE_SUB('2023-06-24', INTERVAL 3 DAY)
+        WHERE transaction_date >= DATE_SUB('2023-06-24', INTERVAL 3 DAY)
         GROUP BY HOUR(transaction_time)
         ORDER BY hourly_sales DESC
         LIMIT 3
     """
-    hourly_df = pd.read_sql(query_hourly, engine)
 
     # 4. Get inventory levels with SQL
     query_inventory = """
@@ -172,38 +241,51 @@ def fetch_sales_data_for_insights():
         ORDER BY (stock / NULLIF(reorder_level, 0)) ASC
         LIMIT 3
     """
-    inventory_df = pd.read_sql(query_inventory, engine)
 
-    # 5. Calculate week-over-week changes
-    if not trends_df.empty and len(trends_df) >= 7:
-        current_week_sales = trends_df.head(7)['daily_sales'].sum()
-        previous_week_sales = trends_df.tail(7)['daily_sales'].sum() if len(trends_df) >= 14 else current_week_sales
+    # The four reads are independent, so each runs on its own connection
+    # and their round-trips overlap
+    trends_df, products_df, hourly_df, inventory_df = await asyncio.gather(
+        *(_read_frame(engine, query) for query in (query_trends, query_products, query_hourly, query_inventory))
+    )
+
+    # 5. Calculate week-over-week changes from the rolling 7-day totals.
+    # Columns are pulled out as arrays once and every figure below reuses
+    # them (rows are newest first: row 0 holds the latest week, row 7 the
+    # week before it)
+    daily_sales = trends_df['daily_sales'].to_numpy(dtype=float)
+    order_counts = trends_df['order_count'].to_numpy(dtype=np.int64)
+    items_sold = trends_df['items_sold'].to_numpy(dtype=np.int64)
+    rolling_week_sales = trends_df['rolling_week_sales'].to_numpy(dtype=float)
+    current_week_sales = float(rolling_week_sales[0]) if len(rolling_week_sales) else 0.0
+    current_week_orders = int(order_counts[:7].sum())
+    if len(daily_sales) >= 7:
+        previous_week_sales = float(rolling_week_sales[7]) if len(daily_sales) >= 14 else current_week_sales
         wow_change = ((current_week_sales - previous_week_sales) / previous_week_sales * 100) if previous_week_sales > 0 else 0
     else:
         wow_change = 0
 
     # 6. Prepare comprehensive sales summary for Gemini
     sales_summary = {
-        'avg_daily_sales': float(trends_df['daily_sales'].mean()) if not trends_df.empty else 0,
-        'recent_daily_sales': float(trends_df.head(1)['daily_sales'].iloc[0]) if not trends_df.empty else 0,
+        'avg_daily_sales': float(daily_sales.mean()) if len(daily_sales) else 0,
+        'recent_daily_sales': float(daily_sales[0]) if len(daily_sales) else 0,
         'wow_change': round(wow_change, 1),
         'trend': 'increasing' if wow_change > 5 else 'decreasing' if wow_change < -5 else 'steady',
-        'top_products': products_df['product_detail'].tolist() if not products_df.empty else [],
+        'top_products': products_df['product_detail'].tolist(),
         'top_product_revenue': float(products_df['total_revenue'].iloc[0]) if not products_df.empty else 0,
-        'peak_hours': [f"{int(row['hour'])}:00" for _, row in hourly_df.iterrows()] if not hourly_df.empty else [],
+        'peak_hours': (hourly_df['hour'].astype(int).astype(str) + ':00').tolist(),
         'peak_hour_customers': int(hourly_df['customer_count'].max()) if not hourly_df.empty else 0,
-        'total_customers_today': int(trends_df.head(1)['order_count'].iloc[0]) if not trends_df.empty else 0,
-        'avg_order_value': float(current_week_sales / trends_df.head(7)['order_count'].sum()) if not trends_df.empty and trends_df.head(7)['order_count'].sum() > 0 else 0,
-        'low_stock_items': inventory_df['item_name'].tolist() if not inventory_df.empty else [],
-        'total_weekly_sales': float(current_week_sales) if not trends_df.empty else 0,
-        'total_weekly_orders': int(trends_df.head(7)['order_count'].sum()) if not trends_df.empty else 0,
-        'total_items_sold': int(trends_df.head(7)['items_sold'].sum()) if not trends_df.empty else 0,
+        'total_customers_today': int(order_counts[0]) if len(order_counts) else 0,
+        'avg_order_value': float(current_week_sales / current_week_orders) if current_week_orders > 0 else 0,
+        'low_stock_items': inventory_df['item_name'].tolist(),
+        'total_weekly_sales': float(current_week_sales),
+        'total_weekly_orders': current_week_orders,
+        'total_items_sold': int(items_sold[:7].sum()),
         'best_selling_product': products_df['product_detail'].iloc[0] if not products_df.empty else None,
         'best_selling_qty': int(products_df['total_qty'].iloc[0]) if not products_df.empty else 0,
-        'top_5_products': products_df[['product_detail', 'total_revenue', 'total_qty']].to_dict('records') if not products_df.empty else [],
-        'daily_sales_last_7_days': trends_df.head(7)[['date', 'daily_sales', 'order_count']].to_dict('records') if not trends_df.empty else [],
-        'peak_hours_details': hourly_df[['hour', 'customer_count', 'hourly_sales']].to_dict('records') if not hourly_df.empty else [],
-        'inventory_alerts': inventory_df[['item_name', 'stock', 'reorder_level']].to_dict('records') if not inventory_df.empty else []
+        'top_5_products': frame_records(products_df, ('product_detail', 'total_revenue', 'total_qty')),
+        'daily_sales_last_7_days': frame_records(trends_df.head(7), ('date', 'daily_sales', 'order_count')),
+        'peak_hours_details': frame_records(hourly_df, ('hour', 'customer_count', 'hourly_sales')),
+        'inventory_alerts': frame_records(inventory_df, ('item_name', 'stock', 'reorder_level'))
     }
 
     return sales_summary
@@ -5,11 +5,19 @@ User and Session models for authentication
 from datetime import datetime
 from typing import Optional
 
+import bcrypt
+
+from ..config.settings import ADMIN_EMAIL, ADMIN_PASSWORD
+
+# Work factor for stored password hashes
+BCRYPT_ROUNDS = 12
+
 # In-memory user storage (hardcoded admin)
+# The password is hashed once at import; only the hash is kept
 ADMIN_USER = {
     "id": 1,
-    "email": "admin@gmail.com",
-    "password": "admin123",  # In production, this would be hashed
+    "email": ADMIN_EMAIL,
+    "password_hash": bcrypt.hashpw(ADMIN_PASSWORD.encode(), bcrypt.gensalt(rounds=BCRYPT_ROUNDS)),
     "full_name": "Admin User",
     "role": "admin"
 }
@@ -30,8 +38,8 @@ class User:
 
     @staticmethod
     def verify_password(user: dict, password: str) -> bool:
-        """Verify user password"""
-        return user["password"] == password
+        """Verify user password against its stored hash (constant-time)"""
+        return bcrypt.checkpw(password.encode(), user["password_hash"])
 
     @staticmethod
     def get_user_data(user: dict) -> dict:
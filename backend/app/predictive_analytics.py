@@ -1,25 +1,45 @@
-import os
 from dotenv import load_dotenv
 from datetime import datetime, timedelta
+from threading import Lock
 from typing import Dict, List, Optional
+from cachetools import TTLCache
+import httpx
 import json
+import logging
 import re
-from groq import Groq
 
 # Import local modules
 from .holiday import get_next_30_days_holidays, format_holidays_for_analysis
+from .gemini_service import get_groq_client
 
 # Load environment variables
 load_dotenv()
 
-# Configure Groq API
-GROQ_API_KEY = os.getenv("GROG_API_KEY")
-if GROQ_API_KEY:
-    groq_client = Groq(api_key=GROQ_API_KEY)
-    print("✓ Groq API configured successfully")
-else:
-    groq_client = None
-    print("Warning: GROG_API_KEY not found in environment variables")
+logger = logging.getLogger(__name__)
+
+# orjson parses much faster; fall back to the stdlib parser without it
+try:
+    from orjson import loads as json_loads
+except ImportError:
+    from json import loads as json_loads
+
+# Markdown code fence the model sometimes wraps its JSON object in
+JSON_OBJECT_FENCE = re.compile(r'```(?:json)?\s*(\{.*\})\s*```', re.DOTALL)
+
+# Shared HTTP/2 client so weather requests reuse keep-alive TLS connections
+_HTTP = httpx.Client(timeout=10, http2=True)
+
+# The upstream forecast only changes a few times a day, so successful
+# responses are kept in memory, keyed by the forecast's start date so the
+# window still rolls over at midnight
+WEATHER_CACHE_TTL_SECONDS = 30 * 60
+_weather_cache = TTLCache(maxsize=4, ttl=WEATHER_CACHE_TTL_SECONDS)
+_weather_cache_lock = Lock()
+
+
+def close_http_client():
+    """Close the shared weather API client and its pooled connections"""
+    _HTTP.close()
 
 
 def get_sales_data_last_60_days(engine) -> Dict:
@@ -93,7 +113,7 @@ def get_sales_data_last_60_days(engine) -> Dict:
         }
         
     except Exception as e:
-        print(f"Error fetching sales data: {e}")
+        logger.warning("Error fetching sales data: %s", e)
         return get_fallback_sales_data()
 
 
@@ -147,6 +167,7 @@ def generate_predictive_insights(
     Returns:
         Dictionary containing AI insights and predictions
     """
+    groq_client = get_groq_client()
     if not groq_client:
         return get_fallback_predictive_insights()
     
@@ -209,13 +230,14 @@ Rules:
         )
         insights_text = response.choices[0].message.content.strip()
         
-        # Extract JSON from response
-        json_match = re.search(r'```(?:json)?\s*(\{.*\})\s*```', insights_text, re.DOTALL)
-        if json_match:
-            insights_text = json_match.group(1)
+        # Extract JSON from response (bare JSON needs no regex pass)
+        if insights_text[:1] != '{':
+            json_match = JSON_OBJECT_FENCE.search(insights_text)
+            if json_match:
+                insights_text = json_match.group(1)
         
         # Parse JSON
-        insights = json.loads(insights_text)
+        insights = json_loads(insights_text)
         
         # Add metadata
         insights['generated_at'] = datetime.now().isoformat()
@@ -228,8 +250,7 @@ Rules:
         return insights
         
     except Exception as e:
-        print(f"Error generating predictive insights: {e}")
-        print(f"Response: {insights_text if 'insights_text' in locals() else 'No response'}")
+        logger.warning("Error generating predictive insights: %s", e)
         return get_fallback_predictive_insights()
 
 
@@ -299,7 +320,6 @@ def get_weather_forecast_data() -> List[Dict]:
     Returns:
         List of weather forecast dictionaries
     """
-    import requests
     from datetime import datetime, timedelta
     
     # Configuration
@@ -313,6 +333,11 @@ def get_weather_forecast_data() -> List[Dict]:
     start_str = start_date.strftime("%Y-%m-%d")
     end_str = end_date.strftime("%Y-%m-%d")
     
+    with _weather_cache_lock:
+        weather_list = _weather_cache.get(start_str)
+    if weather_list is not None:
+        return weather_list
+    
     url = (
         f"https://weather.visualcrossing.com/VisualCrossingWebServices/rest/services/timeline/"
         f"{latitude},{longitude}/{start_str}/{end_str}"
@@ -320,13 +345,13 @@ def get_weather_forecast_data() -> List[Dict]:
     )
     
     try:
-        response = requests.get(url, timeout=10)
+        response = _HTTP.get(url)
         
         if response.status_code != 200:
-            print(f"Weather API error: {response.status_code}")
+            logger.warning("Weather API error: %s", response.status_code)
             return get_fallback_weather_data()
         
-        data = response.json()
+        data = json_loads(response.content)
         forecast_days = data.get("days", [])
         
         # Format weather data
@@ -344,10 +369,12 @@ def get_weather_forecast_data() -> List[Dict]:
                 'description': day.get('description', '')
             })
         
+        with _weather_cache_lock:
+            _weather_cache[start_str] = weather_list
         return weather_list
         
     except Exception as e:
-        print(f"Error fetching weather data: {e}")
+        logger.warning("Error fetching weather data: %s", e)
         return get_fallback_weather_data()
 
 
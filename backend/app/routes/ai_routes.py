@@ -2,10 +2,15 @@
 AI Routes
 Defines API endpoints for AI-powered insights and predictions
 """
+import logging
+
 from fastapi import APIRouter, Depends, HTTPException
+from fastapi.concurrency import run_in_threadpool
 from datetime import datetime
 from typing import Dict
 
+logger = logging.getLogger(__name__)
+
 router = APIRouter(prefix="", tags=["AI Insights"])
 
 
@@ -16,26 +21,25 @@ def get_dependencies():
 
 
 @router.get("/ai-insights")
-def get_ai_insights(deps: Dict = Depends(get_dependencies)):
+async def get_ai_insights(include_source: bool = False, deps: Dict = Depends(get_dependencies)):
     """
     Returns AI-generated insights using Gemini AI based on recent sales data from SQL queries
     Also returns the source data used to generate insights for transparency
+    (only the prompt fields unless include_source is set)
     """
     try:
         from ..services.gemini_service import generate_ai_insights
-        from ..app.main import fetch_sales_data_for_insights
+        from ..main_mvc import fetch_sales_data_for_insights
 
-        sales_summary = fetch_sales_data_for_insights()
-        result = generate_ai_insights(sales_summary)
+        sales_summary = await fetch_sales_data_for_insights()
+        result = await run_in_threadpool(generate_ai_insights, sales_summary, include_source)
         return {
             "insights": result["insights"],
             "source_data": result["source_data"]
         }
 
-    except Exception as e:
-        print(f"Error in ai-insights endpoint: {str(e)}")
-        import traceback
-        traceback.print_exc()
+    except Exception:
+        logger.exception("Error in ai-insights endpoint")
         return {
             "insights": [
                 {
@@ -53,23 +57,23 @@ def get_ai_insights(deps: Dict = Depends(get_dependencies)):
 
 
 @router.post("/generate-insights")
-def generate_new_insights(deps: Dict = Depends(get_dependencies)):
+async def generate_new_insights(deps: Dict = Depends(get_dependencies)):
     """
     Generates fresh AI insights on demand using SQL queries and Gemini AI
     """
     try:
         from ..services.gemini_service import generate_ai_insights
-        from ..app.main import fetch_sales_data_for_insights
+        from ..main_mvc import fetch_sales_data_for_insights
 
-        print("Generate insights endpoint called - fetching fresh data from database...")
+        logger.info("Generate insights endpoint called - fetching fresh data from database")
 
-        sales_summary = fetch_sales_data_for_insights()
+        sales_summary = await fetch_sales_data_for_insights()
 
-        print(f"Sales summary prepared: {sales_summary}")
+        logger.info("Sales summary prepared: %s", sales_summary)
 
-        result = generate_ai_insights(sales_summary)
+        result = await run_in_threadpool(generate_ai_insights, sales_summary, include_source=True)
 
-        print(f"Generated {len(result['insights'])} insights")
+        logger.info("Generated %d insights", len(result['insights']))
 
         return {
             "insights": result["insights"],
@@ -83,14 +87,12 @@ def generate_new_insights(deps: Dict = Depends(get_dependencies)):
         }
 
     except Exception as e:
-        print(f"Error in generate-insights endpoint: {str(e)}")
-        import traceback
-        traceback.print_exc()
+        logger.exception("Error in generate-insights endpoint")
         raise HTTPException(status_code=500, detail=f"Error generating insights: {str(e)}")
 
 
 @router.get("/predictive-insights")
-def get_predictive_insights(deps: Dict = Depends(get_dependencies)):
+async def get_predictive_insights(deps: Dict = Depends(get_dependencies)):
     """
     Returns comprehensive AI-powered predictive insights combining:
     - Next 30 days holidays
@@ -104,27 +106,27 @@ def get_predictive_insights(deps: Dict = Depends(get_dependencies)):
         raise HTTPException(status_code=500, detail="Database connection not available")
 
     try:
+        from ..services.holiday_service import fetch_next_30_days_holidays
         from ..services.predictive_service import (
-            get_next_30_days_holidays,
             get_weather_forecast_data,
             get_sales_data_last_60_days,
             generate_predictive_insights
         )
 
-        print("Fetching predictive insights...")
+        logger.info("Fetching predictive insights")
 
-        holidays = get_next_30_days_holidays()
-        print(f"  - Found {len(holidays)} holidays")
+        holidays = await fetch_next_30_days_holidays()
+        logger.info("Found %d holidays", len(holidays))
 
-        weather_data = get_weather_forecast_data()
-        print(f"  - Got {len(weather_data)} days of weather forecast")
+        weather_data = await run_in_threadpool(get_weather_forecast_data)
+        logger.info("Got %d days of weather forecast", len(weather_data))
 
-        sales_data = get_sales_data_last_60_days(engine)
-        print(f"  - Analyzed {sales_data['data_points']} days of sales")
+        sales_data = await run_in_threadpool(get_sales_data_last_60_days, engine)
+        logger.info("Analyzed %d days of sales", sales_data['data_points'])
 
-        insights = generate_predictive_insights(sales_data, weather_data, holidays)
+        insights = await run_in_threadpool(generate_predictive_insights, sales_data, weather_data, holidays)
 
-        print("  ✓ Predictive insights generated successfully")
+        logger.info("Predictive insights generated successfully")
 
         return {
             "status": "success",
@@ -140,22 +142,20 @@ def get_predictive_insights(deps: Dict = Depends(get_dependencies)):
         }
 
     except Exception as e:
-        print(f"Error in predictive-insights endpoint: {str(e)}")
-        import traceback
-        traceback.print_exc()
+        logger.exception("Error in predictive-insights endpoint")
         raise HTTPException(status_code=500, detail=f"Error generating predictive insights: {str(e)}")
 
 
 @router.get("/holidays")
-def get_holidays(days: int = 30):
+async def get_holidays(days: int = 30):
     """
     Returns upcoming holidays for the next N days
     """
     try:
-        from ..services.holiday_service import get_next_30_days_holidays
+        from ..services.holiday_service import fetch_next_30_days_holidays
         from datetime import datetime, timedelta
 
-        holidays = get_next_30_days_holidays()
+        holidays = await fetch_next_30_days_holidays()
 
         if days != 30:
             end_date = datetime.now() + timedelta(days=days)
@@ -171,7 +171,7 @@ def get_holidays(days: int = 30):
         }
 
     except Exception as e:
-        print(f"Error in holidays endpoint: {str(e)}")
+        logger.exception("Error in holidays endpoint")
         raise HTTPException(status_code=500, detail=f"Error fetching holidays: {str(e)}")
 
 
@@ -193,5 +193,5 @@ def get_weather_forecast(days: int = 30):
         }
 
     except Exception as e:
-        print(f"Error in weather-forecast endpoint: {str(e)}")
+        logger.exception("Error in weather-forecast endpoint")
         raise HTTPException(status_code=500, detail=f"Error fetching weather forecast: {str(e)}")
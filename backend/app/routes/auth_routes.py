@@ -2,11 +2,11 @@
 Authentication Routes
 Defines API endpoints for authentication
 """
-from fastapi import APIRouter, Header
-from typing import Optional
+from fastapi import APIRouter, Depends
 
 from ..models.schemas import LoginRequest, SignupRequest, AuthResponse, UserResponse
 from ..controllers.auth_controller import AuthController
+from ..utils.dependencies import bearer_token
 
 router = APIRouter(prefix="", tags=["Authentication"])
 
@@ -33,27 +33,27 @@ async def signup(signup_data: SignupRequest):
 
 
 @router.post("/logout")
-async def logout(authorization: Optional[str] = Header(None)):
+async def logout(token: str = Depends(bearer_token)):
     """
     Logout current user session
     Requires: Authorization header with Bearer token
     """
-    return await AuthController.logout(authorization)
+    return await AuthController.logout(token)
 
 
 @router.get("/profile", response_model=UserResponse)
-async def profile(authorization: Optional[str] = Header(None)):
+async def profile(token: str = Depends(bearer_token)):
     """
     Get current user profile
     Requires: Authorization header with Bearer token
     """
-    return await AuthController.get_profile(authorization)
+    return await AuthController.get_profile(token)
 
 
 @router.get("/verify")
-async def verify(authorization: Optional[str] = Header(None)):
+async def verify(token: str = Depends(bearer_token)):
     """
     Verify if authentication token is valid
     Requires: Authorization header with Bearer token
     """
-    return await AuthController.verify(authorization)
+    return await AuthController.verify(token)
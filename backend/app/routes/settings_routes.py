@@ -2,90 +2,90 @@
 Settings Routes
 Defines API endpoints for user and shop settings
 """
-from fastapi import APIRouter, Header
-from typing import Optional
+from fastapi import APIRouter, Depends
 
 from ..models.schemas import ProfileUpdate, ShopDetailsUpdate, NotificationPreferences, PasswordChange
 from ..controllers.settings_controller import SettingsController
+from ..utils.dependencies import current_user
 
 router = APIRouter(prefix="/settings", tags=["Settings"])
 
 
 @router.get("/profile")
-async def get_profile_settings(authorization: Optional[str] = Header(None)):
+async def get_profile_settings(user: dict = Depends(current_user)):
     """
     Get user profile settings
     """
-    return await SettingsController.get_profile_settings(authorization)
+    return await SettingsController.get_profile_settings(user)
 
 
 @router.put("/profile")
-async def update_profile_settings(profile: ProfileUpdate, authorization: Optional[str] = Header(None)):
+async def update_profile_settings(profile: ProfileUpdate, user: dict = Depends(current_user)):
     """
     Update user profile settings
     """
-    return await SettingsController.update_profile_settings(profile, authorization)
+    return await SettingsController.update_profile_settings(profile, user)
 
 
 @router.get("/shop")
-async def get_shop_settings(authorization: Optional[str] = Header(None)):
+async def get_shop_settings(user: dict = Depends(current_user)):
     """
     Get shop details settings
     """
-    return await SettingsController.get_shop_settings(authorization)
+    return await SettingsController.get_shop_settings(user)
 
 
 @router.put("/shop")
-async def update_shop_settings(shop: ShopDetailsUpdate, authorization: Optional[str] = Header(None)):
+async def update_shop_settings(shop: ShopDetailsUpdate, user: dict = Depends(current_user)):
     """
     Update shop details settings
     """
-    return await SettingsController.update_shop_settings(shop, authorization)
+    return await SettingsController.update_shop_settings(shop, user)
 
 
 @router.get("/notifications")
-async def get_notification_preferences(authorization: Optional[str] = Header(None)):
+async def get_notification_preferences(user: dict = Depends(current_user)):
     """
     Get notification preferences
     """
-    return await SettingsController.get_notification_preferences(authorization)
+    return await SettingsController.get_notification_preferences(user)
 
 
 @router.put("/notifications")
-async def update_notification_preferences(preferences: NotificationPreferences, authorization: Optional[str] = Header(None)):
+async def update_notification_preferences(preferences: NotificationPreferences, user: dict = Depends(current_user)):
     """
     Update notification preferences
     """
-    return await SettingsController.update_notification_preferences(preferences, authorization)
+    return await SettingsController.update_notification_preferences(preferences, user)
 
 
 @router.post("/change-password")
-async def change_password(password_data: PasswordChange, authorization: Optional[str] = Header(None)):
+async def change_password(password_data: PasswordChange, user: dict = Depends(current_user)):
     """
     Change user password
     """
-    return await SettingsController.change_password(password_data, authorization)
+    return await SettingsController.change_password(password_data, user)
 
 
 @router.get("/sessions")
-async def get_active_sessions(authorization: Optional[str] = Header(None)):
+async def get_active_sessions(user: dict = Depends(current_user)):
     """
     Get active sessions
     """
-    return await SettingsController.get_active_sessions(authorization)
+    return await SettingsController.get_active_sessions(user)
 
 
 @router.post("/logout-session")
-async def logout_session(session_id: int, authorization: Optional[str] = Header(None)):
+async def logout_session(session_id: int, user: dict = Depends(current_user)):
     """
     Logout a specific session
     """
-    return await SettingsController.logout_session(session_id, authorization)
+    return await SettingsController.logout_session(session_id, user)
 
 
 @router.post("/logout-all-sessions")
-async def logout_all_sessions(authorization: Optional[str] = Header(None)):
+async def logout_all_sessions(user: dict = Depends(current_user)):
     """
     Logout all other sessions
     """
-    return await SettingsController.logout_all_sessions(authorization)
+    return await SettingsController.logout_all_sessions(user)
@@ -0,0 +1,96 @@
+"""
+Sales Rollups
+Pre-aggregated daily and hourly sales totals that the dashboard reads
+instead of scanning transactions on every request
+"""
+
+import logging
+
+from sqlalchemy import text
+
+logger = logging.getLogger(__name__)
+
+# Days re-aggregated on each refresh, counting back from the newest rolled-up
+# day, so rows that land late for the previous day are still picked up
+ROLLUP_OVERLAP_DAYS = 1
+
+# How often the background job brings the rollups up to date
+ROLLUP_REFRESH_SECONDS = 300
+
+ROLLUP_TABLES = [
+    text("""
+        CREATE TABLE IF NOT EXISTS daily_sales_rollup (
+            sales_date DATE PRIMARY KEY,
+            revenue DECIMAL(14, 2) NOT NULL DEFAULT 0,
+            orders INT NOT NULL DEFAULT 0,
+            items INT NOT NULL DEFAULT 0
+        )
+    """),
+    text("""
+        CREATE TABLE IF NOT EXISTS hourly_sales_rollup (
+            sales_date DATE NOT NULL,
+            sales_hour TINYINT NOT NULL,
+            revenue DECIMAL(14, 2) NOT NULL DEFAULT 0,
+            customers INT NOT NULL DEFAULT 0,
+            PRIMARY KEY (sales_date, sales_hour)
+        )
+    """),
+]
+
+# An empty rollup starts from the first transaction, i.e. a full backfill
+ROLLUP_SINCE_QUERY = text("""
+    SELECT COALESCE(DATE_SUB(MAX(sales_date), INTERVAL :overlap_days DAY), '1000-01-01')
+    FROM daily_sales_rollup
+""")
+
+REFRESH_DAILY_ROLLUP_QUERY = text("""
+    INSERT INTO daily_sales_rollup (sales_date, revenue, orders, items)
+    SELECT
+        DATE(transaction_date),
+        SUM(transaction_qty * unit_price),
+        COUNT(DISTINCT transaction_id),
+        SUM(transaction_qty)
+    FROM transactions
+    WHERE transaction_date >= :since
+    GROUP BY DATE(transaction_date)
+    ON DUPLICATE KEY UPDATE
+        revenue = VALUES(revenue), orders = VALUES(orders), items = VALUES(items)
+""")
+
+REFRESH_HOURLY_ROLLUP_QUERY = text("""
+    INSERT INTO hourly_sales_rollup (sales_date, sales_hour, revenue, customers)
+    SELECT
+        DATE(transaction_date),
+        HOUR(transaction_time),
+        SUM(transaction_qty * unit_price),
+        COUNT(DISTINCT transaction_id)
+    FROM transactions
+    WHERE transaction_date >= :since
+    GROUP BY DATE(transaction_date), HOUR(transaction_time)
+    ON DUPLICATE KEY UPDATE
+        revenue = VALUES(revenue), customers = VALUES(customers)
+""")
+
+
+def ensure_rollup_tables(engine):
+    """Create the rollup tables if they do not exist yet"""
+    try:
+        with engine.begin() as conn:
+            for statement in ROLLUP_TABLES:
+                conn.execute(statement)
+    except Exception as e:
+        logger.warning("Could not create sales rollup tables: %s", e)
+
+
+def refresh_sales_rollups(engine):
+    """
+    Re-aggregate the newest days of transactions into the rollup tables
+
+    The first run on empty tables backfills the whole history; later runs
+    only touch the last ROLLUP_OVERLAP_DAYS + 1 days
+    """
+    with engine.begin() as conn:
+        since = conn.execute(ROLLUP_SINCE_QUERY, {"overlap_days": ROLLUP_OVERLAP_DAYS}).scalar()
+        conn.execute(REFRESH_DAILY_ROLLUP_QUERY, {"since": since})
+        conn.execute(REFRESH_HOURLY_ROLLUP_QUERY, {"since": since})
+    logger.info("Sales rollups refreshed from %s", since)
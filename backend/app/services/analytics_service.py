@@ -2,9 +2,38 @@
 Analytics Service
 Handles analytics, inventory, and reporting operations
 """
+import numpy as np
 import pandas as pd
 from typing import Dict, List
 from fastapi import HTTPException
+from sqlalchemy import text
+
+from ..stock_levels import ALERT_LEVELS, DEMAND_LEVELS, classify_stock
+
+# Mock feedback until it comes from a feedback/reviews table; built once and
+# served as is
+CUSTOMER_FEEDBACK = {
+    "feedback": [
+        {
+            "customer": "John D.",
+            "rating": 5,
+            "comment": "Best coffee in town! The service is excellent.",
+            "date": "Today"
+        },
+        {
+            "customer": "Sarah M.",
+            "rating": 4,
+            "comment": "Great ambiance, but wait time was a bit long.",
+            "date": "Yesterday"
+        },
+        {
+            "customer": "Mike R.",
+            "rating": 5,
+            "comment": "Amazing Iced Caramel Latte. Will come back!",
+            "date": "2 days ago"
+        }
+    ]
+}
 
 
 class AnalyticsService:
@@ -32,30 +61,26 @@ class AnalyticsService:
             if df.empty:
                 return {"inventory": []}
 
-            inventory_list = []
-            for _, row in df.iterrows():
-                current_stock = int(row['stock'])
-                reorder_level = int(row['reorder_level'] or 0)
-
-                predicted_demand = int(reorder_level * 1.5) if reorder_level > 0 else current_stock + 10
-
-                if current_stock < reorder_level:
-                    alert_level = "critical"
-                    demand_level = "High Demand"
-                elif current_stock < reorder_level * 1.5:
-                    alert_level = "warning"
-                    demand_level = "Medium"
-                else:
-                    alert_level = "safe"
-                    demand_level = "Low"
-
-                inventory_list.append({
-                    "product": row['item_name'],
-                    "current_stock": f"{current_stock} {row['unit']}",
-                    "predicted_demand": f"{predicted_demand} {row['unit']}",
+            current_stock = df['stock'].to_numpy(dtype=np.int64)
+            reorder_level = df['reorder_level'].fillna(0).to_numpy(dtype=np.int64)
+
+            # Critical below the reorder level, warning below 1.5x it
+            alert_codes, predicted_demand = classify_stock(current_stock, reorder_level)
+
+            inventory_list = [
+                {
+                    "product": product,
+                    "current_stock": f"{stock} {unit}",
+                    "predicted_demand": f"{demand} {unit}",
                     "demand_level": demand_level,
                     "alert_level": alert_level
-                })
+                }
+                for product, unit, stock, demand, demand_level, alert_level in zip(
+                    df['item_name'].tolist(), df['unit'].tolist(),
+                    current_stock.tolist(), predicted_demand.tolist(),
+                    DEMAND_LEVELS[alert_codes].tolist(), ALERT_LEVELS[alert_codes].tolist()
+                )
+            ]
 
             return {"inventory": inventory_list}
 
@@ -81,16 +106,16 @@ class AnalyticsService:
                 ORDER BY shift_start
             """
 
-            df = pd.read_sql(query, engine)
+            df = pd.read_sql(query, engine, dtype={'performance_score': 'float64'})
 
-            schedule = []
-            for _, row in df.iterrows():
-                schedule.append({
-                    "name": row['name'],
-                    "role": row['role'],
-                    "shift": f"{row['shift_start']} - {row['shift_end']}",
-                    "performance": float(row['performance_score'] or 0)
-                })
+            schedule = [
+                {"name": name, "role": role, "shift": f"{start} - {end}", "performance": performance}
+                for name, role, start, end, performance in zip(
+                    df['name'].tolist(), df['role'].tolist(),
+                    df['shift_start'].tolist(), df['shift_end'].tolist(),
+                    df['performance_score'].fillna(0).tolist()
+                )
+            ]
 
             return {"schedule": schedule}
 
@@ -100,27 +125,7 @@ class AnalyticsService:
     @staticmethod
     def get_customer_feedback() -> Dict:
         """Get recent customer feedback (mock data)"""
-        feedback = [
-            {
-                "customer": "John D.",
-                "rating": 5,
-                "comment": "Best coffee in town! The service is excellent.",
-                "date": "Today"
-            },
-            {
-                "customer": "Sarah M.",
-                "rating": 4,
-                "comment": "Great ambiance, but wait time was a bit long.",
-                "date": "Yesterday"
-            },
-            {
-                "customer": "Mike R.",
-                "rating": 5,
-                "comment": "Amazing Iced Caramel Latte. Will come back!",
-                "date": "2 days ago"
-            }
-        ]
-        return {"feedback": feedback}
+        return CUSTOMER_FEEDBACK
 
     @staticmethod
     def get_sales_analytics(engine, period: str = "today") -> Dict:
@@ -129,32 +134,31 @@ class AnalyticsService:
             raise HTTPException(status_code=500, detail="Database connection not available")
 
         try:
+            # The day the report is "as of" is bound as :anchor; only the
+            # filter shape depends on the period. Totals come pre-summed from
+            # the sales rollups, one row per day (or per hour of a day)
             if period == "yesterday":
-                target_date = "DATE_SUB('2025-11-30', INTERVAL 1 DAY)"
-                date_filter = f"DATE(transaction_date) = {target_date}"
+                anchor = "2025-11-29"
+                date_filter = "sales_date = :anchor"
             elif period == "week":
-                target_date = "'2025-11-30'"
-                date_filter = f"transaction_date >= DATE_SUB({target_date}, INTERVAL 7 DAY)"
+                anchor = "2025-11-30"
+                date_filter = "sales_date >= DATE_SUB(:anchor, INTERVAL 7 DAY)"
             elif period == "month":
-                target_date = "'2025-11-30'"
-                date_filter = f"transaction_date >= DATE_SUB({target_date}, INTERVAL 30 DAY)"
+                anchor = "2025-11-30"
+                date_filter = "sales_date >= DATE_SUB(:anchor, INTERVAL 30 DAY)"
             else:
-                target_date = "'2025-11-30'"
-                date_filter = f"DATE(transaction_date) = {target_date}"
+                anchor = "2025-11-30"
+                date_filter = "sales_date = :anchor"
+            params = {"anchor": anchor}
 
-            query_summary = f"""
+            query_summary = text(f"""
                 SELECT
-                    SUM(transaction_qty * unit_price) as total_revenue,
-                    COUNT(DISTINCT transaction_id) as total_orders,
-                    SUM(transaction_qty) as total_items
-                FROM transactions
+                    SUM(revenue) as total_revenue,
+                    SUM(orders) as total_orders,
+                    SUM(items) as total_items
+                FROM daily_sales_rollup
                 WHERE {date_filter}
-            """
-            summary_df = pd.read_sql(query_summary, engine)
-
-            total_revenue = float(summary_df['total_revenue'].iloc[0] or 0)
-            total_orders = int(summary_df['total_orders'].iloc[0] or 0)
-            avg_order_value = total_revenue / total_orders if total_orders > 0 else 0
+            """)
 
             query_products = """
                 SELECT
@@ -166,7 +170,40 @@ class AnalyticsService:
                 ORDER BY sales DESC
                 LIMIT 5
             """
-            products_df = pd.read_sql(query_products, engine)
+
+            # MySQL formats the 12-hour clock labels ('12AM', '1PM', ...)
+            query_hourly = text(f"""
+                SELECT
+                    DATE_FORMAT(MAKETIME(sales_hour, 0, 0), '%l%p') as time,
+                    revenue as sales
+                FROM hourly_sales_rollup
+                WHERE {date_filter}
+                ORDER BY sales_hour
+            """)
+
+            query_monthly = text("""
+                SELECT
+                    DATE_FORMAT(sales_date, '%b %d') as date,
+                    revenue as sales
+                FROM daily_sales_rollup
+                WHERE sales_date >= DATE_SUB('2025-11-30', INTERVAL 30 DAY)
+                ORDER BY sales_date ASC
+            """)
+
+            # One pooled connection serves every read of the report and goes
+            # back to the pool as soon as they are done
+            hourly_sales = []
+            with engine.connect() as conn:
+                summary = conn.execute(query_summary, params).first()
+                products_df = pd.read_sql(query_products, conn)
+                # Hourly breakdown is only offered for single days
+                if period in ["today", "yesterday"]:
+                    hourly_sales = pd.read_sql(query_hourly, conn, params=params, dtype={'sales': 'float64'}).to_dict('records')
+                monthly_df = pd.read_sql(query_monthly, conn, dtype={'sales': 'float64'})
+
+            total_revenue = float(summary.total_revenue or 0)
+            total_orders = int(summary.total_orders or 0)
+            avg_order_value = total_revenue / total_orders if total_orders > 0 else 0
 
             if not products_df.empty:
                 total_product_sales = products_df['sales'].sum()
@@ -175,51 +212,15 @@ class AnalyticsService:
             else:
                 product_sales = []
 
-            hourly_sales = []
-            if period in ["today", "yesterday"]:
-                query_hourly = f"""
-                    SELECT
-                        HOUR(transaction_time) as hour,
-                        SUM(transaction_qty * unit_price) as sales
-                    FROM transactions
-                    WHERE {date_filter}
-                    GROUP BY HOUR(transaction_time)
-                    ORDER BY hour
-                """
-                hourly_df = pd.read_sql(query_hourly, engine)
-
-                if not hourly_df.empty:
-                    for _, row in hourly_df.iterrows():
-                        hour = int(row['hour'])
-                        time_label = f"{hour % 12 if hour % 12 != 0 else 12}{'PM' if hour >= 12 else 'AM'}"
-                        hourly_sales.append({
-                            "time": time_label,
-                            "sales": float(row['sales'])
-                        })
-
-            query_monthly = """
-                SELECT
-                    DATE(transaction_date) as date,
-                    SUM(transaction_qty * unit_price) as sales
-                FROM transactions
-                WHERE transaction_date >= DATE_SUB('2025-11-30', INTERVAL 30 DAY)
-                GROUP BY DATE(transaction_date)
-                ORDER BY date ASC
-            """
-            monthly_df = pd.read_sql(query_monthly, engine)
-
             monthly_sales = []
             if not monthly_df.empty:
-                monthly_df['date'] = pd.to_datetime(monthly_df['date'])
-                avg_daily_sales = monthly_df['sales'].mean()
-                target_sales = avg_daily_sales * 1.1
+                daily_sales = monthly_df['sales'].to_numpy()
+                target_sales = float(daily_sales.mean() * 1.1)
 
-                for _, row in monthly_df.iterrows():
-                    monthly_sales.append({
-                        "date": row['date'].strftime("%b %d"),
-                        "sales": float(row['sales']),
-                        "target": float(target_sales)
-                    })
+                monthly_sales = [
+                    {"date": day, "sales": amount, "target": target_sales}
+                    for day, amount in zip(monthly_df['date'].tolist(), daily_sales.tolist())
+                ]
 
             return {
                 "period": period,
@@ -242,63 +243,45 @@ class AnalyticsService:
             raise HTTPException(status_code=500, detail="Database connection not available")
 
         try:
+            # Labels are formatted by MySQL and totals come pre-summed from
+            # the sales rollups, so rows go out as read
             if period == "today":
-                query = """
+                query = text("""
                     SELECT
-                        HOUR(transaction_time) as period_label,
-                        SUM(transaction_qty * unit_price) as income,
-                        SUM(transaction_qty * unit_price * 0.7) as expenses
-                    FROM transactions
-                    WHERE DATE(transaction_date) = '2025-11-30'
-                    GROUP BY HOUR(transaction_time)
-                    ORDER BY period_label
-                """
-                label_format = lambda x: f"{int(x) % 12 if int(x) % 12 != 0 else 12}{'PM' if int(x) >= 12 else 'AM'}"
+                        DATE_FORMAT(MAKETIME(sales_hour, 0, 0), '%l%p') as month,
+                        revenue as income,
+                        revenue * 0.7 as expenses
+                    FROM hourly_sales_rollup
+                    WHERE sales_date = '2025-11-30'
+                    ORDER BY sales_hour
+                """)
             elif period == "week":
-                query = """
+                query = text("""
                     SELECT
-                        DAYNAME(transaction_date) as period_label,
-                        SUM(transaction_qty * unit_price) as income,
-                        SUM(transaction_qty * unit_price * 0.7) as expenses
-                    FROM transactions
-                    WHERE transaction_date >= DATE_SUB('2025-11-30', INTERVAL 7 DAY)
-                    GROUP BY DATE(transaction_date), DAYNAME(transaction_date)
-                    ORDER BY DATE(transaction_date)
-                """
-                label_format = lambda x: x[:3]
+                        LEFT(DAYNAME(sales_date), 3) as month,
+                        revenue as income,
+                        revenue * 0.7 as expenses
+                    FROM daily_sales_rollup
+                    WHERE sales_date >= DATE_SUB('2025-11-30', INTERVAL 7 DAY)
+                    ORDER BY sales_date
+                """)
             else:
-                query = """
+                query = text("""
                     SELECT
-                        DATE_FORMAT(transaction_date, '%%b %%d') as period_label,
-                        SUM(transaction_qty * unit_price) as income,
-                        SUM(transaction_qty * unit_price * 0.7) as expenses
-                    FROM transactions
-                    WHERE transaction_date >= DATE_SUB('2025-11-30', INTERVAL 30 DAY)
-                    GROUP BY DATE(transaction_date)
-                    ORDER BY DATE(transaction_date)
-                """
-                label_format = lambda x: x
+                        DATE_FORMAT(sales_date, '%b %d') as month,
+                        revenue as income,
+                        revenue * 0.7 as expenses
+                    FROM daily_sales_rollup
+                    WHERE sales_date >= DATE_SUB('2025-11-30', INTERVAL 30 DAY)
+                    ORDER BY sales_date
+                """)
 
-            df = pd.read_sql(query, engine)
+            df = pd.read_sql(query, engine, dtype={'income': 'float64', 'expenses': 'float64'})
 
             if df.empty:
                 return {"cash_flow": []}
 
-            cash_flow = []
-            for _, row in df.iterrows():
-                label = row['period_label']
-                if period == "today":
-                    label = label_format(label)
-                elif period == "week":
-                    label = label_format(label)
-
-                cash_flow.append({
-                    "month": label,
-                    "income": float(row['income']),
-                    "expenses": float(row['expenses'])
-                })
-
-            return {"cash_flow": cash_flow, "period": period}
+            return {"cash_flow": df.to_dict('records'), "period": period}
 
         except Exception as e:
             raise HTTPException(status_code=500, detail=f"Error fetching cash flow: {str(e)}")
@@ -3,14 +3,27 @@ Authentication Service
 Handles all authentication-related business logic
 """
 from fastapi import HTTPException, status
+from fastapi.concurrency import run_in_threadpool
 from datetime import datetime, timedelta
+import hashlib
 import secrets
 from typing import Optional
+from cachetools import TTLCache
 
 from ..models.auth import User, Session
 from ..models.schemas import LoginRequest, SignupRequest, AuthResponse, UserResponse
 from ..config.settings import TOKEN_EXPIRY_DAYS
 
+# Recently verified tokens -> (user, expires_at), keyed by a digest so raw
+# tokens are not kept around in the cache
+TOKEN_CACHE_TTL_SECONDS = 60
+_verified_tokens = TTLCache(maxsize=10_000, ttl=TOKEN_CACHE_TTL_SECONDS)
+
+
+def _token_key(token: str) -> bytes:
+    """Cache key for a token"""
+    return hashlib.blake2b(token.encode(), digest_size=16).digest()
+
 
 class AuthService:
     """Authentication service for user management"""
@@ -34,12 +47,13 @@ class AuthService:
         Raises:
             HTTPException: If credentials are invalid
         """
-        print(f"Login attempt - Email: {login_data.email}, Password: {login_data.password}")
+        print(f"Login attempt - Email: {login_data.email}")
 
         # Get user by email
         user = User.get_by_email(login_data.email)
 
-        if not user or not User.verify_password(user, login_data.password):
+        # bcrypt is deliberately slow, so check it off the event loop
+        if not user or not await run_in_threadpool(User.verify_password, user, login_data.password):
             print("Authentication FAILED - Invalid credentials")
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
@@ -88,6 +102,11 @@ class AuthService:
         Raises:
             HTTPException: If token is invalid or expired
         """
+        key = _token_key(token)
+        cached = _verified_tokens.get(key)
+        if cached is not None and datetime.now() <= cached[1]:
+            return cached[0]
+
         if not Session.is_valid(token):
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
@@ -101,8 +120,14 @@ class AuthService:
                 detail="Invalid or expired token"
             )
 
+        _verified_tokens[key] = (user, Session.get(token)["expires_at"])
         return user
 
+    @staticmethod
+    def invalidate_token(token: str) -> None:
+        """Drop a token from the verification cache"""
+        _verified_tokens.pop(_token_key(token), None)
+
     @staticmethod
     async def logout(token: str) -> dict:
         """
@@ -115,6 +140,7 @@ class AuthService:
             Success message
         """
         Session.delete(token)
+        AuthService.invalidate_token(token)
         return {"success": True, "message": "Logged out successfully"}
 
     @staticmethod
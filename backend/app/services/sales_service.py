@@ -2,12 +2,35 @@
 Sales Service
 Handles sales data retrieval and processing
 """
+import logging
 import pandas as pd
 from datetime import datetime, timedelta
 from typing import Dict, List, Optional
 from fastapi import HTTPException
 from sqlalchemy import text
 
+from ..utils.model_loader import get_sarima_forecast
+
+logger = logging.getLogger(__name__)
+
+
+# Column types for per-day reads, applied by pd.read_sql as rows arrive so no
+# separate pandas coercion pass is needed afterwards. Daily totals are summed
+# in SQL, so only one row per day comes back
+DAILY_SALES_DTYPES = {'daily_sales': 'float64'}
+
+# Days of daily totals fetched for the simple-average forecast
+FORECAST_HISTORY_DAYS = 180
+
+# Sparkline shown while there is no sales history for the last week
+FALLBACK_SALES_SPARKLINE = (8200, 8500, 9100, 8800, 9300, 10200, 12540)
+
+
+def _read_daily_sales(engine, query, params: Optional[Dict] = None) -> pd.Series:
+    """Daily totals from a query returning sales_date and daily_sales, oldest day first"""
+    df = pd.read_sql(query, engine, params=params, parse_dates=['sales_date'], dtype=DAILY_SALES_DTYPES)
+    return pd.Series(df['daily_sales'].to_numpy(), index=df['sales_date']).sort_index()
+
 
 class SalesService:
     """Service for sales-related operations"""
@@ -29,35 +52,33 @@ class SalesService:
             raise HTTPException(status_code=500, detail="Database connection not available")
 
         try:
-            print(f"Fetching data from database for {days} days forecast...")
+            logger.info("Fetching data from database for %d days forecast", days)
 
-            query = """
-                SELECT transaction_date, transaction_qty, unit_price
+            params = {"history_days": FORECAST_HISTORY_DAYS}
+            query = text("""
+                SELECT DATE(transaction_date) AS sales_date, SUM(transaction_qty * unit_price) AS daily_sales
                 FROM transactions
-                ORDER BY transaction_date DESC
-                LIMIT 5000
-            """
-            df = pd.read_sql(query, engine)
-
-            if df.empty:
-                query = """
-                    SELECT transaction_date, transaction_qty, unit_price
+                GROUP BY DATE(transaction_date)
+                ORDER BY sales_date DESC
+                LIMIT :history_days
+            """)
+            daily_sales = _read_daily_sales(engine, query, params)
+
+            if daily_sales.empty:
+                # coffee_sales stores the numbers as text, so cast them in SQL
+                query = text("""
+                    SELECT
+                        DATE(transaction_date) AS sales_date,
+                        SUM(CAST(transaction_qty AS UNSIGNED) * CAST(unit_price AS DECIMAL(10,2))) AS daily_sales
                     FROM coffee_sales
-                    ORDER BY transaction_date DESC
-                    LIMIT 5000
-                """
-                df = pd.read_sql(query, engine)
-
-            df['transaction_date'] = pd.to_datetime(df['transaction_date'])
-            df['transaction_qty'] = pd.to_numeric(df['transaction_qty'], errors='coerce')
-            df['unit_price'] = pd.to_numeric(df['unit_price'], errors='coerce')
-            df['sales_amount'] = df['transaction_qty'] * df['unit_price']
-
-            daily_sales = df.groupby('transaction_date')['sales_amount'].sum().sort_index()
+                    GROUP BY DATE(transaction_date)
+                    ORDER BY sales_date DESC
+                    LIMIT :history_days
+                """)
+                daily_sales = _read_daily_sales(engine, query, params)
 
             if sarima_model is not None:
-                forecast_obj = sarima_model.get_forecast(steps=days)
-                forecast_values = forecast_obj.predicted_mean.values.tolist()
+                forecast_values = get_sarima_forecast(days)
             else:
                 recent_avg = daily_sales.tail(7).mean()
                 forecast_values = [float(recent_avg)] * days
@@ -96,36 +117,30 @@ class SalesService:
             else:
                 days = 30
 
-            query = f"""
-                SELECT transaction_date, transaction_qty, unit_price
-                FROM transactions
-                WHERE transaction_date >= DATE_SUB('2025-11-30', INTERVAL {days} DAY)
-                ORDER BY transaction_date ASC
-            """
+            # Daily totals come pre-summed from the sales rollup
+            query = text("""
+                SELECT sales_date, revenue AS daily_sales
+                FROM daily_sales_rollup
+                WHERE sales_date >= DATE_SUB('2025-11-30', INTERVAL :days DAY)
+            """)
 
-            df = pd.read_sql(query, engine)
+            daily_sales = _read_daily_sales(engine, query, {"days": days})
 
-            if df.empty:
+            if daily_sales.empty:
                 query = """
-                    SELECT transaction_date, transaction_qty, unit_price
-                    FROM coffee_sales
-                    LIMIT 1000
+                    SELECT
+                        DATE(sample.transaction_date) AS sales_date,
+                        SUM(CAST(sample.transaction_qty AS UNSIGNED) * CAST(sample.unit_price AS DECIMAL(10,2))) AS daily_sales
+                    FROM (SELECT transaction_date, transaction_qty, unit_price FROM coffee_sales LIMIT 1000) AS sample
+                    GROUP BY DATE(sample.transaction_date)
                 """
-                df = pd.read_sql(query, engine)
-
-            df['transaction_date'] = pd.to_datetime(df['transaction_date'], errors='coerce')
-            df['transaction_qty'] = pd.to_numeric(df['transaction_qty'], errors='coerce')
-            df['unit_price'] = pd.to_numeric(df['unit_price'], errors='coerce')
-            df['sales_amount'] = df['transaction_qty'] * df['unit_price']
-
-            daily_sales = df.groupby('transaction_date')['sales_amount'].sum().reset_index()
-            daily_sales = daily_sales.sort_values('transaction_date')
+                daily_sales = _read_daily_sales(engine, query)
 
             sales_data = []
-            for _, row in daily_sales.iterrows():
+            for date, amount in daily_sales.items():
                 sales_data.append({
-                    "date": row['transaction_date'].strftime("%b %d"),
-                    "sales": float(row['sales_amount'])
+                    "date": date.strftime("%b %d"),
+                    "sales": float(amount)
                 })
 
             return {"sales_data": sales_data, "period": period}
@@ -152,34 +167,20 @@ class SalesService:
                 SELECT SUM(transaction_qty * unit_price) as total_sales,
                        COUNT(DISTINCT transaction_id) as total_customers
                 FROM transactions
-                WHERE DATE(transaction_date) = '2025-11-30'
+                WHERE transaction_date >= '2025-11-30' AND transaction_date < DATE_ADD('2025-11-30', INTERVAL 1 DAY)
             """
-            today_data = pd.read_sql(query_today, engine)
 
             query_yesterday = """
                 SELECT SUM(transaction_qty * unit_price) as total_sales
                 FROM transactions
-                WHERE DATE(transaction_date) = DATE_SUB('2025-11-30', INTERVAL 1 DAY)
+                WHERE transaction_date >= DATE_SUB('2025-11-30', INTERVAL 1 DAY) AND transaction_date < '2025-11-30'
             """
-            yesterday_data = pd.read_sql(query_yesterday, engine)
-
-            today_sales = float(today_data['total_sales'].iloc[0] or 0)
-            yesterday_sales = float(yesterday_data['total_sales'].iloc[0] or 0)
-
-            if yesterday_sales > 0:
-                sales_trend = ((today_sales - yesterday_sales) / yesterday_sales) * 100
-            else:
-                sales_trend = 0
-
-            total_customers = int(today_data['total_customers'].iloc[0] or 0)
 
             query_staff = """
                 SELECT COUNT(*) as active_baristas
                 FROM staff
                 WHERE role = 'barista'
             """
-            staff_data = pd.read_sql(query_staff, engine)
-            active_baristas = int(staff_data['active_baristas'].iloc[0] or 3)
 
             query_week = """
                 SELECT DATE(transaction_date) as date, SUM(transaction_qty * unit_price) as sales
@@ -188,9 +189,26 @@ class SalesService:
                 GROUP BY DATE(transaction_date)
                 ORDER BY date ASC
             """
-            week_data = pd.read_sql(query_week, engine)
 
-            sales_sparkline = [float(x) for x in week_data['sales'].tolist()] if not week_data.empty else [8200, 8500, 9100, 8800, 9300, 10200, 12540]
+            # One pooled connection serves all four reads and goes back to
+            # the pool as soon as they are done. The single-row aggregates are
+            # read straight off the result without building a DataFrame
+            with engine.connect() as conn:
+                today_data = conn.execute(text(query_today)).first()
+                yesterday_sales = float(conn.execute(text(query_yesterday)).scalar() or 0)
+                active_baristas = int(conn.execute(text(query_staff)).scalar() or 3)
+                week_data = pd.read_sql(query_week, conn)
+
+            today_sales = float(today_data.total_sales or 0)
+
+            if yesterday_sales > 0:
+                sales_trend = ((today_sales - yesterday_sales) / yesterday_sales) * 100
+            else:
+                sales_trend = 0
+
+            total_customers = int(today_data.total_customers or 0)
+
+            sales_sparkline = [float(x) for x in week_data['sales'].tolist()] if not week_data.empty else FALLBACK_SALES_SPARKLINE
 
             return {
                 "total_sales": today_sales,
@@ -226,15 +244,16 @@ class SalesService:
                     SUM(transaction_qty) as units_sold,
                     SUM(transaction_qty * unit_price) as revenue
                 FROM transactions
-                WHERE DATE(transaction_date) = '2025-11-30'
+                WHERE transaction_date >= '2025-11-30' AND transaction_date < DATE_ADD('2025-11-30', INTERVAL 1 DAY)
                 GROUP BY product_detail, product_type
                 ORDER BY units_sold DESC
                 LIMIT 1
             """
 
-            df = pd.read_sql(query, engine)
+            with engine.connect() as conn:
+                product = conn.execute(text(query)).first()
 
-            if df.empty:
+            if product is None:
                 query = """
                     SELECT
                         product_detail,
@@ -246,30 +265,31 @@ class SalesService:
                     ORDER BY units_sold DESC
                     LIMIT 1
                 """
-                df = pd.read_sql(query, engine)
-
-            if not df.empty:
-                product = df.iloc[0]
+                with engine.connect() as conn:
+                    product = conn.execute(text(query)).first()
 
+            if product is not None:
                 query_yesterday = """
                     SELECT SUM(transaction_qty) as units_sold
                     FROM transactions
-                    WHERE DATE(transaction_date) = DATE_SUB('2025-11-30', INTERVAL 1 DAY)
+                    WHERE transaction_date >= DATE_SUB('2025-11-30', INTERVAL 1 DAY) AND transaction_date < '2025-11-30'
                     AND product_detail = :product_detail
                 """
 
-                yesterday_df = pd.read_sql(text(query_yesterday), engine, params={'product_detail': product['product_detail']})
-                yesterday_units = float(yesterday_df['units_sold'].iloc[0] or 0) if not yesterday_df.empty else 0
+                with engine.connect() as conn:
+                    yesterday_units = float(
+                        conn.execute(text(query_yesterday), {'product_detail': product.product_detail}).scalar() or 0
+                    )
 
                 change_pct = 0
                 if yesterday_units > 0:
-                    change_pct = ((float(product['units_sold']) - yesterday_units) / yesterday_units) * 100
+                    change_pct = ((float(product.units_sold) - yesterday_units) / yesterday_units) * 100
 
                 return {
-                    "product_name": product['product_detail'],
-                    "product_type": product['product_type'],
-                    "units_sold": int(product['units_sold']),
-                    "revenue": float(product['revenue']),
+                    "product_name": product.product_detail,
+                    "product_type": product.product_type,
+                    "units_sold": int(product.units_sold),
+                    "revenue": float(product.revenue),
                     "change_percent": change_pct
                 }
             else:
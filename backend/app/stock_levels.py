@@ -0,0 +1,49 @@
+"""
+Stock Levels
+Inventory alert classification shared by the monolith and the MVC services
+"""
+
+import numpy as np
+
+# Numba is optional; without it inventory classification falls back to numpy
+try:
+    from numba import njit
+except ImportError:
+    njit = None
+
+# Stock alert levels by code from classify_stock: 0 safe, 1 warning, 2 critical
+ALERT_LEVELS = np.array(["safe", "warning", "critical"])
+DEMAND_LEVELS = np.array(["Low", "Medium", "High Demand"])
+
+
+def _classify_stock_loop(stock, reorder):
+    """
+    Alert code and predicted demand per inventory item
+
+    Critical below the reorder level, warning below 1.5x it; predicted
+    demand is 1.5x the reorder level, or stock + 10 without one. Compares
+    in integers (stock * 2 < reorder * 3) so no float rounding creeps in
+    """
+    n = stock.shape[0]
+    alert = np.empty(n, dtype=np.int8)
+    predicted = np.empty(n, dtype=np.int64)
+
+    for i in range(n):
+        alert[i] = int(stock[i] < reorder[i]) + int(stock[i] * 2 < reorder[i] * 3)
+        predicted[i] = reorder[i] * 3 // 2 if reorder[i] > 0 else stock[i] + 10
+
+    return alert, predicted
+
+
+if njit is not None:
+    # Signature is pinned so compilation happens once at import (and is cached on disk)
+    classify_stock = njit(
+        "Tuple((int8[:], int64[:]))(Array(int64, 1, 'A', readonly=True), Array(int64, 1, 'A', readonly=True))",
+        cache=True
+    )(_classify_stock_loop)
+else:
+    def classify_stock(stock, reorder):
+        """Alert code and predicted demand per inventory item"""
+        alert = (stock < reorder).astype(np.int8) + (stock * 2 < reorder * 3)
+        predicted = np.where(reorder > 0, reorder * 3 // 2, stock + 10)
+        return alert, predicted
@@ -2,5 +2,6 @@
 Utilities package
 """
 from .model_loader import get_sarima_model
+from .dependencies import bearer_token, current_user
 
-__all__ = ['get_sarima_model']
+__all__ = ['get_sarima_model', 'bearer_token', 'current_user']
@@ -0,0 +1,26 @@
+"""
+Request Dependencies
+Shared FastAPI dependencies for authenticated endpoints
+"""
+from fastapi import Depends, Header, HTTPException
+from typing import Optional
+
+from ..services.auth_service import AuthService
+
+BEARER_PREFIX = "Bearer "
+
+
+async def bearer_token(authorization: Optional[str] = Header(None)) -> str:
+    """Extract the token from an 'Authorization: Bearer <token>' header"""
+    if not authorization or not authorization.startswith(BEARER_PREFIX):
+        raise HTTPException(
+            status_code=401,
+            detail="Missing or invalid authorization header"
+        )
+
+    return authorization[len(BEARER_PREFIX):]
+
+
+async def current_user(token: str = Depends(bearer_token)) -> dict:
+    """Resolve the authenticated user for the request's bearer token"""
+    return await AuthService.verify_token(token)
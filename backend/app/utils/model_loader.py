@@ -2,16 +2,27 @@
 Model Loader Utility
 Loads and manages ML models
 """
-import pickle
+import joblib
+import logging
 import os
+from typing import List, Optional
+
+logger = logging.getLogger(__name__)
 
 # Global model storage
 _sarima_model = None
 
+# Longest horizon served from the precomputed forecast
+MAX_FORECAST_DAYS = 90
+
+# Predicted means for the next MAX_FORECAST_DAYS days, refreshed whenever the
+# model is (re)loaded
+_sarima_forecast = None
+
 
 def load_sarima_model():
     """Load SARIMA model from disk"""
-    global _sarima_model
+    global _sarima_model, _sarima_forecast
 
     if _sarima_model is not None:
         return _sarima_model
@@ -20,15 +31,17 @@ def load_sarima_model():
 
     if os.path.exists(SARIMA_MODEL_PATH):
         try:
-            with open(SARIMA_MODEL_PATH, "rb") as f:
-                _sarima_model = pickle.load(f)
-            print("✓ SARIMA model loaded successfully")
+            # Arrays in a joblib.dump'ed model are memory-mapped copy-on-write,
+            # so forked workers share the pages; plain pickles load as before
+            _sarima_model = joblib.load(SARIMA_MODEL_PATH, mmap_mode="c")
+            _sarima_forecast = None
+            logger.info("SARIMA model loaded successfully")
             return _sarima_model
         except Exception as e:
-            print(f"Warning: Could not load SARIMA model: {e}")
+            logger.warning("Could not load SARIMA model: %s", e)
             return None
     else:
-        print(f"Warning: SARIMA model not found at {SARIMA_MODEL_PATH}")
+        logger.warning("SARIMA model not found at %s", SARIMA_MODEL_PATH)
         return None
 
 
@@ -38,3 +51,25 @@ def get_sarima_model():
     if _sarima_model is None:
         _sarima_model = load_sarima_model()
     return _sarima_model
+
+
+def get_sarima_forecast(days: int) -> Optional[List[float]]:
+    """
+    Next `days` predicted values from the loaded SARIMA model, or None without one
+
+    The model is fixed once loaded and its first N predicted means don't
+    depend on the horizon, so the forecast is run once for MAX_FORECAST_DAYS
+    and each request takes a slice of it
+    """
+    global _sarima_forecast
+
+    sarima_model = get_sarima_model()
+    if sarima_model is None:
+        return None
+
+    if not 0 < days <= MAX_FORECAST_DAYS:
+        return sarima_model.get_forecast(steps=days).predicted_mean.values.tolist()
+
+    if _sarima_forecast is None:
+        _sarima_forecast = tuple(sarima_model.get_forecast(steps=MAX_FORECAST_DAYS).predicted_mean.values.tolist())
+    return list(_sarima_forecast[:days])
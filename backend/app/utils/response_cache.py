@@ -0,0 +1,27 @@
+"""
+Response Cache
+Short-lived in-process cache for read-only endpoint results
+"""
+from threading import RLock
+
+from cachetools import TTLCache, cached
+from cachetools.keys import hashkey
+
+# The reports are computed "as of" fixed dates, so a minute-old answer is as
+# good as a fresh one and repeated page loads skip the aggregate queries
+ENDPOINT_CACHE_TTL_SECONDS = 60
+_endpoint_cache = TTLCache(maxsize=256, ttl=ENDPOINT_CACHE_TTL_SECONDS)
+_cache_lock = RLock()
+
+
+def cached_endpoint(name: str, cache: TTLCache = _endpoint_cache):
+    """
+    Memoize a controller method's result per (name, arguments) in a TTL cache
+
+    The leading engine argument is left out of the key; there is one engine
+    per process
+    """
+    def key(engine, *args, **kwargs):
+        return hashkey(name, *args, **kwargs)
+
+    return cached(cache, key=key, lock=_cache_lock)